@@ -0,0 +1,102 @@
+"""
+benchmark the heatmaps computation with different number of worker processes
+
+the messages are generated randomly, so no database is needed
+run it from the root of the repository:
+
+    python -m benchmarks.heatmaps_workers --days 365 --messages 2000
+"""
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from discord_analyzer.analyzer.analyzer_heatmaps import RAWINFO_FIELDS, Heatmaps
+from discord_analyzer.models.RawInfoModel import RawInfoModel
+
+
+def generate_days_columns(
+    days: int, messages: int, accounts: int, channels: int, seed: int = 0
+) -> list[tuple[datetime, dict[str, list]]]:
+    """
+    generate random rawinfo documents for each day, as columns
+    """
+    rnd = random.Random(seed)
+    account_ids = [f"user{i}" for i in range(accounts)]
+    channel_ids = [f"channel{i}" for i in range(channels)]
+    start_day = datetime(2023, 1, 1)
+
+    days_columns = []
+    for day in range(days):
+        date = start_day + timedelta(days=day)
+        entries = []
+        for _ in range(messages):
+            mess_type = rnd.choice([0, 0, 19])
+            author = rnd.choice(account_ids)
+            # not mentioning or reacting to themselves, to avoid the warnings
+            others = [
+                account for account in rnd.sample(account_ids, 4) if account != author
+            ]
+            entries.append(
+                {
+                    "type": mess_type,
+                    "author": author,
+                    "user_mentions": others[: rnd.randint(0, 2)],
+                    "reactions": [
+                        ",".join(others[: rnd.randint(1, 3)] + ["👍"])
+                        for _ in range(rnd.randint(0, 2))
+                    ],
+                    "replied_user": others[0] if mess_type == 19 else None,
+                    "createdDate": date + timedelta(seconds=rnd.randrange(86400)),
+                    "channelId": rnd.choice(channel_ids),
+                    "threadId": rnd.choice([None, None, "thread"]),
+                }
+            )
+        days_columns.append(
+            (date, RawInfoModel.entries_to_columns(entries, RAWINFO_FIELDS))
+        )
+
+    return days_columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    days_columns = generate_days_columns(
+        args.days, args.messages, args.accounts, args.channels
+    )
+    member_ids = [f"user{i}" for i in range(args.accounts)]
+
+    print(
+        f"{args.days} days, {args.messages} messages per day, "
+        f"{args.accounts} accounts, {args.channels} channels"
+    )
+    baseline = None
+    for workers in args.workers:
+        heatmaps = Heatmaps(DB_connections=None, testing=False, workers=workers)
+
+        start = time.perf_counter()
+        results = list(
+            heatmaps._iter_days_heatmaps(days_columns, member_ids, bot_ids=[])
+        )
+        elapsed = time.perf_counter() - start
+
+        baseline = baseline or elapsed
+        print(
+            f"workers: {workers:2d} | time: {elapsed:7.2f}s | "
+            f"speedup: {baseline / elapsed:5.2f}x | documents: {len(results)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
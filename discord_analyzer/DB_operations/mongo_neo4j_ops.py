@@ -16,14 +16,25 @@ class MongoNeo4jDB:
         self.testing = testing
 
     def set_mongo_db_ops(
-        self, mongo_user: str, mongo_pass: str, mongo_host: str, mongo_port: str
+        self,
+        mongo_user: str,
+        mongo_pass: str,
+        mongo_host: str,
+        mongo_port: str,
+        **kwargs,
     ):
         """
         setup the MongoDBOps class with the parameters needed
 
+        the `kwargs` are passed to MongoDBOps
+        i.e. `batch_size`, `writers`, and `staging_recompute`
         """
         self.mongoOps = MongoDBOps(
-            user=mongo_user, password=mongo_pass, host=mongo_host, port=mongo_port
+            user=mongo_user,
+            password=mongo_pass,
+            host=mongo_host,
+            port=mongo_port,
+            **kwargs,
         )
         self.mongoOps.set_mongo_db_access()
         try:
@@ -49,8 +60,10 @@ class MongoNeo4jDB:
         analytics_data : dict
             a nested dictinoary with keys as `heatmaps`, and `memberactivities`
             values of the heatmaps is a list of dictinoaries
+            (or an iterator of them, to be streamed into the database)
             and memberactivities is a tuple of memberactivities dictionary list
-            and memebractivities networkx object dictionary list
+            and memebractivities graphs dictionary
+            (`WindowGraph` edge arrays or networkx objects)
         guild_id: str
             what the data is related to
         community_id : str
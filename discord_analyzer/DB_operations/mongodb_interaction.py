@@ -1,17 +1,51 @@
 import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 from discord_analyzer.DB_operations.mongodb_access import DB_access
+from discord_analyzer.models.AnalyzerStateModel import AnalyzerStateModel
+from discord_analyzer.models.HeatMapModel import HEATMAPS_DAYS_STATE
 from pymongo.read_concern import ReadConcern
 from pymongo.write_concern import WriteConcern
 
 
 class MongoDBOps:
-    def __init__(self, user, password, host, port):
+    def __init__(
+        self,
+        user,
+        password,
+        host,
+        port,
+        batch_size: int = 1000,
+        writers: int = 1,
+        staging_recompute: bool = False,
+    ):
         """
         mongoDB database operations
+
+        Parameters:
+        ------------
+        batch_size : int
+            the default count of documents inserted at once
+            default is 1000
+        writers : int
+            the count of threads inserting the batches concurrently
+            default is 1, meaning the batches are inserted one by one
+            the streamed heatmaps are always written one batch after another
+        staging_recompute : bool
+            if True, the heatmaps recomputed from scratch are written into a
+            staging collection which then replaces the heatmaps collection
+            (outside of the transaction), so the readers never see a
+            half-written collection
+            default is False, meaning deleting and inserting in the transaction
         """
         self.connection_str = f"mongodb://{user}:{password}@{host}:{port}"
         self.DB_access = DB_access
+        self.batch_size = batch_size
+        self.writers = writers
+        self.staging_recompute = staging_recompute
 
         self.guild_msg = ""
         # logging.basicConfig()
@@ -38,7 +72,7 @@ class MongoDBOps:
         delete_member_acitivities,
         acitivties_list,
         heatmaps_list,
-        batch_size=1000,
+        batch_size=None,
     ):
         """
         do write operations in a transaction.
@@ -52,9 +86,51 @@ class MongoDBOps:
             delete the memberactivities data or not
         acitivties_list : list of dict
             list of memberactivity data to store
-        heatmaps_list : list of dict
+        heatmaps_list : list of dict | Iterable[dict]
             list of heatmap data to store
+            could be a stream of heatmaps ordered by their date too, which is
+            written before the transaction, day by day (see `write_heatmaps_days`)
+            or into a staging collection if deleting
+        batch_size : int | None
+            the count of documents inserted at once
+            default is None, meaning the `batch_size` of the instance
         """
+        if batch_size is None:
+            batch_size = self.batch_size
+
+        # the transaction callback is run again on transient errors
+        # but a stream of heatmaps can be consumed just once,
+        # so the streams are written before the transaction
+        heatmaps_stream = heatmaps_list is not None and not isinstance(
+            heatmaps_list, list
+        )
+
+        # the last date of the heatmaps written completely
+        # to be saved after they are written
+        heatmaps_last_date = None
+        if isinstance(heatmaps_list, list) and heatmaps_list != []:
+            heatmaps_last_date = max(heatmap["date"] for heatmap in heatmaps_list)
+
+        if delete_heatmaps and (self.staging_recompute or heatmaps_stream):
+            heatmaps_dates = []
+            self.replace_collection(
+                guildId=guildId,
+                activity="heatmaps",
+                data=self._track_dates(
+                    heatmaps_list if heatmaps_list is not None else [], heatmaps_dates
+                ),
+                batch_size=batch_size,
+            )
+            self._save_heatmaps_last_date(
+                guildId, heatmaps_dates[-1] if heatmaps_dates else None
+            )
+            # the heatmaps are already replaced
+            delete_heatmaps = False
+            heatmaps_list = None
+            heatmaps_last_date = None
+        elif heatmaps_stream:
+            self.write_heatmaps_days(guildId, heatmaps_list, batch_size=batch_size)
+            heatmaps_list = None
 
         def callback_wrapper(session):
             self._session_custom_transaction(
@@ -74,6 +150,91 @@ class MongoDBOps:
                 write_concern=WriteConcern("local"),
             )
 
+        if delete_heatmaps or heatmaps_last_date is not None:
+            self._save_heatmaps_last_date(guildId, heatmaps_last_date)
+
+    def write_heatmaps_days(self, guildId, heatmaps, batch_size=None):
+        """
+        write a stream of heatmaps into the heatmaps collection, whole days
+        at once and in date order, without a transaction
+
+        the documents already stored for the written days are replaced,
+        and the last written day is saved in the `analyzerstates` collection
+        (see `HEATMAPS_DAYS_STATE`) after each batch of days, so a failed
+        write can be resumed from the day after it
+        the documents stored after the saved day are left from a failed write,
+        so they are removed before writing
+
+        Parameters:
+        ------------
+        guildId : str
+            the guildId to write its heatmaps
+        heatmaps : Iterable[dict]
+            the heatmaps to write, ordered by their `date`
+        batch_size : int | None
+            the count of documents inserted at once
+            the days of a batch are written completely, so a batch could have
+            more documents if a day has more
+            default is None, meaning the `batch_size` of the instance
+        """
+        if batch_size is None:
+            batch_size = self.batch_size
+
+        self.guild_msg = f"GUILDID: {guildId}:"
+        database = self.mongo_db_access.db_mongo_client[guildId]
+        collection = database.heatmaps
+
+        state = AnalyzerStateModel(database).get_state(HEATMAPS_DAYS_STATE)
+        if state is not None and state.get("lastDate") is not None:
+            collection.delete_many({"date": {"$gt": state["lastDate"]}})
+
+        batch_idx = 0
+
+        def write_days(days_heatmaps):
+            nonlocal batch_idx
+            batch_idx += 1
+            days = list(dict.fromkeys(heatmap["date"] for heatmap in days_heatmaps))
+            logging.info(
+                f"{self.guild_msg} Writing heatmaps of {days[0]} to {days[-1]}: "
+                f"Batch {batch_idx}"
+            )
+            collection.delete_many({"date": {"$in": days}})
+            for batch in self._iter_batches(days_heatmaps, batch_size):
+                collection.insert_many(batch, ordered=True)
+            self._save_heatmaps_last_date(guildId, days[-1])
+
+        days_heatmaps = []
+        for heatmap in heatmaps:
+            # the days before are complete
+            if (
+                len(days_heatmaps) >= batch_size
+                and heatmap["date"] != days_heatmaps[-1]["date"]
+            ):
+                write_days(days_heatmaps)
+                days_heatmaps = []
+            days_heatmaps.append(heatmap)
+
+        if days_heatmaps:
+            write_days(days_heatmaps)
+
+    def _save_heatmaps_last_date(self, guildId, date):
+        """
+        save the last date of the heatmaps written completely
+        None means no day is known to be written completely
+        """
+        database = self.mongo_db_access.db_mongo_client[guildId]
+        AnalyzerStateModel(database).save_state(HEATMAPS_DAYS_STATE, {"lastDate": date})
+
+    @staticmethod
+    def _track_dates(heatmaps, dates):
+        """
+        yield the heatmaps while appending their dates to the `dates` list
+        """
+        for heatmap in heatmaps:
+            if not dates or dates[-1] != heatmap["date"]:
+                dates.append(heatmap["date"])
+            yield heatmap
+
     def _session_custom_transaction(
         self,
         session,
@@ -110,6 +271,12 @@ class MongoDBOps:
             )
 
         if heatmaps_list is not None and heatmaps_list != []:
+            if not delete_heatmaps:
+                # the days could be partially written by a failed write before
+                heatmaps_dates = list({heatmap["date"] for heatmap in heatmaps_list})
+                session.client[guildId].heatmaps.delete_many(
+                    {"date": {"$in": heatmaps_dates}}
+                )
             self.insert_into_heatmaps_batches(
                 session=session,
                 heatmaps_list=heatmaps_list,
@@ -149,8 +316,8 @@ class MongoDBOps:
 
         Parameters:
         ------------
-        heatmaps_list : list of dictionaries
-            a list of activities to be imported to memberactivities table
+        heatmaps_list : list of dictionaries | Iterable[dict]
+            a list (or a stream) of heatmaps to be imported to heatmaps table
         batch_size : int
             the count of data in batches
             default is 1000
@@ -166,27 +333,122 @@ class MongoDBOps:
             batch_size=batch_size,
         )
 
-    def _batch_insertion(self, collection, data, message, batch_size):
+    def replace_collection(self, guildId, activity, data, batch_size=None):
+        """
+        replace the whole data of a collection without a transaction
+        the data is inserted into a staging collection first
+        and then it is atomically renamed to the collection
+
+        Parameters:
+        -------------
+        guildId : str
+            the guildId to replace its collection data
+        activity : str
+            the collection to replace its data, i.e. `heatmaps`
+        data : list
+            data to be the new content of the collection
+        batch_size : int | None
+            the count of data in batches
+            default is None, meaning the `batch_size` of the instance
+        """
+        self.guild_msg = f"GUILDID: {guildId}:"
+        database = self.mongo_db_access.db_mongo_client[guildId]
+        staging_name = f"{activity}_staging"
+
+        # a staging collection remained from a failed replacement
+        database.drop_collection(staging_name)
+        staging_collection = database.create_collection(staging_name)
+
+        self._batch_insertion(
+            staging_collection,
+            data,
+            message=f"{self.guild_msg} Inserting {activity} documents to staging",
+            batch_size=batch_size,
+        )
+
+        # the indexes of the collection are dropped by the rename
+        self._copy_indexes(database[activity], staging_collection)
+
+        logging.info(f"{self.guild_msg} Replacing {activity} with the staging data")
+        staging_collection.rename(activity, dropTarget=True)
+
+    def _copy_indexes(self, source, target):
+        """
+        create the indexes of the `source` collection on the `target` collection
+        """
+        for name, index in source.index_information().items():
+            if name == "_id_":
+                continue
+            options = {
+                key: value
+                for key, value in index.items()
+                if key not in ["key", "v", "ns"]
+            }
+            target.create_index(index["key"], name=name, **options)
+
+    def _batch_insertion(self, collection, data, message, batch_size=None):
         """
         do the batch insertion with and log a given message
+        the batches are inserted unordered
+        and concurrently if the instance has more than one `writers`
 
         Parameters:
         -------------
         collection : MongoDB collection
             the collection to insert data into
-        data : list
+        data : list | Iterable
             data to insert into the collection
+            if it wasn't a list, it is consumed batch by batch,
+            so just a few batches of it would be in memory at once
         message : str
             the additional message to log while insertion
-        batch_size : int
+        batch_size : int | None
             the count of data in batches
+            default is None, meaning the `batch_size` of the instance
         """
-        data_len = len(data)
-        batch_count = data_len // batch_size
+        if batch_size is None:
+            batch_size = self.batch_size
+
+        if isinstance(data, list):
+            batch_count = f"/{-(-len(data) // batch_size)}"
+            batches = (
+                data[batch_idx : batch_idx + batch_size]
+                for batch_idx in range(0, len(data), batch_size)
+            )
+        else:
+            # the count of the batches of a stream is not known beforehand
+            batch_count = ""
+            batches = self._iter_batches(data, batch_size)
 
-        for loop_idx, batch_idx in enumerate(range(0, data_len, batch_size)):
-            logging.info(f"{message}: Batch {loop_idx + 1}/{batch_count}")
-            collection.insert_many(data[batch_idx : batch_idx + batch_size])
+        def insert_batch(loop_idx, batch):
+            logging.info(f"{message}: Batch {loop_idx + 1}{batch_count}")
+            collection.insert_many(batch, ordered=False)
+
+        if self.writers > 1:
+            with ThreadPoolExecutor(max_workers=self.writers) as executor:
+                # bounding the batches in memory that are waiting to be inserted
+                pending = deque()
+                for loop_idx, batch in enumerate(batches):
+                    pending.append(executor.submit(insert_batch, loop_idx, batch))
+                    if len(pending) >= 2 * self.writers:
+                        # raising the errors of the writers
+                        pending.popleft().result()
+                while pending:
+                    pending.popleft().result()
+        else:
+            for loop_idx, batch in enumerate(batches):
+                insert_batch(loop_idx, batch)
+
+    @staticmethod
+    def _iter_batches(data, batch_size):
+        """
+        yield the lists of `batch_size` items of the `data` iterable
+        """
+        data_iterator = iter(data)
+        batch = list(islice(data_iterator, batch_size))
+        while batch:
+            yield batch
+            batch = list(islice(data_iterator, batch_size))
 
     def empty_collection(self, session, guildId, activity):
         """
@@ -216,3 +478,44 @@ class MongoDBOps:
             )
 
         collection.delete_many({})
+
+
+def get_mongo_write_options() -> dict:
+    """
+    get the options of writing the analytics into MongoDB
+    from the environment variables
+
+    - `MONGODB_WRITE_BATCH_SIZE`: the count of documents inserted at once
+    - `MONGODB_WRITERS`: the count of threads inserting the batches
+    - `MONGODB_STAGING_RECOMPUTE`: whether to replace the recomputed heatmaps
+      through a staging collection (`true` or `false`)
+
+    Returns:
+    ---------
+    options : dict
+        the `batch_size`, `writers` and `staging_recompute` kwargs of `MongoDBOps`
+        the defaults are used for the variables not set
+    """
+    options = {}
+    for variable, option in [
+        ("MONGODB_WRITE_BATCH_SIZE", "batch_size"),
+        ("MONGODB_WRITERS", "writers"),
+    ]:
+        value = os.getenv(variable, "")
+        if value == "":
+            continue
+        try:
+            options[option] = max(int(value), 1)
+        except ValueError:
+            logging.warning(f"Invalid {variable} value: {value}, using the default!")
+
+    staging_recompute = os.getenv("MONGODB_STAGING_RECOMPUTE", "").lower()
+    if staging_recompute in ["true", "1", "yes"]:
+        options["staging_recompute"] = True
+    elif staging_recompute not in ["", "false", "0", "no"]:
+        logging.warning(
+            f"Invalid MONGODB_STAGING_RECOMPUTE value: {staging_recompute}, "
+            "using the default!"
+        )
+
+    return options
@@ -0,0 +1,167 @@
+import logging
+from typing import Any
+
+from tc_neo4j_lib.neo4j_ops import Neo4jOps
+
+# the constraints and indexes the analytics queries look the data up with
+# all are idempotent, so running them again doesn't change the schema
+NEO4J_SCHEMA_QUERIES = [
+    """
+    CREATE CONSTRAINT discord_account_user_id IF NOT EXISTS
+    FOR (a:DiscordAccount) REQUIRE a.userId IS UNIQUE
+    """,
+    """
+    CREATE CONSTRAINT guild_guild_id IF NOT EXISTS
+    FOR (g:Guild) REQUIRE g.guildId IS UNIQUE
+    """,
+    """
+    CREATE CONSTRAINT community_id IF NOT EXISTS
+    FOR (c:Community) REQUIRE c.id IS UNIQUE
+    """,
+    """
+    CREATE INDEX interacted_with_guild_id IF NOT EXISTS
+    FOR ()-[r:INTERACTED_WITH]-() ON (r.guildId)
+    """,
+    """
+    CREATE INDEX interacted_with_guild_id_date IF NOT EXISTS
+    FOR ()-[r:INTERACTED_WITH]-() ON (r.guildId, r.date)
+    """,
+    """
+    CREATE INDEX have_metrics_date IF NOT EXISTS
+    FOR ()-[r:HAVE_METRICS]-() ON (r.date)
+    """,
+    """
+    CREATE INDEX interacted_in_date IF NOT EXISTS
+    FOR ()-[r:INTERACTED_IN]-() ON (r.date)
+    """,
+]
+
+# the lookups of the analytics queries that should be answered by the schema
+NEO4J_HOT_QUERIES = [
+    "MATCH (a:DiscordAccount {userId: $user_id}) RETURN a",
+    "MATCH (g:Guild {guildId: $guild_id}) RETURN g",
+    """
+    MATCH (:DiscordAccount) -[r:INTERACTED_WITH {guildId: $guild_id, date: $date}]->
+        (:DiscordAccount)
+    RETURN r
+    """,
+    "MATCH (g:Guild) -[r:HAVE_METRICS {date: $date}]-> (g) RETURN r",
+    "MATCH (:DiscordAccount) -[r:INTERACTED_IN {date: $date}]-> (:Guild) RETURN r",
+]
+
+# the query plan operators scanning all the nodes of a label
+# (or all the relationships of a type) instead of an index seek
+SCAN_OPERATORS = [
+    "AllNodesScan",
+    "NodeByLabelScan",
+    "DirectedRelationshipTypeScan",
+    "UndirectedRelationshipTypeScan",
+    "DirectedAllRelationshipsScan",
+    "UndirectedAllRelationshipsScan",
+]
+
+# whether the schema is bootstrapped in this process
+_schema_ensured = False
+
+
+def ensure_neo4j_schema(neo4j_ops: Neo4jOps | None, force: bool = False) -> bool:
+    """
+    create the constraints and indexes of `NEO4J_SCHEMA_QUERIES` if they don't
+    exist and warn for the `NEO4J_HOT_QUERIES` still scanning a label
+    this is done once per process, unless `force` is True
+
+    Parameters:
+    ------------
+    neo4j_ops : Neo4jOps | None
+        the neo4j access
+        if None, the schema is not bootstrapped
+    force : bool
+        bootstrap the schema even if it was done before in the process
+        default is False
+
+    Returns:
+    ---------
+    ensured : bool
+        True if the schema queries were run, either now or before
+        a failed query is logged and not retried in the process
+    """
+    global _schema_ensured
+
+    if _schema_ensured and not force:
+        return True
+    if neo4j_ops is None:
+        logging.warning("No Neo4j connection, skipping the schema bootstrap!")
+        return False
+
+    logging.info("Bootstrapping the Neo4j schema!")
+    try:
+        session = neo4j_ops.neo4j_driver.session(database=neo4j_ops.db_name)
+    except Exception as exp:
+        logging.error(f"Couldn't bootstrap the Neo4j schema, exception: {exp}")
+        return False
+
+    with session:
+        # the schema queries can't be run within a write transaction
+        # one failing (i.e. duplicate data for a constraint) shouldn't
+        # prevent the others from being created
+        for query in NEO4J_SCHEMA_QUERIES:
+            try:
+                session.run(query).consume()
+            except Exception as exp:
+                logging.warning(
+                    "Couldn't run the Neo4j schema query: "
+                    f"{' '.join(query.split())}, exception: {exp}"
+                )
+
+    for query in NEO4J_HOT_QUERIES:
+        find_label_scans(neo4j_ops, query)
+
+    _schema_ensured = True
+    return True
+
+
+def find_label_scans(
+    neo4j_ops: Neo4jOps, query: str, parameters: dict[str, Any] | None = None
+) -> list[str]:
+    """
+    explain a query and warn if its plan scans a label instead of an index seek
+    the query itself is not run
+
+    Parameters:
+    ------------
+    neo4j_ops : Neo4jOps
+        the neo4j access
+    query : str
+        the query to check its plan
+    parameters : dict[str, Any] | None
+        the parameters of the query
+        default is None, meaning no parameters
+
+    Returns:
+    ---------
+    scans : list[str]
+        the scan operators of the plan, see `SCAN_OPERATORS`
+    """
+    try:
+        with neo4j_ops.neo4j_driver.session(database=neo4j_ops.db_name) as session:
+            summary = session.run(f"EXPLAIN {query}", parameters or {}).consume()
+    except Exception as exp:
+        logging.error(f"Couldn't explain the Neo4j query, exception: {exp}")
+        return []
+
+    scans = []
+    plans = [summary.plan] if summary.plan else []
+    while plans:
+        plan = plans.pop()
+        # the operators are like `NodeByLabelScan@neo4j`
+        operator = plan.get("operatorType", "").split("@")[0]
+        if operator in SCAN_OPERATORS:
+            scans.append(operator)
+        plans.extend(plan.get("children", []))
+
+    if scans:
+        logging.warning(
+            f"Neo4j query plan is scanning instead of an index seek: {scans}, "
+            f"query: {' '.join(query.split())}"
+        )
+    return scans
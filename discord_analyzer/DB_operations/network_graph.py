@@ -1,29 +1,44 @@
 # Store and Rietrive the network graph from neo4j db
 
 import datetime
+import logging
+import os
 
 import networkx
+from discord_analyzer.analysis.utils.window_graph import WindowGraph
 from tc_neo4j_lib import Query
 
+# the default count of rows written by each bulk query
+NEO4J_WRITE_CHUNK_SIZE = 10000
+
 
 def make_neo4j_networkx_query_dict(
-    networkx_graphs: dict[datetime.datetime, networkx.classes.graph.Graph],
+    networkx_graphs: dict[
+        datetime.datetime, WindowGraph | networkx.classes.graph.Graph
+    ],
     guildId: str,
     community_id: str,
+    chunk_size: int | None = None,
 ) -> list[Query]:
     """
-    make a list of queries to store networkx graphs into the neo4j
+    make a list of queries to store the graphs into the neo4j
 
     Parameters:
     -------------
-    networkx_graphs : dictionary of networkx.classes.graph.Graph
+    networkx_graphs : dictionary of WindowGraph
+                        or networkx.classes.graph.Graph
                         or networkx.classes.digraph.DiGraph
         the dictinoary keys is the date of graph and the values
-         are the actual networkx graphs
+         are the edge arrays of the graphs (or the actual networkx graphs
+         having the `acc_name` attribute for their nodes)
     guildId : str
         the guild that the members belong to
     community_id : str
         the community id to save the data for
+    chunk_size : int | None
+        the count of nodes or edges written by each query
+        default is None, meaning it would be read from the
+        `NEO4J_WRITE_CHUNK_SIZE` environment variable
 
     Returns:
     -----------
@@ -31,9 +46,11 @@ def make_neo4j_networkx_query_dict(
         list of string queries to store data into neo4j
     """
     # extract the graphs and their corresponding interaction dates
-    graph_list, graph_dates = list(networkx_graphs.values()), list(
-        networkx_graphs.keys()
-    )
+    graph_list = [
+        (graph if isinstance(graph, WindowGraph) else WindowGraph.from_networkx(graph))
+        for graph in networkx_graphs.values()
+    ]
+    graph_dates = list(networkx_graphs.keys())
 
     # make a list of queries for each date to save
     # the Useraccount and INTERACTED relation between them
@@ -43,25 +60,28 @@ def make_neo4j_networkx_query_dict(
         guildId=guildId,
         community_id=community_id,
         toGuildRelation="IS_MEMBER",
+        chunk_size=chunk_size,
     )
 
     return queries_list
 
 
 def make_graph_list_query(
-    networkx_graphs: networkx.classes.graph.Graph,
+    networkx_graphs: list[WindowGraph],
     networkx_dates: list[datetime.datetime],
     guildId: str,
     community_id: str,
     toGuildRelation: str = "IS_MEMBER",
+    chunk_size: int | None = None,
 ) -> list[Query]:
     """
-    Make a list of queries for each graph to save their results
+    Make a list of bulk queries to save the graphs
+    the guild and community are created once, then the accounts of all graphs
+    and then the relationships of each graph, all in chunks of `chunk_size` rows
 
     Parameters:
     -------------
-    networkx_graphs : list of networkx.classes.graph.Graph
-                      or networkx.classes.digraph.DiGraph
+    networkx_graphs : list of WindowGraph
         the list of graph created from user interactions
     networkx_dates : list of dates
         the dates for each graph
@@ -73,34 +93,81 @@ def make_graph_list_query(
     toGuildRelation : str
         the relationship label that connect the users to guilds
         default value is `IS_MEMBER`
+    chunk_size : int | None
+        the count of nodes or edges written by each query
+        default is None, meaning it would be read from the
+        `NEO4J_WRITE_CHUNK_SIZE` environment variable
 
     Returns:
     ---------
     final_queries : list[Query]
         list of strings, each is a query for an interaction graph to be created
     """
+    if chunk_size is None:
+        chunk_size = get_neo4j_write_chunk_size()
+
     final_queries: list[Query] = []
+    if networkx_graphs == []:
+        return final_queries
 
-    for graph, date in zip(networkx_graphs, networkx_dates):
-        nodes_dict = graph.nodes.data()
-        edges_dict = graph.edges.data()
-
-        node_queries, query_relations = create_network_query(
-            nodes_dict,
-            edges_dict,
-            date,
-            guildId=guildId,
-            toGuildRelation=toGuildRelation,
+    date_now_timestamp = get_timestamp()
+
+    final_queries.append(create_community_node_query(community_id, guildId))
+
+    # the accounts of all graphs, each one once
+    acc_names = list(
+        dict.fromkeys(
+            acc_name for graph in networkx_graphs for acc_name in graph.acc_names
+        )
+    )
+    for idx in range(0, len(acc_names), chunk_size):
+        final_queries.append(
+            create_nodes_query(
+                acc_names[idx : idx + chunk_size],
+                date_now_timestamp,
+                guildId=guildId,
+                toGuildRelation=toGuildRelation,
+            )
         )
-        community_query = create_community_node_query(community_id, guildId)
 
-        final_queries.extend(node_queries)
-        final_queries.extend(query_relations)
-        final_queries.append(community_query)
+    for graph, date in zip(networkx_graphs, networkx_dates):
+        edges = [
+            {"source": source, "target": target, "weight": weight}
+            for source, target, weight in graph.iter_edges()
+        ]
+        for idx in range(0, len(edges), chunk_size):
+            final_queries.append(
+                create_edges_query(edges[idx : idx + chunk_size], date, guildId=guildId)
+            )
 
     return final_queries
 
 
+def get_neo4j_write_chunk_size() -> int:
+    """
+    get the count of rows written by each bulk neo4j query
+    from the `NEO4J_WRITE_CHUNK_SIZE` environment variable
+
+    Returns:
+    ---------
+    chunk_size : int
+        the count of rows in each query
+        default is `NEO4J_WRITE_CHUNK_SIZE`
+    """
+    chunk_size = os.getenv("NEO4J_WRITE_CHUNK_SIZE", "")
+    if chunk_size == "":
+        return NEO4J_WRITE_CHUNK_SIZE
+
+    try:
+        return max(int(chunk_size), 1)
+    except ValueError:
+        logging.warning(
+            f"Invalid NEO4J_WRITE_CHUNK_SIZE value: {chunk_size}, "
+            f"using {NEO4J_WRITE_CHUNK_SIZE} instead!"
+        )
+        return NEO4J_WRITE_CHUNK_SIZE
+
+
 def create_community_node_query(
     community_id: str,
     guild_id: str,
@@ -144,129 +211,115 @@ def create_community_node_query(
     return query
 
 
-def create_network_query(
-    nodes_dict: networkx.classes.reportviews.NodeDataView,
-    edge_dict: networkx.classes.reportviews.EdgeDataView,
+def create_nodes_query(
+    acc_names: list[str],
+    date_now_timestamp: float,
+    guildId: str,
+    nodes_type: str = "DiscordAccount",
+    toGuildRelation: str = "IS_MEMBER",
+) -> Query:
+    """
+    make one query to save the accounts and their membership to the guild
+    The query is using `MERGE` operator of Neo4j db
+     since it won't create duplicate nodes and relationships
+     if the account was saved before
+
+    Parameters:
+    -------------
+    acc_names : list[str]
+        the account names to save
+    date_now_timestamp : float
+        the timestamp to set as `createdAt` of the new nodes and relationships
+    guildId : str
+        the guild that the accounts are member of
+        the guild node should be already created
+        if `None`, the membership relationships are not created
+    nodes_type : str
+        the type of nodes to be saved
+        default is `DiscordAccount`
+    toGuildRelation : str
+        the relationship label that connect the users to guilds
+        default value is `IS_MEMBER`
+
+    Returns:
+    ----------
+    query : Query
+        the UNWIND MERGE query for creating the nodes
+    """
+    query_str = f"""
+        UNWIND $acc_names AS acc_name
+        MERGE (a:{nodes_type} {{userId: acc_name}})
+            ON CREATE SET a.createdAt = $date_now_timestamp
+    """
+    # relationship query between users and guilds
+    if guildId is not None:
+        query_str += f"""
+        WITH a
+        MATCH (g:Guild {{guildId: $guild_id}})
+        MERGE (a) -[rel_guild:{toGuildRelation}]-> (g)
+            ON CREATE SET rel_guild.createdAt = $date_now_timestamp
+        """
+
+    parameters = {
+        "acc_names": list(acc_names),
+        "date_now_timestamp": int(date_now_timestamp),
+        "guild_id": guildId,
+    }
+    return Query(query_str, parameters)
+
+
+def create_edges_query(
+    edges: list[dict],
     graph_date: datetime.datetime,
     guildId: str,
     nodes_type: str = "DiscordAccount",
     rel_type: str = "INTERACTED_WITH",
-    toGuildRelation: str = "IS_MEMBER",
-) -> tuple[list[Query], list[Query]]:
+) -> Query:
     """
-    make string query to save the accounts with their
-     account_name and relationships with their relation from **a graph**.
-    The query to add the nodes and edges is using `MERGE` operator
-     of Neo4j db since it won't create duplicate nodes and edges
-     if the relation and the account was saved before
+    make one query to save the relationships of a graph date
+    The query is using `MERGE` operator of Neo4j db
+     since it won't create duplicate relationships if they were saved before
 
     Parameters:
     -------------
-    nodes_dict : NodeDataView
-        the nodes of a Networkx graph
-    edge_dict : EdgeDataView
-        the edges of a Networkx graph
+    edges : list[dict]
+        the relationships to save, each is like
+        `{"source": str, "target": str, "weight": int}`
+        the accounts should be already created
     graph_date : datetime
         the date of the interaction in as a python datetime object
+    guildId : str
+        the guild that the interactions belong to
     nodes_type : str
         the type of nodes to be saved
-        default is `Account`
+        default is `DiscordAccount`
     rel_type : str
         the type of relationship to create
-        default is `INTERACTED`
+        default is `INTERACTED_WITH`
 
     Returns:
     ----------
-    node_queries : list[Query]
-        the list of MERGE queries for creating all nodes
-    rel_queries : list[Query]
-        the list of MERGE queries for creating all relationships
+    query : Query
+        the UNWIND MERGE query for creating the relationships
     """
-    # getting the timestamp `date`
-    graph_date_timestamp = get_timestamp(graph_date)
-    date_now_timestamp = get_timestamp()
-
-    # initializiation of queries
-    rel_queries: list[Query] = []
-    node_queries: list[Query] = []
-
-    for node in nodes_dict:
-        node_str_query = ""
-        # retrieving node data
-        # user number
-        node_num = node[0]
-        # user account name
-        node_acc_name = node[1]["acc_name"]
-        # creating the query
-        node_str_query += (
-            f"MERGE (a{node_num}:{nodes_type} {{userId: $node_acc_name}})   "
-        )
-        node_str_query += f"""ON CREATE SET a{node_num}.createdAt =
-                                    $date_now_timestamp
-                            """
-
-        # relationship query between users and guilds
-        if guildId is not None:
-            # creating the guilds if they weren't created before
-            node_str_query += f"""MERGE (g:Guild {{guildId: '{guildId}'}})
-                                ON CREATE SET g.createdAt = $date_now_timestamp
-                            """
-
-            node_str_query += f"""
-                MERGE (a{node_num})
-                        -[rel_guild{node_num}:{toGuildRelation}]-> (g)
-                    ON CREATE SET
-                        rel_guild{node_num}.createdAt = $date_now_timestamp
-            """
-
-        parameters = {
-            "node_acc_name": node_acc_name,
-            "date_now_timestamp": int(date_now_timestamp),
-        }
-        query_str = node_str_query + ";"
-
-        node_queries.append(Query(query_str, parameters))
-
-    for idx, edge in enumerate(edge_dict):
-        rel_str_query = ""
-
-        # retrieving edge data
-
-        # relationship from user number
-        starting_acc_num = edge[0]
-        # relationship to user number
-        ending_acc_num = edge[1]
-
-        starting_node_acc_name = nodes_dict[starting_acc_num]["acc_name"]
-        ending_node_acc_name = nodes_dict[ending_acc_num]["acc_name"]
-
-        # the interaction count between them
-        interaction_count = edge[2]["weight"]
-
-        rel_str_query += f"""MATCH (a{starting_acc_num}:{nodes_type}
-                            {{userId: $starting_node_acc_name}})
-                                MATCH (a{ending_acc_num}:{nodes_type}
-                                  {{userId: $ending_node_acc_name}})
-                                MERGE
-                                (a{starting_acc_num}) -[rel{idx}:{rel_type}
-                                    {{
-                                        date: $date,
-                                        weight: $weight,
-                                        guildId: $guild_id
-                                    }}
-                                ]-> (a{ending_acc_num})
-                                    """
-        query_str = rel_str_query + ";"
-        parameters = {
-            "starting_node_acc_name": starting_node_acc_name,
-            "ending_node_acc_name": ending_node_acc_name,
-            "date": int(graph_date_timestamp),
-            "weight": int(interaction_count),
-            "guild_id": guildId,
-        }
-        rel_queries.append(Query(query_str, parameters))
-
-    return node_queries, rel_queries
+    query_str = f"""
+        UNWIND $edges AS edge
+        MATCH (a:{nodes_type} {{userId: edge.source}})
+        MATCH (b:{nodes_type} {{userId: edge.target}})
+        MERGE (a) -[rel:{rel_type}
+            {{
+                date: $date,
+                weight: edge.weight,
+                guildId: $guild_id
+            }}
+        ]-> (b)
+    """
+    parameters = {
+        "edges": edges,
+        "date": int(get_timestamp(graph_date)),
+        "guild_id": guildId,
+    }
+    return Query(query_str, parameters)
 
 
 def get_timestamp(time: datetime.datetime | None = None) -> float:
@@ -65,245 +65,380 @@ def activity_hourly(
     Notes:
     The results are saved as JSON objects based on out_file_name
     """
+    warning_count, all_day_activity_obj = compute_day_activities(
+        json_file,
+        acc_names=acc_names,
+        mess_substring=mess_substring,
+        emoji_types=emoji_types,
+    )
+
+    # # # store results    # # #
+    # json_out_file = store_results_json([i.asdict() for i in \
+    #     all_day_activity_obj], out_file_name)
+    return (warning_count, [i.asdict() for i in all_day_activity_obj])
+
+
+def compute_day_activities(
+    json_file, acc_names, mess_substring=None, emoji_types=None
+):
+    """
+    Counts activity per hour from json_file into DayActivity objects
+
+    Input:
+    json_file - [JSON]: list of JSON objects with message data
+    acc_names - [str]: account names for which activity should be
+        counted separately. the "remainder" category is appended to it
+    mess_substring - [str]: only messages containing at least one
+        substring in this list are considered. all messages are
+        considered if set to None (default = None)
+    emoji_types - [str]: only emojis in this list are considered. all
+        emojis are considered if set to None (default = None)
+
+    Output:
+    warning_count - [int]: list of counts for the different possible
+        warnings, see `activity_hourly`
+    all_day_activity_obj - DayActivityStore: DayActivity objects per
+        date and channel. the objects are sparse, they just keep the
+        rows of the accounts that were active in that date and channel
+
+    Notes:
+    The messages are first encoded into integer columns (DayActivity
+    object index, account index and hour per message, mention and
+    reaction) and the hourly count arrays are then filled with one
+    scatter-add for all activity types
+    """
 
     # initiate array with zeros for counting error occurences
     warning_count = [0] * 7
 
-    # initiate empty result array for DayActivity objects all_day_activity_obj = []
-
     # add remainder category to acc_names
     acc_names.append("remainder")
-    all_day_activity_obj = []
+    remainder_i = len(acc_names) - 1
+
+    # account name to row index, the first occurrence is used
+    # (the same as `acc_names.index`)
+    acc_index = {}
+    for acc_i, acc in enumerate(acc_names):
+        acc_index.setdefault(acc, acc_i)
+
+    all_day_activity_obj = DayActivityStore()
+
+    # one entry per message
+    mess_obj_i = []
+    mess_hours = []
+    mess_kinds = []
+    auth_idx = []
+    rep_idx = []
+    n_men_list = []
+    n_rep_men_list = []
+    n_reac_list = []
+
+    # one entry per counted mention and per counted reaction
+    men_obj_i, men_acc_i, men_hours = [], [], []
+    reac_obj_i, reac_acc_i, reac_hours = [], [], []
+
+    # the account names per (object index, account index)
+    per_acc = {
+        "reacted_per_acc": {},
+        "mentioner_per_acc": {},
+        "replied_per_acc": {},
+    }
+
     # for each message
     for mess in json_file:
         # # # check for specific message content # # #
 
         # if message contains specified substring (or None are specified)
-        if (mess_substring is None) or (
+        if (mess_substring is not None) and not (
             any([ss in mess["message_content"] for ss in mess_substring])
         ):
-            # # # extract data # # #
-
-            # obtain message date, channel and author and reply author
-            mess_date = mess["datetime"].strftime("%Y-%m-%d")
-            mess_hour = int(mess["datetime"].strftime("%H"))
-            mess_chan = mess["channel"]
-            mess_auth = mess["author"]
-            rep_auth = mess["replied_user"]
-
-            reactions = parse_reaction(mess["reactions"])
-
-            try:
-                # obtain index of author in acc_names
-                auth_i = acc_names.index(mess_auth)
-            except Exception as exp:
-                # if author is not in acc_names,
-                # raise warning and add counts to remainder
-                print(
-                    f"WARNING: author name {mess_auth} not found in acc_names",
-                    f"Exception: {exp}",
-                )
-                warning_count[0] += 1
-                auth_i = -1
-
-            if rep_auth is not None:
-                try:
-                    # obtain index of reply author in acc_names
-                    rep_i = acc_names.index(rep_auth)
-                except Exception as exp:
-                    # if author is not in acc_names, raise warning
-                    #  and add counts to remainder
-                    print(
-                        f"WARNING: author name {rep_auth} not found in acc_names",
-                        f"Exception: {exp}",
-                    )
-                    warning_count[6] += 1
-                    rep_i = -1
-            else:
-                rep_i = None
+            continue
+
+        # # # extract data # # #
+
+        # obtain message date, channel and author and reply author
+        mess_date = mess["datetime"].strftime("%Y-%m-%d")
+        mess_hour = mess["datetime"].hour
+        mess_chan = mess["channel"]
+        mess_auth = mess["author"]
+        rep_auth = mess["replied_user"]
+
+        auth_i = acc_index.get(mess_auth)
+        if auth_i is None:
+            # if author is not in acc_names,
+            # raise warning and add counts to remainder
+            print(f"WARNING: author name {mess_auth} not found in acc_names")
+            warning_count[0] += 1
+            auth_i = remainder_i
+
+        rep_unknown = False
+        if rep_auth is not None:
+            rep_i = acc_index.get(rep_auth)
+            if rep_i is None:
+                # if author is not in acc_names, raise warning
+                #  and add counts to remainder
+                print(f"WARNING: author name {rep_auth} not found in acc_names")
+                warning_count[6] += 1
+                rep_i = remainder_i
+                rep_unknown = True
+        else:
+            rep_i = remainder_i
+
+        # # # obtain object index in object list # # #
+
+        # see if an object exists with corresponding date and channel
+        (all_day_activity_obj, obj_list_i, warning_count) = get_obj_list_i(
+            all_day_activity_obj, mess_date, mess_chan, acc_names, warning_count
+        )
 
-            # # # obtain object index in object list # # #
+        # # # count activity per hour # # #
 
-            # see if an object exists with corresponding date and channel
-            (all_day_activity_obj, obj_list_i, warning_count) = get_obj_list_i(
-                all_day_activity_obj, mess_date, mess_chan, acc_names, warning_count
-            )
+        # count reactions
+        (n_reac, reacting_accs, warning_count) = count_reactions(
+            parse_reaction(mess["reactions"]), emoji_types, mess_auth, warning_count
+        )
 
-            # # # count activity per hour # # #
+        # add reacting accounts
+        per_acc["reacted_per_acc"].setdefault((obj_list_i, auth_i), []).extend(
+            reacting_accs
+        )
 
-            # count reactions
-            (n_reac, reacting_accs, warning_count) = count_reactions(
-                reactions, emoji_types, mess_auth, warning_count
-            )
+        # every reaction is counted for the reacting account
+        reacting_idx, not_found = _get_acc_indices(
+            reacting_accs, acc_index, remainder_i
+        )
+        warning_count[4] += not_found
+        reac_obj_i.extend([obj_list_i] * len(reacting_idx))
+        reac_acc_i.extend(reacting_idx)
+        reac_hours.extend([mess_hour] * len(reacting_idx))
+
+        # count mentions
+        (n_men, n_rep_men, mentioned_accs, warning_count) = count_mentions(
+            mess["user_mentions"], rep_auth, mess_auth, warning_count
+        )
 
-            # if there are any reacting accounts
-            if len(reacting_accs) > 0:
-                # for each reacting account
-                for r_a in reacting_accs:
-                    # add reacting accounts
-                    all_day_activity_obj[obj_list_i].reacted_per_acc[auth_i].append(r_a)
+        # add mentioned accounts
+        per_acc["mentioner_per_acc"].setdefault((obj_list_i, auth_i), []).extend(
+            mentioned_accs
+        )
 
-            # add n_reac to hour of message that received the emoji
-            all_day_activity_obj[obj_list_i].reacted[auth_i, mess_hour] += int(n_reac)
+        mess_kind = _get_message_kind(mess["threadId"], mess["mess_type"])
 
-            # count raised warnings
-            warning_count[4] += count_from_list(
-                reacting_accs,
-                acc_names,
-                all_day_activity_obj[obj_list_i].reacter,
-                mess_hour,
+        if mess_kind != _OTHER:
+            # mentions are just counted for default messages and replies
+            mentioned_idx, not_found = _get_acc_indices(
+                mentioned_accs, acc_index, remainder_i
             )
-
-            # count mentions
-            (n_men, n_rep_men, mentioned_accs, warning_count) = count_mentions(
-                mess["user_mentions"], rep_auth, mess_auth, warning_count
+            warning_count[5] += not_found
+            men_obj_i.extend([obj_list_i] * len(mentioned_idx))
+            men_acc_i.extend(mentioned_idx)
+            men_hours.extend([mess_hour] * len(mentioned_idx))
+
+        if mess_kind == _REPLY:
+            # store account name that replied
+            # for author of message that was replied to
+            per_acc["replied_per_acc"].setdefault((obj_list_i, rep_i), []).append(
+                mess_auth
             )
 
-            # if there are any mentioned accounts
-            if len(mentioned_accs) > 0:
-                # for each mentioned account
-                for m_a in mentioned_accs:
-                    # add mentioned accounts
-                    all_day_activity_obj[obj_list_i].mentioner_per_acc[auth_i].append(
-                        m_a
-                    )
-
-            # if message was not sent in thread
-            if mess["threadId"] is None:
-                # if message is default message
-                if mess["mess_type"] == 0:
-                    # add 1 to hour of message
-                    all_day_activity_obj[obj_list_i].lone_messages[
-                        auth_i, mess_hour
-                    ] += int(1)
-
-                    # add n_men to hour for message sender
-                    all_day_activity_obj[obj_list_i].mentioner[
-                        auth_i, mess_hour
-                    ] += int(n_men)
-
-                    # count raised warnings
-                    warning_count[5] += count_from_list(
-                        mentioned_accs,
-                        acc_names,
-                        all_day_activity_obj[obj_list_i].mentioned,
-                        mess_hour,
-                    )
-
-                # if message is reply
-                elif mess["mess_type"] == 19:
-                    # store account name that replied
-                    # for author of message that was replied to
-                    all_day_activity_obj[obj_list_i].replied_per_acc[rep_i].append(
-                        mess_auth
-                    )
-
-                    # add 1 to hour of message for replier
-                    all_day_activity_obj[obj_list_i].replier[auth_i, mess_hour] += 1
-
-                    # add 1 to hour of message for replied
-                    all_day_activity_obj[obj_list_i].replied[rep_i, mess_hour] += 1
-
-                    # add n_men to hour for message sender
-                    all_day_activity_obj[obj_list_i].mentioner[
-                        auth_i, mess_hour
-                    ] += int(n_men)
-
-                    # count raised warnings
-                    warning_count[5] += count_from_list(
-                        mentioned_accs,
-                        acc_names,
-                        all_day_activity_obj[obj_list_i].mentioned,
-                        mess_hour,
-                    )
-
-                    # add n_rep_men to hour of message
-                    all_day_activity_obj[obj_list_i].rep_mentioner[
-                        auth_i, mess_hour
-                    ] += int(n_rep_men)
-                    all_day_activity_obj[obj_list_i].rep_mentioned[
-                        rep_i, mess_hour
-                    ] += int(n_rep_men)
-
-                    # if reply is to unknown account
-                    # and this account got mentioned in the reply
-                    if n_rep_men > 0 and rep_i == -1:
-                        print(
-                            "WARNING: acc name {} not found in acc_names".format(
-                                rep_auth
-                            )
-                        )
-                        warning_count[5] += 1
-
-            # if message was sent in thread
-            else:
-                # if message is default message
-                if mess["mess_type"] == 0:
-                    # add 1 to hour of message
-                    all_day_activity_obj[obj_list_i].thr_messages[
-                        auth_i, mess_hour
-                    ] += int(1)
-                    # add n_men to hour for message sender
-                    all_day_activity_obj[obj_list_i].mentioner[
-                        auth_i, mess_hour
-                    ] += int(n_men)
-
-                    # count raised warnings
-                    warning_count[5] += count_from_list(
-                        mentioned_accs,
-                        acc_names,
-                        all_day_activity_obj[obj_list_i].mentioned,
-                        mess_hour,
-                    )
-                # if message is reply
-                elif mess["mess_type"] == 19:
-                    # store account name that replied
-                    # for author of message that was replied to
-                    all_day_activity_obj[obj_list_i].replied_per_acc[rep_i].append(
-                        mess_auth
-                    )
-
-                    # add 1 to hour of message for replier
-                    all_day_activity_obj[obj_list_i].replier[auth_i, mess_hour] += 1
-
-                    # add 1 to hour of message for replied
-                    all_day_activity_obj[obj_list_i].replied[rep_i, mess_hour] += int(1)
-
-                    # add n_men to hour for message sender
-                    all_day_activity_obj[obj_list_i].mentioner[
-                        auth_i, mess_hour
-                    ] += int(n_men)
-
-                    # count raised warnings
-                    warning_count[5] += count_from_list(
-                        mentioned_accs,
-                        acc_names,
-                        all_day_activity_obj[obj_list_i].mentioned,
-                        mess_hour,
-                    )
-
-                    # add n_rep_men to hour of message
-                    all_day_activity_obj[obj_list_i].rep_mentioner[
-                        auth_i, mess_hour
-                    ] += int(n_rep_men)
-                    all_day_activity_obj[obj_list_i].rep_mentioned[
-                        rep_i, mess_hour
-                    ] += int(n_rep_men)
-
-                    # if reply is to unknown account
-                    # and this account got mentioned in the reply
-                    if n_rep_men > 0 and rep_i == -1:
-                        print(
-                            "WARNING: acc name {} not found in acc_names".format(
-                                rep_auth
-                            )
-                        )
-                        warning_count[5] += 1
+            # if reply is to unknown account
+            # and this account got mentioned in the reply
+            if n_rep_men > 0 and rep_unknown:
+                print("WARNING: acc name {} not found in acc_names".format(rep_auth))
+                warning_count[5] += 1
+
+        mess_obj_i.append(obj_list_i)
+        mess_hours.append(mess_hour)
+        mess_kinds.append(mess_kind)
+        auth_idx.append(auth_i)
+        rep_idx.append(rep_i)
+        n_men_list.append(n_men)
+        n_rep_men_list.append(n_rep_men)
+        n_reac_list.append(n_reac)
+
+    # # # fill the count arrays # # #
+
+    mess_obj_i = np.asarray(mess_obj_i, dtype=np.int64)
+    mess_hours = np.asarray(mess_hours, dtype=np.int64)
+    mess_kinds = np.asarray(mess_kinds, dtype=np.int8)
+    auth_idx = np.asarray(auth_idx, dtype=np.int64)
+    rep_idx = np.asarray(rep_idx, dtype=np.int64)
+    n_men_list = np.asarray(n_men_list, dtype=np.int64)
+    n_rep_men_list = np.asarray(n_rep_men_list, dtype=np.int64)
+    n_reac_list = np.asarray(n_reac_list, dtype=np.int64)
+
+    lone = mess_kinds == _LONE
+    thread = mess_kinds == _THREAD
+    reply = mess_kinds == _REPLY
+    mention = mess_kinds != _OTHER
+
+    # (object index, account index, hour, count) per activity type
+    # count is 1 if None
+    activity_events = {
+        "lone_messages": (mess_obj_i[lone], auth_idx[lone], mess_hours[lone], None),
+        "thr_messages": (
+            mess_obj_i[thread],
+            auth_idx[thread],
+            mess_hours[thread],
+            None,
+        ),
+        "replier": (mess_obj_i[reply], auth_idx[reply], mess_hours[reply], None),
+        "replied": (mess_obj_i[reply], rep_idx[reply], mess_hours[reply], None),
+        "mentioner": (
+            mess_obj_i[mention],
+            auth_idx[mention],
+            mess_hours[mention],
+            n_men_list[mention],
+        ),
+        "mentioned": (men_obj_i, men_acc_i, men_hours, None),
+        "rep_mentioner": (
+            mess_obj_i[reply],
+            auth_idx[reply],
+            mess_hours[reply],
+            n_rep_men_list[reply],
+        ),
+        "rep_mentioned": (
+            mess_obj_i[reply],
+            rep_idx[reply],
+            mess_hours[reply],
+            n_rep_men_list[reply],
+        ),
+        "reacter": (reac_obj_i, reac_acc_i, reac_hours, None),
+        "reacted": (mess_obj_i, auth_idx, mess_hours, n_reac_list),
+    }
+
+    _fill_day_activities(all_day_activity_obj, len(acc_names), activity_events, per_acc)
+
+    return warning_count, all_day_activity_obj
+
+
+# message kinds that decide which activities a message is counted for
+_LONE = 0
+_THREAD = 1
+_REPLY = 2
+_OTHER = 3
+
+
+def _get_message_kind(thread_id, mess_type):
+    """
+    Categorizes a message for the hourly counts
 
-    # # # store results    # # #
-    # json_out_file = store_results_json([i.asdict() for i in \
-    #     all_day_activity_obj], out_file_name)
-    return (warning_count, [i.asdict() for i in all_day_activity_obj])
+    Input:
+    thread_id - str or None: id of the thread the message was sent in
+    mess_type - int: discord message type (0 = default, 19 = reply)
+
+    Output:
+    mess_kind - int: one of `_LONE`, `_THREAD`, `_REPLY` or `_OTHER`
+    """
+    if mess_type == 0:
+        return _LONE if thread_id is None else _THREAD
+    elif mess_type == 19:
+        return _REPLY
+    else:
+        return _OTHER
+
+
+def _get_acc_indices(acc_list, acc_index, remainder_i):
+    """
+    Obtains the row index of each account in acc_list
+
+    Input:
+    acc_list - [str]: account names (duplicates are kept)
+    acc_index - {str: int}: row index per account name
+    remainder_i - int: row index used for accounts not in acc_index
+
+    Output:
+    acc_indices - [int]: row index per account in acc_list
+    warning_count - int: number of accounts not found in acc_index
+
+    Notes:
+    a warning is printed for each account that is not in acc_index
+    """
+    acc_indices = []
+    warning_count = 0
+    for acc in acc_list:
+        acc_i = acc_index.get(acc)
+        if acc_i is None:
+            print(f"WARNING: acc name {acc} not found in acc_names")
+            warning_count += 1
+            acc_i = remainder_i
+        acc_indices.append(acc_i)
+
+    return acc_indices, warning_count
+
+
+def _fill_day_activities(all_day_activity_obj, n_acc, activity_events, per_acc):
+    """
+    Fills the count arrays and account lists of the DayActivity objects
+
+    Input:
+    all_day_activity_obj - DayActivityStore: the objects to fill
+    n_acc - int: number of account names
+    activity_events - {str: ([int], [int], [int], [int] or None)}: object
+        index, account index, hour and count (1 if None) of each count
+        per activity type
+    per_acc - {str: {(int, int): [str]}}: account names per object index
+        and account index for each per account activity type
+
+    Notes:
+    just the accounts that have any count or account list in an object
+    get a row in that object, so the arrays scale with the active accounts
+    """
+    n_fields = len(activity_events)
+
+    field_parts, obj_parts, acc_parts, hour_parts, count_parts = [], [], [], [], []
+    for field_i, (obj_i, acc_i, hour_i, counts) in enumerate(
+        activity_events.values()
+    ):
+        obj_i = np.asarray(obj_i, dtype=np.int64)
+        field_parts.append(np.full(len(obj_i), field_i, dtype=np.int64))
+        obj_parts.append(obj_i)
+        acc_parts.append(np.asarray(acc_i, dtype=np.int64))
+        hour_parts.append(np.asarray(hour_i, dtype=np.int64))
+        if counts is None:
+            count_parts.append(np.ones(len(obj_i), dtype=np.int64))
+        else:
+            count_parts.append(np.asarray(counts, dtype=np.int64))
+
+    # the accounts having an account list should get a row too
+    per_acc_keys = [key for acc_lists in per_acc.values() for key in acc_lists]
+    per_acc_keys = np.asarray(per_acc_keys, dtype=np.int64).reshape(-1, 2)
+
+    # the (object, account) pairs sorted by object and then account
+    pair_keys = np.concatenate(obj_parts) * n_acc + np.concatenate(acc_parts)
+    all_pairs, pair_i = np.unique(
+        np.concatenate([pair_keys, per_acc_keys[:, 0] * n_acc + per_acc_keys[:, 1]]),
+        return_inverse=True,
+    )
+    pair_i = pair_i[: len(pair_keys)]
+    n_pairs = len(all_pairs)
+
+    flat_i = (np.concatenate(field_parts) * n_pairs + pair_i) * 24
+    flat_i += np.concatenate(hour_parts)
+    counts = np.bincount(
+        flat_i, weights=np.concatenate(count_parts), minlength=n_fields * n_pairs * 24
+    )
+    counts = counts.astype(np.int64).astype(np.int16).reshape(n_fields, n_pairs, 24)
+
+    # the pairs of each object are a contiguous block
+    pair_obj_i = all_pairs // n_acc
+    pair_acc_i = all_pairs % n_acc
+    bounds = np.searchsorted(pair_obj_i, np.arange(len(all_day_activity_obj) + 1))
+
+    for obj_i, day_obj in enumerate(all_day_activity_obj):
+        start, end = bounds[obj_i], bounds[obj_i + 1]
+        day_obj.acc_rows = pair_acc_i[start:end]
+        acc_rows = day_obj.acc_rows.tolist()
+
+        for field_i, activity in enumerate(activity_events.keys()):
+            setattr(day_obj, activity, counts[field_i, start:end])
+
+        for activity, acc_lists in per_acc.items():
+            setattr(
+                day_obj,
+                activity,
+                [acc_lists.get((obj_i, acc_i), []) for acc_i in acc_rows],
+            )
 
 
 # # # # # classes # # # # #
@@ -329,6 +464,7 @@ class DayActivity:
         mentioner_per_acc,
         replied_per_acc,
         acc_names,
+        acc_rows=None,
     ):
         self.date = date  # date of object
         self.channel = channel  # channel id of object
@@ -359,32 +495,135 @@ class DayActivity:
         # list of account names from which replies are
         # received per account (duplicates = multiple replies)
         self.replied_per_acc = replied_per_acc
-        # account names (corresponds to row index of activity types)
+        # account names
         self.acc_names = acc_names
+        # index of acc_names for each row of activity types
+        # if None, there is a row for every account name
+        if acc_rows is None:
+            acc_rows = np.arange(len(acc_names))
+        self.acc_rows = np.asarray(acc_rows, dtype=np.int64)
 
     # # # functions # # #
 
     # turn object into dictionary
 
-    def asdict(self):
-        return {
+    def asdict(self, dense=True):
+        """
+        Converts the object into a dictionary
+
+        Input:
+        dense - bool: if True, the activity types have a row for every
+            account name. if False, just the rows of the object are
+            returned together with their index of acc_names (`acc_rows`)
+        """
+        day_activity = {
             "date": self.date,
             "channel": self.channel,
-            "lone_messages": self.lone_messages.tolist(),
-            "thr_messages": self.thr_messages.tolist(),
-            "replier": self.replier.tolist(),
-            "replied": self.replied.tolist(),
-            "mentioner": self.mentioner.tolist(),
-            "mentioned": self.mentioned.tolist(),
-            "rep_mentioner": self.rep_mentioner.tolist(),
-            "rep_mentioned": self.rep_mentioned.tolist(),
-            "reacter": self.reacter.tolist(),
-            "reacted": self.reacted.tolist(),
-            "reacted_per_acc": self.reacted_per_acc,
-            "mentioner_per_acc": self.mentioner_per_acc,
-            "replied_per_acc": self.replied_per_acc,
-            "acc_names": self.acc_names,
         }
+        for activity in [
+            "lone_messages",
+            "thr_messages",
+            "replier",
+            "replied",
+            "mentioner",
+            "mentioned",
+            "rep_mentioner",
+            "rep_mentioned",
+            "reacter",
+            "reacted",
+        ]:
+            counts = getattr(self, activity)
+            if dense:
+                counts = self._to_dense_counts(counts)
+            day_activity[activity] = counts.tolist()
+
+        for activity in ["reacted_per_acc", "mentioner_per_acc", "replied_per_acc"]:
+            acc_lists = getattr(self, activity)
+            if dense:
+                acc_lists = self._to_dense_lists(acc_lists)
+            day_activity[activity] = acc_lists
+
+        day_activity["acc_names"] = self.acc_names
+        if not dense:
+            day_activity["acc_rows"] = self.acc_rows.tolist()
+
+        return day_activity
+
+    def _to_dense_counts(self, counts):
+        """
+        Returns counts with a row for every account name
+        """
+        dense_counts = np.zeros((len(self.acc_names), 24), dtype=counts.dtype)
+        dense_counts[self.acc_rows] = counts
+
+        return dense_counts
+
+    def _to_dense_lists(self, acc_lists):
+        """
+        Returns acc_lists with a list for every account name
+        """
+        dense_lists = [[] for _ in range(len(self.acc_names))]
+        for acc_i, acc_list in zip(self.acc_rows.tolist(), acc_lists):
+            dense_lists[acc_i] = acc_list
+
+        return dense_lists
+
+
+class DayActivityStore:
+    """
+    DayActivity objects indexed by their (date, channel) pair
+
+    The objects are kept in the order they were added, so iterating the
+    store gives the same order as the previously used list
+    """
+
+    def __init__(self, day_activities=None):
+        # the DayActivity objects in order of addition
+        self.day_activities = []
+        # (date, channel) to the index of the first object with that key
+        self._index = {}
+        # (date, channel) pairs that are available more than once
+        self._duplicates = set()
+
+        for day_activity in day_activities or []:
+            self.append(day_activity)
+
+    def append(self, day_activity):
+        """
+        Adds a DayActivity object to the store and returns its index
+        """
+        key = (day_activity.date[0], day_activity.channel[0])
+        obj_list_i = len(self.day_activities)
+        self.day_activities.append(day_activity)
+
+        if key in self._index:
+            self._duplicates.add(key)
+        else:
+            self._index[key] = obj_list_i
+
+        return obj_list_i
+
+    def get_index(self, date, channel):
+        """
+        Returns the index of the first object for date and channel
+        or None if there is no such object
+        """
+        return self._index.get((date, channel))
+
+    def is_duplicate(self, date, channel):
+        """
+        Whether more than one object is available for date and channel
+        """
+        return (date, channel) in self._duplicates
+
+    def __getitem__(self, obj_list_i):
+        return self.day_activities[obj_list_i]
+
+    def __iter__(self):
+        return iter(self.day_activities)
+
+    def __len__(self):
+        return len(self.day_activities)
 
 
 # # # # # functions # # # # #
@@ -397,70 +636,55 @@ def get_obj_list_i(
     Assesses index of DayActivity object
 
     Input:
-    all_day_activity_obj - [obj]: list of DayActivity objects
+    all_day_activity_obj - DayActivityStore: store of DayActivity objects
     mess_date - str: date in which message was sent yyyy-mm-dd
     mess_chan - str: name of channel in which message was sent
-    num_rows - int: number of rows for count arrays in DayActivity
+    acc_names - [str]: account names (row index of the count arrays)
 
     Output:
-    all_day_activity_obj - [obj]: updated list of DayActivity objects
+    all_day_activity_obj - DayActivityStore: updated store of DayActivity
+        objects
     obj_list_i - int: index of DayActivity object in
         all_day_activity_obj that corresponds to the message
 
     Notes:
     if no corresponding DayActivity object is found in
-    all_day_activity_obj, a new DayActivity object is appended
+    all_day_activity_obj, a new DayActivity object without any account
+    rows is appended
     """
-
-    # check if DayActivity object corresponding to mess_date and mess_chan exists
-    obj_overlap = [
-        all(
-            [
-                getattr(obj, "date", "Attribute does not exist")[0] == mess_date,
-                getattr(obj, "channel", "Attribute does not exist")[0] == mess_chan,
-            ]
-        )
-        for obj in all_day_activity_obj
-    ]
+    obj_list_i = all_day_activity_obj.get_index(mess_date, mess_chan)
 
     # if there is no object for the channel date combination
-    if not any(obj_overlap):
-        # create DayActivity object and add it to the list
-        all_day_activity_obj.append(
+    if obj_list_i is None:
+        # create DayActivity object and add it to the store
+        obj_list_i = all_day_activity_obj.append(
             DayActivity(
                 [mess_date],
                 [mess_chan],
-                np.zeros((len(acc_names), 24), dtype=np.int16),
-                np.zeros((len(acc_names), 24), dtype=np.int16),
-                np.zeros((len(acc_names), 24), dtype=np.int16),
-                np.zeros((len(acc_names), 24), dtype=np.int16),
-                np.zeros((len(acc_names), 24), dtype=np.int16),
-                np.zeros((len(acc_names), 24), dtype=np.int16),
-                np.zeros((len(acc_names), 24), dtype=np.int16),
-                np.zeros((len(acc_names), 24), dtype=np.int16),
-                np.zeros((len(acc_names), 24), dtype=np.int16),
-                np.zeros((len(acc_names), 24), dtype=np.int16),
-                [[] for _ in range(len(acc_names))],
-                [[] for _ in range(len(acc_names))],
-                [[] for _ in range(len(acc_names))],
+                np.zeros((0, 24), dtype=np.int16),
+                np.zeros((0, 24), dtype=np.int16),
+                np.zeros((0, 24), dtype=np.int16),
+                np.zeros((0, 24), dtype=np.int16),
+                np.zeros((0, 24), dtype=np.int16),
+                np.zeros((0, 24), dtype=np.int16),
+                np.zeros((0, 24), dtype=np.int16),
+                np.zeros((0, 24), dtype=np.int16),
+                np.zeros((0, 24), dtype=np.int16),
+                np.zeros((0, 24), dtype=np.int16),
+                [],
+                [],
+                [],
                 acc_names,
+                acc_rows=[],
             )
         )
 
-        # set list index for message
-        # TODO: Why it was -1?
-        obj_list_i = int(-1)
-
-    else:
-        # set list index for message
-        obj_list_i = int(obj_overlap.index(True))
-
-        # see if object only occurs once and raise error if more than once
-        if sum(obj_overlap) > 1:
-            msg = "WARNING: duplicate DayActivity "
-            msg += "object, first entry in list is used"
-            print(msg)
-            warning_count[1] += 1
+    # see if object only occurs once and raise error if more than once
+    elif all_day_activity_obj.is_duplicate(mess_date, mess_chan):
+        msg = "WARNING: duplicate DayActivity "
+        msg += "object, first entry in list is used"
+        print(msg)
+        warning_count[1] += 1
 
     return all_day_activity_obj, obj_list_i, warning_count
 
@@ -582,52 +806,6 @@ def count_reactions(mess_reactions, emoji_types, mess_auth, warning_count):
 # # #
 
 
-def count_from_list(acc_list, acc_names, to_count, mess_hour):
-    """
-    Adds counts per hour to accounts from list
-
-    Input:
-    acc_list - [str]: all account names that should be counted (the
-        account is counted for each time it is in the list, allowing for
-        duplicates)
-    acc_names - [str]: account names for which activity should be
-        counted separately
-    to_count - [[int]]: activity type to be counted
-    mess_hour - int: hour at which message with activity was sent
-
-    Output:
-    warning_count - int: number of times warning was raised
-
-    Notes:
-    counts are added to DayActivity object under the to_count variable
-    """
-
-    # initiate warning count at 0
-    warning_count = 0
-
-    # for each account
-    for acc in acc_list:
-        try:
-            # obtain index of account name in acc_names
-            acc_i = acc_names.index(acc)
-
-        except Exception as exp:
-            # if acc is not in acc_names, raise warning and add count to remainder
-            msg = f"WARNING: acc name {acc} not found in acc_names"
-            msg += f", Exception: {exp}"
-            print(msg)
-            warning_count += 1
-            acc_i = -1
-
-        # add 1 to hour of message for acc
-        to_count[acc_i, mess_hour] += int(1)
-
-    return warning_count
-
-
-# # #
-
-
 def store_results_json(save_dict, file_name, print_out=False):
     """
     Stores dictionary or list of dictionaries as JSON file
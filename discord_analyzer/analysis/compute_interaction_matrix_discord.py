@@ -1,15 +1,33 @@
-import copy
 from typing import Any
 
+import numpy as np
 from discord_analyzer.DB_operations.mongodb_access import DB_access
 from discord_analyzer.DB_operations.mongodb_query import MongodbQuery
 from numpy import diag_indices_from, ndarray
 from tc_core_analyzer_lib.utils.activity import DiscordActivity
 
 from .utils.compute_interaction_mtx_utils import (
-    generate_interaction_matrix,
-    prepare_per_account,
+    fill_interaction_matrix,
+    get_account_index,
+    prepare_interaction_field_names,
+    prepare_interactions_pipeline,
 )
+from .utils.heatmaps_store import HeatmapsStore
+
+# the activities that the interaction matrices are computed for by default
+INTERACTION_ACTIVITIES = [
+    DiscordActivity.Mention,
+    DiscordActivity.Reply,
+    DiscordActivity.Reaction,
+    DiscordActivity.Lone_msg,
+    DiscordActivity.Thread_msg,
+]
+# a person interacting to themselves is not counted as these activities
+NO_SELF_INTERACTION_ACTIVITIES = [
+    DiscordActivity.Reply,
+    DiscordActivity.Reaction,
+    DiscordActivity.Mention,
+]
 
 
 def compute_interaction_matrix_discord(
@@ -40,27 +58,8 @@ def compute_interaction_matrix_discord(
         keys are representative of an activity
         and the 2d matrix representing the interactions for the activity
     """
-    activities = kwargs.get(
-        "activities",
-        [
-            DiscordActivity.Mention,
-            DiscordActivity.Reply,
-            DiscordActivity.Reaction,
-            DiscordActivity.Lone_msg,
-            DiscordActivity.Thread_msg,
-        ],
-    )
-    feature_projection = {
-        "channelId": 0,
-        "replier": 0,
-        "replied": 0,
-        "mentioner": 0,
-        "mentioned": 0,
-        "reacter": 0,
-        "reacted": 0,
-        "__v": 0,
-        "_id": 0,
-    }
+    activities = kwargs.get("activities", INTERACTION_ACTIVITIES)
+    field_names = prepare_interaction_field_names(activities=activities)
 
     # intiate query
     query = MongodbQuery()
@@ -75,30 +74,260 @@ def compute_interaction_matrix_discord(
         account_key="account_name",
     )
 
-    # create cursor for db
-    cursor = db_access.query_db_find(
-        table="heatmaps", query=query_dict, feature_projection=feature_projection
+    # summing the interactions per account pairs in database
+    cursor = db_access.query_db_aggregation(
+        table="heatmaps",
+        query=prepare_interactions_pipeline(query_dict, sorted(set(field_names))),
     )
-    db_results = list(cursor)
+    interactions = {
+        (
+            result["_id"]["field"],
+            result["_id"]["account"],
+            result["_id"]["interacted"],
+        ): result["count"]
+        for result in cursor
+    }
+
+    int_mat = build_interaction_matrices(interactions, acc_names, activities)
+    return int_mat
+
+
+def build_interaction_matrices(
+    interactions: dict[tuple[str, str, str], int],
+    acc_names: list[str],
+    activities: list[str],
+) -> dict[str, ndarray]:
+    """
+    build the interaction matrix of each activity from the summed interactions
+
+    Parameters
+    -----------
+    interactions : dict[tuple[str, str, str], int]
+        the keys are (heatmaps field, account, interacted account) tuples
+        and the values are the count of interactions
+    acc_names : list[str]
+        list of all account names to be considered for analysis
+        the interactions of other accounts are skipped
+    activities : list[str]
+        the activities to build the matrix for
+
+    Returns
+    --------
+    int_mtx : dict[str, np.ndarray]
+        keys are representative of an activity
+        and the 2d matrix representing the interactions for the activity
+    """
+    interactions_per_field: dict[str, list[tuple[str, str, int]]] = {}
+    for (field, account, interacted), count in interactions.items():
+        interactions_per_field.setdefault(field, []).append(
+            (account, interacted, count)
+        )
 
-    per_acc_query_result = prepare_per_account(db_results=db_results)
-    per_acc_interaction = process_non_reactions(per_acc_query_result)
+    acc_index = get_account_index(acc_names)
 
     # And now compute the interactions per account_name (`acc`)
     int_mat = {}
     # computing `int_mat` per activity
     for activity in activities:
-        int_mat[activity] = generate_interaction_matrix(
-            per_acc_interactions=per_acc_interaction,
-            acc_names=acc_names,
-            activities=[activity],
+        int_mat[activity] = fill_interaction_matrix(
+            interactions=[
+                interaction
+                for field in prepare_interaction_field_names(activities=[activity])
+                for interaction in interactions_per_field.get(field, [])
+            ],
+            acc_index=acc_index,
+            size=len(acc_names),
         )
-        # a person interacting to themselves is not counted as activity
-        if activity in [
-            DiscordActivity.Reply,
-            DiscordActivity.Reaction,
-            DiscordActivity.Mention,
-        ]:
+        if activity in NO_SELF_INTERACTION_ACTIVITIES:
+            int_mat[activity][diag_indices_from(int_mat[activity])] = 0
+
+    return int_mat
+
+
+class InteractionMatrixCache:
+    def __init__(
+        self,
+        channels: list[str],
+        db_access: DB_access,
+        activities: list[str] = INTERACTION_ACTIVITIES,
+        store: HeatmapsStore | None = None,
+    ) -> None:
+        """
+        the heatmaps interactions of a sliding window of dates
+        by sliding the window the interactions of the dates entering it
+        are added and the interactions of the dates leaving it are subtracted
+
+        Parameters
+        -----------
+        channels : list[str]
+            list of all channel ids to be considered for analysis
+        db_access : DB_access
+            database access object
+        activities : list[str]
+            the activities that the interaction matrices could be computed for
+            default is to include all activity types
+        store : HeatmapsStore | None
+            the store to take the interactions of the dates from
+            default is None, meaning a store for the `channels` is created
+            and the dates are loaded into it as the window slides
+        """
+        if store is None:
+            store = HeatmapsStore(
+                channels=channels,
+                db_access=db_access,
+                field_names=prepare_interaction_field_names(activities=activities),
+            )
+        self.store = store
+
+        self.dates: set[str] = set()
+        # the packed interaction keys of the window and their counts
+        self.keys = np.array([], dtype=np.int64)
+        self.counts = np.array([], dtype=np.int64)
+
+    def slide(self, dates: list[str]) -> None:
+        """
+        move the window to the given dates
+
+        Parameters
+        -----------
+        dates : list[str]
+            list of all dates of the window, in the format of `%Y-%m-%d`
+        """
+        dates_set = set(dates)
+        new_dates = sorted(dates_set - self.dates)
+        if new_dates != []:
+            # loading the new dates at once, if they weren't loaded before
+            self.store.load(new_dates[0], new_dates[-1])
+
+        keys = [self.keys]
+        counts = [self.counts]
+        for date in self.dates - dates_set:
+            date_keys, date_counts = self.store.get_interactions(date)
+            keys.append(date_keys)
+            counts.append(-date_counts)
+        for date in new_dates:
+            date_keys, date_counts = self.store.get_interactions(date)
+            keys.append(date_keys)
+            counts.append(date_counts)
+        self.dates = dates_set
+
+        if len(keys) == 1:
+            return
+
+        self.keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+        self.counts = np.zeros(len(self.keys), dtype=np.int64)
+        np.add.at(self.counts, inverse, np.concatenate(counts))
+
+        # not keeping the interactions that left the window
+        remaining = self.counts != 0
+        self.keys = self.keys[remaining]
+        self.counts = self.counts[remaining]
+
+    def compute_interaction_matrix(
+        self,
+        acc_names: list[str],
+        activities: list[str] = INTERACTION_ACTIVITIES,
+    ) -> dict[str, ndarray]:
+        """
+        compute the interaction matrix of the current window
+        the same as `compute_interaction_matrix_discord` for the window dates
+
+        Parameters
+        -----------
+        acc_names : list[str]
+            list of all account names to be considered for analysis
+        activities : list[str]
+            the activities to generate the matrix for
+            should be a subset of the activities given to the cache
+            default is to include all activity types
+
+        Returns
+        --------
+        int_mtx : dict[str, np.ndarray]
+            keys are representative of an activity
+            and the 2d matrix representing the interactions for the activity
+        """
+        interactions = self.get_window_interactions(acc_names, activities)
+        return build_window_matrices(interactions, size=len(acc_names))
+
+    def get_window_interactions(
+        self,
+        acc_names: list[str],
+        activities: list[str] = INTERACTION_ACTIVITIES,
+    ) -> dict[str, tuple[ndarray, ndarray, ndarray]]:
+        """
+        get the interactions of the current window between the given accounts
+        the compact form of `compute_interaction_matrix`,
+        see `build_window_matrices` to build the matrices from them
+
+        Parameters
+        -----------
+        acc_names : list[str]
+            list of all account names to be considered for analysis
+        activities : list[str]
+            the activities to get the interactions of
+            should be a subset of the activities given to the cache
+            default is to include all activity types
+
+        Returns
+        --------
+        interactions : dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]
+            keys are representative of an activity
+            and values are the row (account index in `acc_names`),
+            column (interacted account index), and count of the interactions
+        """
+        fields, accounts, interacted = self.store.unpack_keys(self.keys)
+
+        # the index of the accounts in the matrix, -1 for the ones to skip
+        lookup = self.store.get_id_lookup(acc_names)
+        rows = lookup[accounts]
+        columns = lookup[interacted]
+        valid = (rows >= 0) & (columns >= 0)
+
+        interactions = {}
+        for activity in activities:
+            field_ids = [
+                self.store.field_ids[field]
+                for field in prepare_interaction_field_names(activities=[activity])
+            ]
+            selected = valid & np.isin(fields, field_ids)
+            interactions[activity] = (
+                rows[selected],
+                columns[selected],
+                self.counts[selected],
+            )
+
+        return interactions
+
+
+def build_window_matrices(
+    interactions: dict[str, tuple[ndarray, ndarray, ndarray]], size: int
+) -> dict[str, ndarray]:
+    """
+    build the interaction matrix of each activity
+    from the interactions of `InteractionMatrixCache.get_window_interactions`
+
+    Parameters
+    -----------
+    interactions : dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]
+        the row, column, and count of the interactions of each activity
+    size : int
+        the count of accounts, the rows and columns of the matrices
+
+    Returns
+    --------
+    int_mtx : dict[str, np.ndarray]
+        keys are representative of an activity
+        and the 2d matrix representing the interactions for the activity
+    """
+    int_mat = {}
+    for activity, (rows, columns, counts) in interactions.items():
+        # summing with a wide type and storing with the type of the results
+        matrix = np.zeros((size, size), dtype=np.int64)
+        np.add.at(matrix, (rows, columns), counts)
+        int_mat[activity] = matrix.astype(np.uint16)
+
+        if activity in NO_SELF_INTERACTION_ACTIVITIES:
             int_mat[activity][diag_indices_from(int_mat[activity])] = 0
 
     return int_mat
@@ -133,22 +362,24 @@ def process_non_reactions(
     heatmaps_interactions_per_acc : dict[str, list[dict[str, Any]]]
         the same as before but we have changed the non interaction ones to self interaction
     """
-    heatmaps_interactions_per_acc = copy.deepcopy(heatmaps_data_per_acc)
+    heatmaps_interactions_per_acc: dict[str, list[dict[str, Any]]] = {}
 
-    for account in heatmaps_interactions_per_acc.keys():
+    for account, documents in heatmaps_data_per_acc.items():
+        heatmaps_interactions_per_acc[account] = []
         # for each heatmaps document
-        for document in heatmaps_interactions_per_acc[account]:
-            activities = document.keys()
-            actions = set(activities) - set(skip_fields)
+        for document in documents:
+            # the skipped fields are not changed, so a shallow copy is enough
+            document = dict(document)
+            actions = set(document.keys()) - set(skip_fields)
 
             for action in actions:
                 action_count = sum(document[action])
                 if action_count:
-                    document[action] = [
-                        [{"account": account, "count": sum(document[action])}]
-                    ]
+                    document[action] = [[{"account": account, "count": action_count}]]
                 else:
                     # action count was zero
                     document[action] = []
 
+            heatmaps_interactions_per_acc[account].append(document)
+
     return heatmaps_interactions_per_acc
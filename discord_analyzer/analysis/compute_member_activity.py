@@ -7,24 +7,35 @@
 
 import logging
 from datetime import datetime, timedelta
+from typing import Iterator
 
-import networkx as nx
 import numpy as np
 from dateutil.relativedelta import relativedelta
+from discord_analyzer.analysis.compute_interaction_matrix_discord import (
+    INTERACTION_ACTIVITIES,
+    InteractionMatrixCache,
+)
 from discord_analyzer.analysis.member_activity_history import check_past_history
+from discord_analyzer.analysis.utils.account_index import AccountIndex
+from discord_analyzer.analysis.utils.compute_interaction_mtx_utils import (
+    prepare_interaction_field_names,
+)
+from discord_analyzer.analysis.utils.heatmaps_store import HeatmapsStore
 from discord_analyzer.analysis.utils.member_activity_history_utils import (
     MemberActivityPastUtils,
 )
 from discord_analyzer.analysis.utils.member_activity_utils import (
     assess_engagement,
+    assess_engagement_thresholds,
     convert_to_dict,
-    get_joined_accounts,
-    get_latest_joined_users,
-    get_users_past_window,
+    get_memberactivities_workers,
+    iter_windows_thresholds,
     store_based_date,
     update_activities,
 )
+from discord_analyzer.analysis.utils.window_graph import WindowGraph
 from discord_analyzer.DB_operations.mongodb_access import DB_access
+from utils.guild_roster import GuildRoster
 
 
 def compute_member_activity(
@@ -36,6 +47,9 @@ def compute_member_activity(
     window_param: dict[str, int],
     act_param: dict[str, int],
     load_past_data=True,
+    workers: int | None = None,
+    past_records: list[dict] | None = None,
+    roster: GuildRoster | None = None,
 ):
     """
     Computes member activity and member interaction network
@@ -88,9 +102,10 @@ def compute_member_activity(
 
     Returns
     ----------
-    network_dict: {datetime:networkx obj} -
-        dictionary with python datetime objects as keys and networkx graph
-        objects as values.
+    network_dict: {datetime:WindowGraph} -
+        dictionary with python datetime objects as keys and WindowGraph
+        objects (the edge arrays of the networks) as values.
+        `WindowGraph.to_networkx` gives the networkx graph of a network.
         The keys reflect the last date of the WINDOW_D day window
         over which the network was computed.
         The values contain the computed networks.
@@ -104,8 +119,21 @@ def compute_member_activity(
     load_past_data : bool
         whether to load past data or not, default is True
         if True, will load the past data, if data was available in given range
+    workers : int | None
+        the number of worker processes to compute the windows thresholds with
+        default is None, meaning to read it from `MEMBERACTIVITIES_WORKERS` env
+        (1 if not set, meaning to assess all windows in the main process)
+    past_records : list[dict] | None
+        the past memberactivities documents if they were already loaded
+        (i.e. from the engagement snapshot), used if `load_past_data` is True
+        default is None, meaning to load them from the db
+    roster : GuildRoster | None
+        the guild members to get the joined accounts from
+        default is None, meaning the members are loaded for the guild
     """
     guild_msg = f"GUILDID: {db_name}:"
+    if workers is None:
+        workers = get_memberactivities_workers()
 
     # make empty results output array
 
@@ -113,12 +141,17 @@ def compute_member_activity(
 
     # set up database access
     db_access = DB_access(db_name, connection_string)
+    if roster is None:
+        roster = GuildRoster(db_access.db_mongo_client, db_name)
 
     # specify the features not to be returned
 
     # initiate result dictionary for network graphs
     network_dict = {}
 
+    # the accounts of the guild interned once for the whole run
+    account_index = AccountIndex()
+
     # initiate result dictionaries for engagement types
     activity_dict: dict[str, dict] = {
         "all_joined": {},
@@ -153,6 +186,7 @@ def compute_member_activity(
             date_range=date_range,
             collection_name="memberactivities",
             window_param=window_param,
+            past_records=past_records,
         )
     else:
         past_activities_data = {}
@@ -186,7 +220,9 @@ def compute_member_activity(
             )
             new_date_range[0] = new_date_range[1] - timedelta(days=interval_before)
 
-        member_activity_utils = MemberActivityPastUtils(db_access=db_access)
+        member_activity_utils = MemberActivityPastUtils(
+            db_access=db_access, roster=roster
+        )
         (
             activity_dict["all_joined"],
             activity_dict["all_joined_day"],
@@ -219,80 +255,83 @@ def compute_member_activity(
         if max_range < 0:
             max_range = 0
         if acc_names != [] and channels != []:
-            for w_i in range(max_range):
-                msg_info = "MEMBERACTIVITY ANALYTICS: PROGRESS"
-                msg = f"{guild_msg} {msg_info} {w_i + 1}/{max_range}"
-                logging.info(msg)
-                new_window_i = w_i + starting_key
-
-                last_date = (
-                    new_date_range[0]
-                    + relativedelta(days=window_param["step_size"] * w_i)
-                    + relativedelta(days=window_param["period_size"] - 1)
-                )
-
-                # make list of all dates in window
-                date_list_w = []
-                for x in range(window_param["period_size"]):
-                    date_list_w.append(last_date - relativedelta(days=x))
-
-                # make empty array for date string values
-                date_list_w_str = np.zeros_like(date_list_w)
-
-                # turn date time values into string
-                for i in range(len(date_list_w_str)):
-                    date_list_w_str[i] = date_list_w[i].strftime("%Y-%m-%d")
-
-                window_start = last_date - relativedelta(
+            # loading the heatmaps data of all the windows at once
+            heatmaps_store = HeatmapsStore(
+                channels=channels,
+                db_access=db_access,
+                field_names=prepare_interaction_field_names(
+                    activities=INTERACTION_ACTIVITIES
+                ),
+                account_index=account_index,
+            )
+            if max_range > 0:
+                # the accounts of each window are from the day before it
+                first_window_start = new_date_range[0] - relativedelta(
                     days=window_param["period_size"]
                 )
-
-                # updating account names for past 7 days
-                acc_names = get_users_past_window(
-                    window_start_date=window_start.strftime("%Y-%m-%d"),
-                    window_end_date=last_date.strftime("%Y-%m-%d"),
-                    collection=db_access.db_mongo_client[db_name]["heatmaps"],
+                last_window_end = new_date_range[0] + relativedelta(
+                    days=window_param["step_size"] * (max_range - 1)
+                    + window_param["period_size"]
+                    - 1
                 )
-
-                if acc_names == []:
-                    time_window_str = f"{window_start.strftime('%Y-%m-%d')} - "
-                    time_window_str += last_date.strftime("%Y-%m-%d")
-                    logging.warning(
-                        f"{guild_msg} No data for the time window {time_window_str}"
-                    )
-                    logging.info(
-                        """Getting latest joined instead!
-                                 So we could compute other activity types!"""
-                    )
-
-                    # will get 5 users just to make sure
-                    # we could have empty outputs
-                    acc_names = get_latest_joined_users(db_access, count=5)
-
-                graph_out, activity_dict = assess_engagement(
-                    w_i=new_window_i,
-                    accounts=acc_names,
+                heatmaps_store.load(
+                    start_date=first_window_start.strftime("%Y-%m-%d"),
+                    end_date=last_window_end.strftime("%Y-%m-%d"),
+                )
+            # the interactions of the days shared between the windows are kept
+            interaction_cache = InteractionMatrixCache(
+                channels=channels, db_access=db_access, store=heatmaps_store
+            )
+            windows = _iter_windows(
+                new_date_range=new_date_range,
+                window_param=window_param,
+                max_range=max_range,
+                starting_key=starting_key,
+                heatmaps_store=heatmaps_store,
+                roster=roster,
+                guild_msg=guild_msg,
+            )
+            if workers > 1:
+                # the thresholds and graphs of the windows are computed in parallel
+                # and then the windows are assessed in order
+                # as each window depends on the previous ones
+                windows_thresholds = iter_windows_thresholds(
+                    windows,
+                    interaction_cache=interaction_cache,
                     action_params=act_param,
-                    period_size=window_param["period_size"],
-                    db_access=db_access,
-                    channels=channels,
-                    analyze_dates=date_list_w_str,
-                    activities_name=activities_name,
-                    activity_dict=activity_dict,
+                    workers=workers,
                 )
-
-                # make empty dict for node attributes
-                node_att = {}
-
-                # store account names in node_att dict
-                for i, node in enumerate(list(graph_out)):
-                    node_att[node] = acc_names[i]
-
-                # assign account names in node_att to node attributes of graph_out
-                nx.set_node_attributes(graph_out, node_att, "acc_name")
-
-                # store results in dictionary
-                network_dict[last_date] = graph_out
+                for window, thresholds in windows_thresholds:
+                    new_window_i, last_date, date_list_w_str, acc_names = window
+                    graph_out, activity_dict = assess_engagement_thresholds(
+                        thresholds,
+                        w_i=new_window_i,
+                        accounts=acc_names,
+                        action_params=act_param,
+                        period_size=window_param["period_size"],
+                        activities_name=activities_name,
+                        activity_dict=activity_dict,
+                    )
+                    # store results in dictionary
+                    network_dict[last_date] = graph_out
+            else:
+                for new_window_i, last_date, date_list_w_str, acc_names in windows:
+                    graph_out, activity_dict = assess_engagement(
+                        w_i=new_window_i,
+                        accounts=acc_names,
+                        action_params=act_param,
+                        period_size=window_param["period_size"],
+                        db_access=db_access,
+                        channels=channels,
+                        analyze_dates=date_list_w_str,
+                        activities_name=activities_name,
+                        activity_dict=activity_dict,
+                        interaction_cache=interaction_cache,
+                    )
+                    # store results in dictionary
+                    network_dict[last_date] = WindowGraph.from_networkx(
+                        graph_out, acc_names
+                    )
     # else if there was no past data
     else:
         max_range = 0
@@ -301,8 +340,8 @@ def compute_member_activity(
     end_dt = datetime.strptime(date_range[1], "%y/%m/%d")
 
     # get the accounts with their joining date
-    joined_acc_dict = get_joined_accounts(
-        db_access=db_access, date_range=(start_dt, end_dt + timedelta(days=1))
+    joined_acc_dict = roster.get_joined_accounts(
+        date_range=(start_dt, end_dt + timedelta(days=1))
     )
 
     activity_dict_per_date = store_based_date(
@@ -311,7 +350,77 @@ def compute_member_activity(
         analytics_day_range=window_param["period_size"] - 1,
         joined_acc_dict=joined_acc_dict,
         load_past=load_past_data,
+        account_index=account_index,
         empty_channel_acc=(len(channels) != 0 and len(acc_names) != 0),
     )
 
     return [network_dict, activity_dict_per_date]
+
+
+def _iter_windows(
+    new_date_range: list[datetime],
+    window_param: dict[str, int],
+    max_range: int,
+    starting_key: int,
+    heatmaps_store: HeatmapsStore,
+    roster: GuildRoster,
+    guild_msg: str,
+) -> Iterator[tuple[int, datetime, np.ndarray, list[str]]]:
+    """
+    generate the windows to assess the member activities for
+
+    Returns
+    ----------
+    windows : Iterator[tuple[int, datetime, np.ndarray, list[str]]]
+        the window index, the last date of the window,
+        the dates of the window (as `%Y-%m-%d` strings),
+        and the account names to analyze in the window
+    """
+    for w_i in range(max_range):
+        msg_info = "MEMBERACTIVITY ANALYTICS: PROGRESS"
+        msg = f"{guild_msg} {msg_info} {w_i + 1}/{max_range}"
+        logging.info(msg)
+        new_window_i = w_i + starting_key
+
+        last_date = (
+            new_date_range[0]
+            + relativedelta(days=window_param["step_size"] * w_i)
+            + relativedelta(days=window_param["period_size"] - 1)
+        )
+
+        # make list of all dates in window
+        date_list_w = []
+        for x in range(window_param["period_size"]):
+            date_list_w.append(last_date - relativedelta(days=x))
+
+        # make empty array for date string values
+        date_list_w_str = np.zeros_like(date_list_w)
+
+        # turn date time values into string
+        for i in range(len(date_list_w_str)):
+            date_list_w_str[i] = date_list_w[i].strftime("%Y-%m-%d")
+
+        window_start = last_date - relativedelta(days=window_param["period_size"])
+
+        # updating account names for past 7 days
+        acc_names = heatmaps_store.get_accounts(
+            start_date=window_start.strftime("%Y-%m-%d"),
+            end_date=last_date.strftime("%Y-%m-%d"),
+        )
+
+        if acc_names == []:
+            time_window_str = f"{window_start.strftime('%Y-%m-%d')} - "
+            time_window_str += last_date.strftime("%Y-%m-%d")
+            logging.warning(
+                f"{guild_msg} No data for the time window {time_window_str}"
+            )
+            logging.info(
+                """Getting latest joined instead!
+                         So we could compute other activity types!"""
+            )
+
+            # will get 5 users just to make sure
+            # we could have empty outputs
+            acc_names = roster.get_latest_joined_users(count=5)
+
+        yield new_window_i, last_date, date_list_w_str, acc_names
@@ -17,6 +17,7 @@ def check_past_history(
     window_param: dict[str, int],
     collection_name: str = "memberactivities",
     verbose=False,
+    past_records: list[dict] | None = None,
 ):
     """
     check past member_activities history and
@@ -39,6 +40,10 @@ def check_past_history(
         default is `memberactivities`
     verbose : bool
         whether to print the logs or not
+    past_records : list[dict] | None
+        the already loaded past documents of the collection,
+        i.e. from the engagement snapshot, to use instead of querying the db
+        default is None, meaning to query the db
 
     Returns:
     ----------
@@ -80,12 +85,23 @@ def check_past_history(
     # sorting by `date`
     sorting = ["date", 1]
 
-    # quering the db now
-    cursor = db_access.query_db_find(
-        collection_name, query, feature_projection, sorting
-    )
-    # getting a list of returned data
-    past_data_new_schema = list(cursor)
+    if past_records is None:
+        # quering the db now
+        cursor = db_access.query_db_find(
+            collection_name, query, feature_projection, sorting
+        )
+        # getting a list of returned data
+        past_data_new_schema = list(cursor)
+    else:
+        # the same filtering and sorting as the query
+        past_data_new_schema = sorted(
+            (
+                record
+                for record in past_records
+                if query["date"]["$gte"] <= record["date"] <= query["date"]["$lte"]
+            ),
+            key=lambda record: record["date"],
+        )
 
     # if any past data was available in DB
     if past_data_new_schema != []:
@@ -1,9 +1,11 @@
 # analyzer whether a node is sender or receiver
 import logging
-from uuid import uuid1
 
 import pandas as pd
-from discord_analyzer.analysis.neo4j_utils.projection_utils import ProjectionUtils
+from discord_analyzer.analysis.neo4j_utils.projection_utils import (
+    GuildProjection,
+    ProjectionUtils,
+)
 from tc_neo4j_lib.neo4j_ops import Neo4jOps
 
 
@@ -32,7 +34,25 @@ class NodeStats:
         self.driver = neo4j_ops.neo4j_driver
         self.threshold = threshold
 
-    def compute_stats(self, guildId: str, from_start: bool) -> None:
+    def compute_stats(
+        self,
+        guildId: str,
+        from_start: bool,
+        projection: GuildProjection | None = None,
+    ) -> None:
+        """
+        compute the node stats of the guild members per date
+
+        Parameters:
+        ------------
+        guildId : str
+            the guild to compute the stats for
+        from_start : bool
+            whether to compute the stats from the first day or not
+        projection : GuildProjection | None
+            the `NATURAL` guild projection shared with other computations
+            default is None, meaning to project the guild graph here
+        """
         projection_utils = ProjectionUtils(guildId=guildId)
 
         # possible dates to do the computations
@@ -43,9 +63,19 @@ class NodeStats:
             computed_dates = self.get_computed_dates(projection_utils, guildId)
             possible_dates = possible_dates - computed_dates
 
-        for date in possible_dates:
+        if projection is None:
+            with GuildProjection(projection_utils, guildId) as guild_projection:
+                self._compute_dates(guild_projection, guildId, possible_dates)
+        else:
+            self._compute_dates(projection, guildId, possible_dates)
+
+    def _compute_dates(
+        self, projection: GuildProjection, guildId: str, dates: set[float]
+    ) -> None:
+        projection.include_dates(dates)
+        for date in dates:
             try:
-                self.compute_node_stats_wrapper(projection_utils, guildId, date)
+                self.compute_node_stats_wrapper(projection, guildId, date)
             except Exception as exp:
                 msg = f"GUILDID: {guildId} "
                 logging.error(
@@ -53,17 +83,17 @@ class NodeStats:
                 )
 
     def compute_node_stats_wrapper(
-        self, projection_utils: ProjectionUtils, guildId: str, date: float
+        self, projection: GuildProjection, guildId: str, date: float
     ):
         """
         a wrapper for node stats computation process
-        we're doing the projection here and computing on that,
-        then we'll drop the pojection
+        we're filtering the date graph from the guild projection here
+        and computing on that, then the filtered graph would be dropped
 
         Parameters:
         ------------
-        projection_utils : ProjectionUtils
-            the utils needed to get the work done
+        projection : GuildProjection
+            the `NATURAL` projection of the guild graph
         guildId : str
             the guild we want the temp relationships
             between its members
@@ -71,15 +101,18 @@ class NodeStats:
             timestamp of the relation
         """
         # NATURAL relations direction degreeCentrality computations
-        graph_name = f"GraphStats_{uuid1()}"
-
-        projection_utils.project_temp_graph(
-            guildId=guildId,
-            graph_name=graph_name,
-            weighted=True,
-            relation_direction="NATURAL",
-            date=date,
-        )
+        with projection.date_graph(date) as graph_name:
+            natural_dc, reverse_dc = self._compute_degrees(graph_name)
+
+        # the members without any interaction on the date are dropped here
+        df = self.get_date_stats(natural_dc, reverse_dc, threshold=self.threshold)
+
+        self.save_properties_db(guildId, df, date)
+
+    def _compute_degrees(self, graph_name: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        the weighted out and in degrees of the graph nodes
+        """
         natural_dc = self.gds.run_cypher(
             """
             CALL gds.degree.stream(
@@ -113,15 +146,7 @@ class NodeStats:
             },
         )
 
-        df = self.get_date_stats(natural_dc, reverse_dc, threshold=self.threshold)
-
-        self.save_properties_db(guildId, df, date)
-        _ = self.gds.run_cypher(
-            "CALL gds.graph.drop($graph_name)",
-            {
-                "graph_name": graph_name,
-            },
-        )
+        return natural_dc, reverse_dc
 
     def get_computed_dates(
         self, projection_utils: ProjectionUtils, guildId: str
@@ -93,20 +93,7 @@ class Centerality:
         elif direction == "undirected":
             query = f"MATCH (a:{node})-[r:INTERACTED_WITH]-(b:{node})"
 
-        results = self.neo4j_ops.gds.run_cypher(
-            f"""
-                {query}
-                WHERE r.guildId = $guild_id
-                RETURN
-                    a.userId as a_userId,
-                    r.date as date,
-                    r.weight as weight,
-                    b.userId as b_userId
-            """,
-            params={"guild_id": guildId},
-        )
-
-        dates_to_compute = set(results["date"].value_counts().index)
+        dates_to_compute = self._get_interaction_dates(node, guildId)
         if not from_start:
             projection_utils = ProjectionUtils(guildId=guildId)
 
@@ -116,16 +103,76 @@ class Centerality:
             if recompute_dates is not None:
                 dates_to_compute = dates_to_compute.union(recompute_dates)
 
+        if not dates_to_compute:
+            return {}
+
+        # the weight each pair of users adds to the degree
+        # (just one of the parallel relations if not `preserve_parallel`)
+        weight = "r.weight" if weighted else "1"
+        pair_weight = (
+            f"sum({weight})" if preserve_parallel else f"head(collect({weight}))"
+        )
+
+        # the degrees are summed up per date and user in the database
+        # and just for the dates to compute
+        results = self.neo4j_ops.gds.run_cypher(
+            f"""
+                {query}
+                WHERE r.guildId = $guild_id AND r.date IN $dates
+                WITH
+                    a.userId as a_userId,
+                    r.date as date,
+                    b.userId as b_userId,
+                    {pair_weight} as pair_weight
+                RETURN
+                    a_userId,
+                    date,
+                    sum(pair_weight) as weight
+            """,
+            params={"guild_id": guildId, "dates": list(dates_to_compute)},
+        )
+        if results.empty:
+            results = pd.DataFrame(columns=["a_userId", "date", "weight"])
+
+        # the results are already the degree per date and user
         degree_centerality = self.count_degrees(
             computation_date=dates_to_compute,
             results=results,
-            weighted=weighted,
+            weighted=True,
             normalize=normalize,
-            preserve_parallel=preserve_parallel,
+            preserve_parallel=True,
         )
 
         return degree_centerality
 
+    def _get_interaction_dates(self, node: str, guildId: str) -> set[float]:
+        """
+        get the dates of the INTERACTED_WITH relations between the guild users
+
+        Parameters:
+        -------------
+        node : str
+            the name of the user nodes
+        guildId : str
+            the guildId to get the relations dates
+
+        Returns:
+        ----------
+        dates : set[float]
+            the dates of the relations
+        """
+        dates = self.neo4j_ops.gds.run_cypher(
+            f"""
+                MATCH (:{node})-[r:INTERACTED_WITH]->(:{node})
+                WHERE r.guildId = $guild_id
+                RETURN DISTINCT r.date as dates
+            """,
+            params={"guild_id": guildId},
+        )
+        interaction_dates = set(dates["dates"].tolist()) if not dates.empty else set()
+
+        return interaction_dates
+
     def _get_dates_to_compute(
         self,
         projection_utils: ProjectionUtils,
@@ -188,52 +235,37 @@ class Centerality:
         degree_centrality : dict[float, dict[str, float]]
             the results per date degrees of each user
         """
-        per_date_acc_weights: dict[float, dict[str, float]] = {}
-
-        userIds = set(results["a_userId"].value_counts().index).union(
-            results["b_userId"].value_counts().index
-        )
-
+        per_date_acc_weights: dict[float, dict[str, float]] = {
+            date: {} for date in computation_date
+        }
         # a variable for normalizing
         # saving max value of each date
-        date_max_values: dict[float, float] = {}
-
-        for date in computation_date:
-            per_date_acc_weights[date] = {}
-            date_max_values[date] = 0
-            # find the results for a specific date
-            results_per_date = results[results["date"] == date]
-            for user in userIds:
-                relation_users = []
-                results_per_date_user = results_per_date[
-                    results_per_date["a_userId"] == user
-                ]
-                for _, row in results_per_date_user.iterrows():
-                    a_userId = row["a_userId"]
-                    b_userId = row["b_userId"]
-
-                    relation = set([a_userId, b_userId])
-
-                    # if we've counted the relation before
-                    # and preserver_parallel is False
-                    if relation in relation_users and not preserve_parallel:
-                        continue
-
-                    if a_userId in per_date_acc_weights[date]:
-                        per_date_acc_weights[date][a_userId] += (
-                            row["weight"] if weighted else 1
-                        )
-                    else:
-                        per_date_acc_weights[date][a_userId] = (
-                            row["weight"] if weighted else 1
-                        )
-
-                    # saving it not to repeat if preserve_parallel is False
-                    relation_users.append(relation)
-
-                    # updating the max value
-                    if date_max_values[date] < per_date_acc_weights[date][a_userId]:
-                        date_max_values[date] = per_date_acc_weights[date][a_userId]
+        date_max_values: dict[float, float] = {date: 0 for date in computation_date}
+
+        # find the results for the computation dates
+        results_per_date = results[results["date"].isin(list(computation_date))]
+        if not preserve_parallel:
+            # each relation of a user is counted once per date
+            # (the first one is kept)
+            results_per_date = results_per_date.drop_duplicates(
+                subset=["date", "a_userId", "b_userId"]
+            )
+
+        if weighted:
+            values = results_per_date["weight"]
+        else:
+            values = pd.Series(1, index=results_per_date.index)
+
+        degrees = values.groupby(
+            [results_per_date["date"], results_per_date["a_userId"]], sort=False
+        ).sum()
+
+        for (date, a_userId), degree in zip(degrees.index.tolist(), degrees.tolist()):
+            per_date_acc_weights[date][a_userId] = degree
+
+            # updating the max value
+            if date_max_values[date] < degree:
+                date_max_values[date] = degree
 
         degree_centrality = per_date_acc_weights
         if normalize:
@@ -1,7 +1,9 @@
 import logging
-from uuid import uuid1
 
-from discord_analyzer.analysis.neo4j_utils.projection_utils import ProjectionUtils
+from discord_analyzer.analysis.neo4j_utils.projection_utils import (
+    GuildProjection,
+    ProjectionUtils,
+)
 from tc_neo4j_lib import Neo4jOps
 
 
@@ -9,7 +11,12 @@ class LocalClusteringCoeff:
     def __init__(self) -> None:
         self.gds = Neo4jOps.get_instance().gds
 
-    def compute(self, guildId: str, from_start: bool = False) -> None:
+    def compute(
+        self,
+        guildId: str,
+        from_start: bool = False,
+        projection: GuildProjection | None = None,
+    ) -> None:
         """
         computing the localClusteringCoefficient
         per date of each interaction and saving them in nodes
@@ -23,6 +30,9 @@ class LocalClusteringCoeff:
             whether to compute the metric from the first day or not
             if True, then would compute from start
             default is False
+        projection : GuildProjection | None
+            the `UNDIRECTED` guild projection shared with other computations
+            default is None, meaning to project the guild graph here
 
         Returns:
         ---------
@@ -42,11 +52,23 @@ class LocalClusteringCoeff:
         else:
             to_compute = computable_dates - computed_dates
 
+        if projection is None:
+            with GuildProjection(
+                projection_utils, guildId, relation_direction="UNDIRECTED"
+            ) as guild_projection:
+                self._compute_dates(guild_projection, guildId, to_compute)
+        else:
+            self._compute_dates(projection, guildId, to_compute)
+
+    def _compute_dates(
+        self, projection: GuildProjection, guildId: str, dates: set[float]
+    ) -> None:
+        projection.include_dates(dates)
         # for the computation date
-        for date in to_compute:
+        for date in dates:
             try:
                 self.local_clustering_computation_wrapper(
-                    projection_utils=projection_utils, guildId=guildId, date=date
+                    projection=projection, guildId=guildId, date=date
                 )
             except Exception as exp:
                 msg = f"GUILDID: {guildId} "
@@ -55,45 +77,25 @@ class LocalClusteringCoeff:
                 )
 
     def local_clustering_computation_wrapper(
-        self, projection_utils: ProjectionUtils, guildId: str, date: float
+        self, projection: GuildProjection, guildId: str, date: float
     ) -> None:
         """
         a wrapper for local clustering coefficient computation process
-        we're doing the projection here and computing on that,
-        then we'll drop the pojection
+        we're filtering the date graph from the guild projection here
+        and computing on that, then the filtered graph would be dropped
 
         Parameters:
         ------------
-        projection_utils : ProjectionUtils
-            the utils needed to get the work done
+        projection : GuildProjection
+            the `UNDIRECTED` projection of the guild graph
         guildId : str
             the guild we want the temp relationships
             between its members
         date : float
             timestamp of the relation
         """
-        graph_projected_name = f"GraphLocalClustering_{uuid1()}"
-        projection_utils.project_temp_graph(
-            guildId=guildId,
-            graph_name=graph_projected_name,
-            weighted=True,
-            date=date,
-        )
-
-        # get the results as pandas dataframe
-        self.compute_graph_lcc(
-            date=date, graph_name=graph_projected_name, guildId=guildId
-        )
-
-        # dropping the computed date
-        _ = self.gds.run_cypher(
-            """
-            CALL gds.graph.drop($graph_projected_name)
-            """,
-            {
-                "graph_projected_name": graph_projected_name,
-            },
-        )
+        with projection.date_graph(date) as graph_name:
+            self.compute_graph_lcc(date=date, graph_name=graph_name, guildId=guildId)
 
     def get_computed_dates(
         self, projection_utils: ProjectionUtils, guildId: str
@@ -149,6 +151,14 @@ class LocalClusteringCoeff:
                     WITH
                         gds.util.asNode(nodeId) as userNode,
                         localClusteringCoefficient
+                    // the members without any interaction on the date
+                    // are isolated nodes of the date graph
+                    WHERE EXISTS {
+                        (userNode) -[:INTERACTED_WITH {
+                            guildId: $guild_id,
+                            date: $date
+                        }]- (:DiscordAccount)
+                    }
                     MATCH (g:Guild {guildId: $guild_id})
                     MERGE (userNode) -[r:INTERACTED_IN  {date: $date}]-> (g)
                     SET r.localClusteringCoefficient = localClusteringCoefficient
@@ -1,7 +1,9 @@
 import logging
-from uuid import uuid1
 
-from discord_analyzer.analysis.neo4j_utils.projection_utils import ProjectionUtils
+from discord_analyzer.analysis.neo4j_utils.projection_utils import (
+    GuildProjection,
+    ProjectionUtils,
+)
 from tc_neo4j_lib.neo4j_ops import Neo4jOps
 
 
@@ -12,7 +14,12 @@ class Louvain:
         """
         self.neo4j_ops = Neo4jOps.get_instance()
 
-    def compute(self, guild_id: str, from_start: bool = False) -> None:
+    def compute(
+        self,
+        guild_id: str,
+        from_start: bool = False,
+        projection: GuildProjection | None = None,
+    ) -> None:
         """
         compute the louvain modularity score for a guild
 
@@ -24,6 +31,9 @@ class Louvain:
             whether to compute the metric from the first day or not
             if True, then would compute from start
             default is False
+        projection : GuildProjection | None
+            the `NATURAL` guild projection shared with other computations
+            default is None, meaning to project the guild graph here
         """
         projection_utils = ProjectionUtils(guildId=guild_id)
 
@@ -37,9 +47,19 @@ class Louvain:
             computed_dates = self.get_computed_dates(projection_utils, guild_id)
             to_compute = computable_dates - computed_dates
 
-        for date in to_compute:
+        if projection is None:
+            with GuildProjection(projection_utils, guild_id) as guild_projection:
+                self._compute_dates(guild_projection, guild_id, to_compute)
+        else:
+            self._compute_dates(projection, guild_id, to_compute)
+
+    def _compute_dates(
+        self, projection: GuildProjection, guild_id: str, dates: set[float]
+    ) -> None:
+        projection.include_dates(dates)
+        for date in dates:
             try:
-                self.louvain_computation_wrapper(projection_utils, guild_id, date)
+                self.louvain_computation_wrapper(projection, guild_id, date)
             except Exception as exp:
                 msg = f"GUILDID: {guild_id} "
                 logging.error(
@@ -47,46 +67,27 @@ class Louvain:
                 )
 
     def louvain_computation_wrapper(
-        self, projection_utils: ProjectionUtils, guild_id: str, date: float
+        self, projection: GuildProjection, guild_id: str, date: float
     ) -> None:
         """
         a wrapper for louvain modularity computation process
-        we're doing the projection here and computing on that,
-        then we'll drop the pojection
+        we're filtering the date graph from the guild projection here
+        and computing on that, then the filtered graph would be dropped
 
         Parameters:
         ------------
-        projection_utils : ProjectionUtils
-            the utils needed to get the work done
+        projection : GuildProjection
+            the `NATURAL` projection of the guild graph
         guild_id : str
             the guild we want the temp relationships
             between its members
         date : float
             timestamp of the relation
         """
-        graph_projected_name = f"GraphLouvain_{uuid1()}"
-        projection_utils.project_temp_graph(
-            guildId=guild_id,
-            graph_name=graph_projected_name,
-            weighted=True,
-            date=date,
-            relation_direction="NATURAL",
-        )
-
-        # get the results as pandas dataframe
-        self.compute_graph_louvain(
-            date=date, graph_name=graph_projected_name, guild_id=guild_id
-        )
-
-        # dropping the computed date
-        _ = self.neo4j_ops.gds.run_cypher(
-            """
-            CALL gds.graph.drop($graph_projected_name)
-            """,
-            {
-                "graph_projected_name": graph_projected_name,
-            },
-        )
+        with projection.date_graph(date) as graph_name:
+            self.compute_graph_louvain(
+                date=date, graph_name=graph_name, guild_id=guild_id
+            )
 
     def get_computed_dates(
         self, projection_utils: ProjectionUtils, guildId: str
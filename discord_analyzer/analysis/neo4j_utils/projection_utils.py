@@ -1,4 +1,7 @@
 import logging
+from contextlib import contextmanager
+from typing import Iterator
+from uuid import uuid1
 
 from tc_neo4j_lib.neo4j_ops import Neo4jOps
 
@@ -39,6 +42,9 @@ class ProjectionUtils:
                 (b:DiscordAccount)`
             date : float
                 if we want to include date in the graph projection query
+            dates : list[float]
+                if we want to include just the relations of some dates
+                in the graph projection query
         """
         # getting kwargs
         weighted = False
@@ -50,7 +56,14 @@ class ProjectionUtils:
             relation_direction = kwargs["relation_direction"]
 
         projection_query: str
-        if "date" in kwargs:
+        params = {}
+        if "dates" in kwargs:
+            params["dates"] = list(kwargs["dates"])
+            projection_query = f"""MATCH (a:DiscordAccount)
+                   -[r:INTERACTED_WITH {{guildId: '{guildId}'}}]->
+                   (b:DiscordAccount)
+                   WHERE r.date IN $dates  """
+        elif "date" in kwargs:
             date = kwargs["date"]
             projection_query = f"""MATCH (a:DiscordAccount)
                    -[r:INTERACTED_WITH {{guildId: '{guildId}', date: {date}}}]->
@@ -99,7 +112,8 @@ class ProjectionUtils:
             ) AS g
             RETURN
             g.graphName AS graph, g.nodeCount AS nodes, g.relationshipCount AS rels
-            """
+            """,
+            params,
         )
 
     def get_dates(self, guildId: str) -> set[float]:
@@ -140,3 +154,161 @@ class ProjectionUtils:
         computed_dates = set(dates["computed_dates"].values)
 
         return computed_dates
+
+
+class GuildProjection:
+    def __init__(
+        self,
+        projection_utils: ProjectionUtils,
+        guildId: str,
+        relation_direction: str = "NATURAL",
+    ) -> None:
+        """
+        a projection of the guild INTERACTED_WITH relations of the dates to
+        compute (weighted and having the date of relations) shared between the
+        computations of the dates
+        the graph of each date is filtered from it, so the relations
+        are projected once instead of once per date and algorithm
+
+        should be used as a context manager so the projections would be
+        dropped even if a computation fails, i.e.
+        ```
+        with GuildProjection(projection_utils, guildId) as projection:
+            projection.include_dates(dates)
+            for date in dates:
+                with projection.date_graph(date) as graph_name:
+                    ...
+        ```
+
+        Parameters:
+        ------------
+        projection_utils : ProjectionUtils
+            the utils to project the guild graph with
+        guildId : str
+            the guild to project its members relations
+        relation_direction : str
+            either `NATURAL`, `REVERSE`, `UNDIRECTED`
+            default is `NATURAL`
+        """
+        self.projection_utils = projection_utils
+        self.gds = projection_utils.gds
+        self.guildId = guildId
+        self.relation_direction = relation_direction
+        # the guild graph is projected once the first date graph is asked for
+        self.graph_name: str | None = None
+        # the dates to project, and the dates of the projected graph
+        self.dates: set[float] = set()
+        self.projected_dates: set[float] = set()
+
+    def __enter__(self) -> "GuildProjection":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.drop()
+
+    def include_dates(self, dates: set[float]) -> None:
+        """
+        add the dates to compute to the projection
+        all the dates should be included before their first date graph,
+        otherwise the guild graph is projected again including them
+
+        Parameters:
+        ------------
+        dates : set[float]
+            the timestamp of the relations to project
+        """
+        self.dates.update(dates)
+
+    def project(self) -> str:
+        """
+        project the relations of the included dates
+        if the graph of them is not projected yet
+
+        Returns:
+        ---------
+        graph_name : str
+            the name of the projected guild graph
+        """
+        if self.graph_name is not None and self.dates <= self.projected_dates:
+            return self.graph_name
+
+        # the dates included after projecting are projected again with the others
+        self.drop()
+        graph_name = f"GraphGuild_{uuid1()}"
+        self.projection_utils.project_temp_graph(
+            guildId=self.guildId,
+            graph_name=graph_name,
+            weighted=True,
+            relation_direction=self.relation_direction,
+            dates=sorted(self.dates),
+        )
+        self.graph_name = graph_name
+        self.projected_dates = set(self.dates)
+
+        return self.graph_name
+
+    @contextmanager
+    def date_graph(self, date: float) -> Iterator[str]:
+        """
+        filter the relations of a date from the guild graph
+        and drop the filtered graph after use
+
+        Note: all the members having a relation on the included dates are the
+        nodes of the filtered graph, the ones without any relation on the date
+        are left isolated
+
+        Parameters:
+        ------------
+        date : float
+            timestamp of the relations
+
+        Returns:
+        ---------
+        graph_name : str
+            the name of the filtered graph
+        """
+        self.include_dates({date})
+        guild_graph = self.project()
+        graph_name = f"GraphDate_{uuid1()}"
+        self.gds.run_cypher(
+            """
+            CALL gds.graph.filter(
+                $graph_name,
+                $guild_graph,
+                '*',
+                'r.date = $date',
+                { parameters: { date: $date } }
+            )
+            YIELD graphName
+            RETURN graphName
+            """,
+            {
+                "graph_name": graph_name,
+                "guild_graph": guild_graph,
+                "date": date,
+            },
+        )
+        try:
+            yield graph_name
+        finally:
+            self._drop_graph(graph_name)
+
+    def drop(self) -> None:
+        """
+        drop the guild graph if it was projected
+        """
+        if self.graph_name is not None:
+            self._drop_graph(self.graph_name)
+            self.graph_name = None
+
+    def _drop_graph(self, graph_name: str) -> None:
+        try:
+            self.gds.run_cypher(
+                "CALL gds.graph.drop($graph_name, false)",
+                {"graph_name": graph_name},
+            )
+        except Exception as exp:
+            logging.error(
+                f"GUILDID: {self.guildId}: Couldn't drop the projected graph "
+                f"{graph_name}, exp: {exp}"
+            )
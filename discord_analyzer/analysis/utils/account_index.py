@@ -0,0 +1,82 @@
+from typing import Iterable
+
+import numpy as np
+
+
+class AccountIndex:
+    def __init__(self, accounts: Iterable[str] = ()) -> None:
+        """
+        a guild-scoped index interning the account ids (discord ids)
+        into dense integer ids, so the accounts of a run can be kept
+        in integer arrays and converted back to strings just when storing them
+
+        Parameters:
+        ------------
+        accounts : Iterable[str]
+            the accounts to intern at first
+            default is no accounts
+        """
+        self.names: list[str] = []
+        self.ids: dict[str, int] = {}
+
+        for account in accounts:
+            self.intern(account)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, account: str) -> bool:
+        return account in self.ids
+
+    def intern(self, account: str) -> int:
+        """
+        get the id of an account, the account is added if it wasn't in the index
+        """
+        account_id = self.ids.get(account)
+        if account_id is None:
+            account_id = len(self.names)
+            self.ids[account] = account_id
+            self.names.append(account)
+        return account_id
+
+    def get_ids(self, accounts: Iterable[str]) -> np.ndarray:
+        """
+        get the ids of the accounts (in order), adding the new accounts to index
+
+        Parameters:
+        ------------
+        accounts : Iterable[str]
+            the accounts to get their ids
+
+        Returns:
+        ---------
+        account_ids : np.ndarray
+            the int32 ids of the accounts
+        """
+        return np.fromiter(map(self.intern, accounts), dtype=np.int32)
+
+    def get_names(self, account_ids: Iterable[int]) -> list[str]:
+        """
+        get the account names of the ids
+        """
+        return [self.names[account_id] for account_id in account_ids]
+
+    def get_id_set(self, accounts: Iterable[str]) -> np.ndarray:
+        """
+        get the accounts as an id set, a sorted array of their unique ids
+        """
+        return np.unique(self.get_ids(accounts))
+
+    def get_lookup(self, acc_names: list[str]) -> np.ndarray:
+        """
+        get an array mapping each account id of the index
+        to the first index of the account in `acc_names`
+        the accounts not in `acc_names` are mapped to -1
+        """
+        lookup = np.full(len(self.names), -1, dtype=np.int64)
+        for idx in range(len(acc_names) - 1, -1, -1):
+            account_id = self.ids.get(acc_names[idx])
+            if account_id is not None:
+                lookup[account_id] = idx
+
+        return lookup
@@ -2,9 +2,6 @@ import logging
 from typing import Any
 
 import numpy as np
-from discord_analyzer.analysis.analytics_interactions_script import (
-    per_account_interactions,
-)
 from tc_core_analyzer_lib.utils.activity import DiscordActivity
 
 
@@ -62,34 +59,184 @@ def generate_interaction_matrix(
         an array of integer values
         each row and column are representative of account interactions
     """
-    int_matrix = np.zeros((len(acc_names), len(acc_names)), dtype=np.uint16)
-
-    for acc in per_acc_interactions.keys():
-        db_res_per_acc = per_acc_interactions[acc]
-
-        dict_keys = prepare_interaction_field_names(activities=activities)
-        # get results from db
-        db_results = per_account_interactions(
-            cursor_list=db_res_per_acc,
-            dict_keys=dict_keys,
-        )
-
-        # obtain results for all interactions summed together
-        acc_out_int = db_results["all_interaction_accounts"]
-
-        # for each interacting account
-        for int_acc in acc_out_int.values():
-            # if the interacting account is in acc_names
-            if int_acc["account"] in acc_names:
-                # store data in int_network
-                int_matrix[
-                    np.where(np.array(acc_names) == acc)[0][0],
-                    np.where(np.array(acc_names) == int_acc["account"])[0][0],
-                ] = int_acc["count"]
+    dict_keys = prepare_interaction_field_names(activities=activities)
 
+    interactions = []
+    for acc, db_res_per_acc in per_acc_interactions.items():
+        for document in db_res_per_acc:
+            for key in dict_keys:
+                for interaction in document[key]:
+                    interactions.append(
+                        (acc, interaction[0]["account"], interaction[0]["count"])
+                    )
+
+    int_matrix = fill_interaction_matrix(
+        interactions=interactions,
+        acc_index=get_account_index(acc_names),
+        size=len(acc_names),
+    )
     return int_matrix
 
 
+def get_account_index(acc_names: list[str]) -> dict[str, int]:
+    """
+    map the account names to their index in the interaction matrix
+
+    Parameters:
+    ------------
+    acc_names : list[str]
+        list of all account names to be considered for analysis
+
+    Returns:
+    ---------
+    acc_index : dict[str, int]
+        keys are the account names and values are their first index in `acc_names`
+    """
+    acc_index: dict[str, int] = {}
+    for idx, acc in enumerate(acc_names):
+        acc_index.setdefault(acc, idx)
+
+    return acc_index
+
+
+def fill_interaction_matrix(
+    interactions: list[tuple[str, str, int]],
+    acc_index: dict[str, int],
+    size: int | None = None,
+) -> np.ndarray:
+    """
+    sum the interactions into an interaction matrix
+    the interactions of the accounts not in `acc_index` are skipped
+
+    Parameters:
+    ------------
+    interactions : list[tuple[str, str, int]]
+        the interactions as (account, interacted account, count) tuples
+        an account and interacted account pair could be repeated
+    acc_index : dict[str, int]
+        the index of each account in the matrix, see `get_account_index`
+    size : int | None
+        the count of the rows (and columns) of the matrix
+        default is None, meaning the count of the accounts in `acc_index`
+
+    Returns:
+    ---------
+    int_matrix : np.ndarray
+        an array of integer values
+        each row and column are representative of account interactions
+    """
+    if size is None:
+        size = len(acc_index)
+
+    rows = []
+    columns = []
+    counts = []
+    for acc, interacted_acc, count in interactions:
+        if acc in acc_index and interacted_acc in acc_index:
+            rows.append(acc_index[acc])
+            columns.append(acc_index[interacted_acc])
+            counts.append(count)
+
+    # summing with a wide type and storing with the type of the results
+    int_matrix = np.zeros((size, size), dtype=np.int64)
+    np.add.at(
+        int_matrix,
+        (np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)),
+        np.array(counts, dtype=np.int64),
+    )
+
+    return int_matrix.astype(np.uint16)
+
+
+def prepare_interactions_pipeline(
+    query: dict[str, Any], field_names: list[str], per_date: bool = False
+) -> list[dict[str, Any]]:
+    """
+    prepare the aggregation pipeline summing the interactions
+    of the heatmaps documents matching the query
+
+    the `*_per_acc` fields are summed per account and interacted account,
+    and the other fields (i.e. `thr_messages` and `lone_messages`)
+    are summed per account as self interactions
+
+    Parameters:
+    ------------
+    query : dict[str, Any]
+        the query to filter the heatmaps documents
+    field_names : list[str]
+        the heatmaps fields to sum, see `prepare_interaction_field_names`
+    per_date : bool
+        sum the interactions of each date separately
+        if True, the `_id` of the results would have the `date` too
+        default is False
+
+    Returns:
+    ---------
+    pipeline : list[dict[str, Any]]
+        the pipeline, each result of it is like
+        `{"_id": {"field": str, "account": str, "interacted": str}, "count": int}`
+    """
+    interactions = []
+    for field in field_names:
+        if field.endswith("_per_acc"):
+            interactions.append(
+                {
+                    "$map": {
+                        "input": {"$ifNull": [f"${field}", []]},
+                        "as": "item",
+                        "in": {
+                            "field": field,
+                            "interacted": {"$arrayElemAt": ["$$item.account", 0]},
+                            "count": {"$arrayElemAt": ["$$item.count", 0]},
+                        },
+                    }
+                }
+            )
+        else:
+            # a single self interaction with the count of all hours
+            interactions.append(
+                {
+                    "$map": {
+                        "input": [f"${field}"],
+                        "as": "hourly_counts",
+                        "in": {
+                            "field": field,
+                            "interacted": "$account_name",
+                            "count": {"$sum": "$$hourly_counts"},
+                        },
+                    }
+                }
+            )
+
+    group_id = {
+        "field": "$interactions.field",
+        "account": "$account_name",
+        "interacted": "$interactions.interacted",
+    }
+    if per_date:
+        group_id["date"] = "$date"
+
+    pipeline = [
+        {"$match": query},
+        {
+            "$project": {
+                "_id": 0,
+                "account_name": 1,
+                "date": 1,
+                "interactions": {"$concatArrays": interactions},
+            }
+        },
+        {"$unwind": "$interactions"},
+        {
+            "$group": {
+                "_id": group_id,
+                "count": {"$sum": "$interactions.count"},
+            }
+        },
+    ]
+    return pipeline
+
+
 def prepare_interaction_field_names(activities: list[str]) -> list[str]:
     """
     convert activity names to the field names
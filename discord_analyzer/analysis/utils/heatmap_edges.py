@@ -0,0 +1,101 @@
+from typing import Any, Iterable
+
+# the heatmaps fields kept as edges, the `activity` of each edge
+# is the index of its field in this list
+HEATMAP_EDGE_FIELDS = [
+    "thr_messages",
+    "lone_messages",
+    "replied_per_acc",
+    "mentioner_per_acc",
+    "reacted_per_acc",
+]
+# the name of the edges coverage in the analyzer states
+HEATMAP_EDGES_STATE = "heatmapedges"
+# the version of the edges schema
+# the edges of other versions are built again
+HEATMAP_EDGES_VERSION = 1
+
+
+def build_heatmap_edges(heatmaps: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    convert the heatmap documents into the daily edge lists,
+    one document per date and channel
+
+    each edge list document is like
+    ```
+    {
+        "date": str,
+        "channelId": str,
+        "accounts": list[str],
+        "active": int,
+        "activity": list[int],
+        "from_idx": list[int],
+        "to_idx": list[int],
+        "count": list[int],
+    }
+    ```
+    the first `active` accounts are the ones having a heatmap document
+    and the others are just interacted with
+    `from_idx` and `to_idx` are the index of the accounts in `accounts`,
+    `activity` is the index of the field in `HEATMAP_EDGE_FIELDS`,
+    and the messages (`thr_messages` and `lone_messages`)
+    are kept as self interactions summed over the hours
+
+    Parameters:
+    ------------
+    heatmaps : Iterable[dict[str, Any]]
+        the heatmap documents
+
+    Returns:
+    ---------
+    edges : list[dict[str, Any]]
+        the edge list documents, in the order the dates and channels
+        were seen in the heatmap documents
+    """
+    day_channels: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for heatmap in heatmaps:
+        day_channels.setdefault((heatmap["date"], heatmap["channelId"]), []).append(
+            heatmap
+        )
+
+    edges = []
+    for (date, channel), channel_heatmaps in day_channels.items():
+        account_ids: dict[str, int] = {}
+        for heatmap in channel_heatmaps:
+            account_ids.setdefault(heatmap["account_name"], len(account_ids))
+        active = len(account_ids)
+
+        activities, from_idx, to_idx, counts = [], [], [], []
+        for heatmap in channel_heatmaps:
+            account = account_ids[heatmap["account_name"]]
+            for activity, field in enumerate(HEATMAP_EDGE_FIELDS):
+                if field.endswith("_per_acc"):
+                    interactions = [
+                        (item[0]["account"], item[0]["count"])
+                        for item in heatmap.get(field) or []
+                    ]
+                else:
+                    interactions = [(heatmap["account_name"], sum(heatmap[field]))]
+
+                for interacted, count in interactions:
+                    if not count:
+                        continue
+                    activities.append(activity)
+                    from_idx.append(account)
+                    to_idx.append(account_ids.setdefault(interacted, len(account_ids)))
+                    counts.append(count)
+
+        edges.append(
+            {
+                "date": date,
+                "channelId": channel,
+                "accounts": list(account_ids.keys()),
+                "active": active,
+                "activity": activities,
+                "from_idx": from_idx,
+                "to_idx": to_idx,
+                "count": counts,
+            }
+        )
+
+    return edges
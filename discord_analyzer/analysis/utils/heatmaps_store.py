@@ -0,0 +1,366 @@
+import logging
+from datetime import datetime, timedelta
+
+import numpy as np
+from discord_analyzer.analysis.utils.account_index import AccountIndex
+from discord_analyzer.analysis.utils.compute_interaction_mtx_utils import (
+    prepare_interactions_pipeline,
+)
+from discord_analyzer.analysis.utils.heatmap_edges import (
+    HEATMAP_EDGE_FIELDS,
+    HEATMAP_EDGES_STATE,
+    HEATMAP_EDGES_VERSION,
+)
+from discord_analyzer.DB_operations.mongodb_access import DB_access
+
+# the bits of each account id in a packed interaction key
+ACCOUNT_ID_BITS = 29
+
+
+class HeatmapsStore:
+    def __init__(
+        self,
+        channels: list[str],
+        db_access: DB_access,
+        field_names: list[str],
+        account_index: AccountIndex | None = None,
+    ) -> None:
+        """
+        an in-memory columnar store of the heatmaps data needed for
+        member activities, indexed by date
+        the data of a date range is loaded at once, so the windows
+        in the range are answered without querying the database
+
+        the account names are interned into the ids of the `account_index`
+        and the interactions of each date are kept as packed
+        (field, account, interacted account) keys with their counts,
+        see `pack_keys`
+
+        Parameters:
+        ------------
+        channels : list[str]
+            list of all channel ids to be considered for the interactions
+        db_access : DB_access
+            database access object
+        field_names : list[str]
+            the heatmaps fields to load the interactions of
+            see `prepare_interaction_field_names`
+        account_index : AccountIndex | None
+            the index of the guild accounts to intern the account names with
+            default is None, meaning a new index for the store
+        """
+        self.channels = list(channels)
+        self.db_access = db_access
+        self.field_names = sorted(set(field_names))
+        self.field_ids = {field: idx for idx, field in enumerate(self.field_names)}
+
+        self.account_index = (
+            account_index if account_index is not None else AccountIndex()
+        )
+
+        # the ids of the accounts having a heatmaps document in the date
+        # (in any channel)
+        self.dates_accounts: dict[str, np.ndarray] = {}
+        # the packed interaction keys and their counts in the date
+        self.dates_interactions: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+        # the last date of the heatmaps edge lists, read at the first load
+        self.edges_last_date: str | None = None
+        self.edges_checked = False
+
+    def load(self, start_date: str, end_date: str) -> None:
+        """
+        load the data of the dates from `start_date` to `end_date` (inclusive)
+        the already loaded dates are not loaded again
+
+        Parameters:
+        ------------
+        start_date : str
+            the first date to load, in format of `%Y-%m-%d`
+        end_date : str
+            the last date to load, in format of `%Y-%m-%d`
+        """
+        dates = [
+            date
+            for date in self.get_dates(start_date, end_date)
+            if date not in self.dates_accounts
+        ]
+        if dates == []:
+            return
+
+        edges_last_date = self._get_edges_last_date()
+        if edges_last_date is not None and dates[-1] <= edges_last_date:
+            self._load_edges(dates)
+        else:
+            self._load_heatmaps(dates)
+
+    def _load_edges(self, dates: list[str]) -> None:
+        """
+        load the data of the dates from the daily edge lists
+        of the `heatmapedges` collection by a range scan
+
+        Parameters:
+        ------------
+        dates : list[str]
+            the sorted dates to load, in format of `%Y-%m-%d`
+        """
+        logging.info(
+            f"GUILDID: {self.db_access.db_name}: Loading heatmaps edge lists of "
+            f"{len(dates)} days: {dates[0]} -> {dates[-1]}"
+        )
+        edges = list(
+            self.db_access.query_db_find(
+                table="heatmapedges",
+                query={"date": {"$gte": dates[0], "$lte": dates[-1]}},
+                feature_projection={"_id": 0},
+                sorting=("date", 1),
+            )
+        )
+
+        # the accounts of all the dates are interned before the interactions
+        dates_names: dict[str, set[str]] = {date: set() for date in dates}
+        for edge_list in edges:
+            if edge_list["date"] in dates_names:
+                dates_names[edge_list["date"]].update(
+                    edge_list["accounts"][: edge_list["active"]]
+                )
+        for date in dates:
+            self.dates_accounts[date] = self.account_index.get_ids(
+                sorted(dates_names[date])
+            )
+
+        # the id of the field of each edge activity, -1 for the fields not loaded
+        activity_fields = np.array(
+            [self.field_ids.get(field, -1) for field in HEATMAP_EDGE_FIELDS],
+            dtype=np.int64,
+        )
+        channels = set(self.channels)
+        dates_interactions: dict[str, tuple[list, list]] = {
+            date: ([], []) for date in dates
+        }
+        for edge_list in edges:
+            if (
+                edge_list["date"] not in dates_interactions
+                or edge_list["channelId"] not in channels
+            ):
+                continue
+
+            account_ids = self.account_index.get_ids(edge_list["accounts"]).astype(
+                np.int64
+            )
+            fields = activity_fields[np.array(edge_list["activity"], dtype=np.int64)]
+            selected = np.flatnonzero(fields >= 0)
+            from_idx = np.array(edge_list["from_idx"], dtype=np.int64)[selected]
+            to_idx = np.array(edge_list["to_idx"], dtype=np.int64)[selected]
+
+            keys, counts = dates_interactions[edge_list["date"]]
+            keys.append(
+                self.pack_keys(
+                    fields[selected], account_ids[from_idx], account_ids[to_idx]
+                )
+            )
+            counts.append(np.array(edge_list["count"], dtype=np.int64)[selected])
+
+        for date in dates:
+            keys, counts = dates_interactions[date]
+            if keys == []:
+                self.dates_interactions[date] = (
+                    np.array([], dtype=np.int64),
+                    np.array([], dtype=np.int64),
+                )
+                continue
+
+            # summing the interactions of the channels
+            date_keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+            date_counts = np.zeros(len(date_keys), dtype=np.int64)
+            np.add.at(date_counts, inverse, np.concatenate(counts))
+            self.dates_interactions[date] = (date_keys, date_counts)
+
+    def _load_heatmaps(self, dates: list[str]) -> None:
+        """
+        load the data of the dates by aggregating the heatmaps documents
+
+        Parameters:
+        ------------
+        dates : list[str]
+            the sorted dates to load, in format of `%Y-%m-%d`
+        """
+        logging.info(
+            f"GUILDID: {self.db_access.db_name}: Loading heatmaps data of "
+            f"{len(dates)} days: {dates[0]} -> {dates[-1]}"
+        )
+        date_range = {"$gte": dates[0], "$lte": dates[-1]}
+
+        dates_accounts: dict[str, list[int]] = {date: [] for date in dates}
+        cursor = self.db_access.query_db_aggregation(
+            table="heatmaps",
+            query=[
+                {"$match": {"date": date_range}},
+                {"$group": {"_id": {"date": "$date", "account": "$account_name"}}},
+                {"$sort": {"_id.date": 1, "_id.account": 1}},
+            ],
+        )
+        for result in cursor:
+            date = result["_id"]["date"]
+            if date in dates_accounts:
+                dates_accounts[date].append(
+                    self.account_index.intern(result["_id"]["account"])
+                )
+
+        dates_interactions: dict[str, tuple[list, list, list, list]] = {
+            date: ([], [], [], []) for date in dates
+        }
+        cursor = self.db_access.query_db_aggregation(
+            table="heatmaps",
+            query=prepare_interactions_pipeline(
+                query={
+                    "$and": [
+                        {"channelId": {"$in": self.channels}},
+                        {"date": date_range},
+                    ]
+                },
+                field_names=self.field_names,
+                per_date=True,
+            ),
+        )
+        for result in cursor:
+            date = result["_id"]["date"]
+            if date in dates_interactions:
+                fields, accounts, interacted, counts = dates_interactions[date]
+                fields.append(self.field_ids[result["_id"]["field"]])
+                accounts.append(self.account_index.intern(result["_id"]["account"]))
+                interacted.append(
+                    self.account_index.intern(result["_id"]["interacted"])
+                )
+                counts.append(result["count"])
+
+        for date in dates:
+            self.dates_accounts[date] = np.array(dates_accounts[date], dtype=np.int32)
+
+            fields, accounts, interacted, counts = dates_interactions[date]
+            self.dates_interactions[date] = (
+                self.pack_keys(
+                    np.array(fields, dtype=np.int64),
+                    np.array(accounts, dtype=np.int64),
+                    np.array(interacted, dtype=np.int64),
+                ),
+                np.array(counts, dtype=np.int64),
+            )
+
+    def get_accounts(self, start_date: str, end_date: str) -> list[str]:
+        """
+        get the accounts having a heatmaps document
+        from `start_date` to `end_date` (inclusive)
+        the dates are loaded if they weren't
+
+        Parameters:
+        ------------
+        start_date : str
+            the first date of the range, in format of `%Y-%m-%d`
+        end_date : str
+            the last date of the range, in format of `%Y-%m-%d`
+
+        Returns:
+        ---------
+        account_names : list[str]
+            the unique account names (excluding the `remainder` category),
+            in the order they were loaded
+        """
+        self.load(start_date, end_date)
+
+        dates_accounts = [
+            self.dates_accounts[date] for date in self.get_dates(start_date, end_date)
+        ]
+        if dates_accounts == []:
+            return []
+
+        account_ids = np.unique(np.concatenate(dates_accounts))
+        account_names = [
+            account
+            for account in self.account_index.get_names(account_ids)
+            # removing remainder category
+            if account != "remainder"
+        ]
+        return account_names
+
+    def get_interactions(self, date: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        get the interactions of a date, the date is loaded if it wasn't
+
+        Parameters:
+        ------------
+        date : str
+            the date to get its interactions, in format of `%Y-%m-%d`
+
+        Returns:
+        ---------
+        keys : np.ndarray
+            the packed (field, account, interacted account) ids, see `pack_keys`
+        counts : np.ndarray
+            the count of interactions of each key
+        """
+        self.load(date, date)
+        return self.dates_interactions[date]
+
+    def _get_edges_last_date(self) -> str | None:
+        """
+        get the last date that the heatmaps edge lists are available until
+        None if the edge lists weren't available
+        """
+        if not self.edges_checked:
+            states = list(
+                self.db_access.query_db_find(
+                    table="analyzerstates", query={"name": HEATMAP_EDGES_STATE}
+                )
+            )
+            if states != [] and states[0].get("version") == HEATMAP_EDGES_VERSION:
+                self.edges_last_date = states[0]["lastDate"]
+            self.edges_checked = True
+
+        return self.edges_last_date
+
+    def get_id_lookup(self, acc_names: list[str]) -> np.ndarray:
+        """
+        get an array mapping each account id of the store
+        to the first index of the account in `acc_names`
+        the accounts not in `acc_names` are mapped to -1
+        """
+        return self.account_index.get_lookup(acc_names)
+
+    @staticmethod
+    def pack_keys(
+        fields: np.ndarray, accounts: np.ndarray, interacted: np.ndarray
+    ) -> np.ndarray:
+        """
+        pack the field, account, and interacted account ids into one int64 key
+        """
+        return (
+            (fields << (2 * ACCOUNT_ID_BITS))
+            | (accounts << ACCOUNT_ID_BITS)
+            | interacted
+        )
+
+    @staticmethod
+    def unpack_keys(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        unpack the keys of `pack_keys` into the field, account,
+        and interacted account ids
+        """
+        mask = (1 << ACCOUNT_ID_BITS) - 1
+        fields = keys >> (2 * ACCOUNT_ID_BITS)
+        accounts = (keys >> ACCOUNT_ID_BITS) & mask
+        interacted = keys & mask
+        return fields, accounts, interacted
+
+    @staticmethod
+    def get_dates(start_date: str, end_date: str) -> list[str]:
+        """
+        get the dates from `start_date` to `end_date` (inclusive)
+        all in format of `%Y-%m-%d`
+        """
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        return [
+            (start + timedelta(days=day)).strftime("%Y-%m-%d")
+            for day in range((end - start).days + 1)
+        ]
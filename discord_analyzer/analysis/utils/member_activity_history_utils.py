@@ -2,14 +2,16 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
-from dateutil import parser
 from discord_analyzer.DB_operations.mongodb_access import DB_access
 from numpy import array
+from utils.guild_roster import GuildRoster
 
 
 class MemberActivityPastUtils:
-    def __init__(self, db_access: DB_access) -> None:
+    def __init__(self, db_access: DB_access, roster: GuildRoster | None = None) -> None:
         self.db_access = db_access
+        # the guild members to get the joined accounts from, if given
+        self.roster = roster
 
     def update_joined_accounts(
         self,
@@ -82,6 +84,10 @@ class MemberActivityPastUtils:
         # looping up to the max key
         loop_max = array(list(all_joined_day.keys()), dtype=int).max() + 1
 
+        # the rolling union of the days in the window
+        # as the count of the days each user is joined in within the window
+        joined_counts: dict[str, int] = {}
+
         for day_idx in range(loop_max):
             # how mAny days to look for past joined members
             look_past = None
@@ -90,12 +96,17 @@ class MemberActivityPastUtils:
             else:
                 look_past = 0
 
-            joined_members_idx = array(range(look_past, day_idx + 1), dtype=str)
-            all_joined[str(look_past + 1)] = set()
-            for idx in joined_members_idx:
-                all_joined[str(look_past + 1)] = all_joined[str(look_past + 1)].union(
-                    all_joined_day[idx]
-                )
+            for account in all_joined_day[str(day_idx)]:
+                joined_counts[account] = joined_counts.get(account, 0) + 1
+
+            # the day that is not in the window anymore
+            if look_past > 0:
+                for account in all_joined_day[str(look_past - 1)]:
+                    joined_counts[account] -= 1
+                    if joined_counts[account] == 0:
+                        del joined_counts[account]
+
+            all_joined[str(look_past + 1)] = set(joined_counts)
 
         return all_joined
 
@@ -132,9 +143,11 @@ class MemberActivityPastUtils:
             the updated joined dictionary
         """
 
+        accounts_per_date = self._get_accounts_per_date(joined_acc)
+
         for i in range(0, (end_dt - start_dt).days + 1):
             date = (start_dt + timedelta(days=i)).date()
-            joined_accounts = self._get_accounts_per_date(joined_acc, date)
+            joined_accounts = accounts_per_date.get(date, [])
 
             date_index = i + starting_key
             all_joined_day[str(date_index)] = set(joined_accounts)
@@ -215,9 +228,6 @@ class MemberActivityPastUtils:
 
         for idx in range(len(retrieved_data)):
             db_record = retrieved_data[idx]
-            parser.parse(db_record["date"]) - timedelta(
-                days=window_param["period_size"]
-            )
 
             for activity in activity_dict.keys():
                 try:
@@ -243,18 +253,15 @@ class MemberActivityPastUtils:
         return activity_dict
 
     def _get_accounts_per_date(
-        self, joined_acc, date, date_key="joinedAt", account_key="discordId"
+        self, joined_acc, date_key="joinedAt", account_key="discordId"
     ):
         """
-        get the accounts for a special date
+        group the accounts by their joining date, in one pass over the accounts
 
         Parameters:
         -------------
         joined_acc : list(dict[str, Any])
             joined account retreived from database
-            it must be sorted by joinDate!
-        date : datetime.date
-            the date that we're going to retrieve accounts from
         date_key : str
             the key used to represent the date of user join
         account_key : str
@@ -262,17 +269,18 @@ class MemberActivityPastUtils:
 
         Returns:
         ---------
-        account_names : list(str)
-            the list of accounts
+        accounts_per_date : dict[datetime.date, list(str)]
+            the list of accounts joined in each date
         """
-        account_names = []
+        accounts_per_date = {}
 
         for account in joined_acc:
             account_join_date = account[date_key].date()
-            if account_join_date == date:
-                account_names.append(account[account_key])
+            accounts_per_date.setdefault(account_join_date, []).append(
+                account[account_key]
+            )
 
-        return account_names
+        return accounts_per_date
 
     def _get_joined_accounts(self, date_range) -> list[dict[str, Any]]:
         """
@@ -291,6 +299,9 @@ class MemberActivityPastUtils:
             an array of dictionaries
             each dictionary has `account` and `joinDate` member
         """
+        if self.roster is not None:
+            return self.roster.get_joined_accounts(date_range=date_range)
+
         query = {"joinedAt": {"$gte": date_range[0], "$lte": date_range[1]}}
         feature_projection = {"joinedAt": 1, "discordId": 1, "_id": 0}
 
@@ -1,44 +1,43 @@
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 import numpy as np
 import pymongo
 from discord_analyzer.analysis.compute_interaction_matrix_discord import (
+    build_window_matrices,
     compute_interaction_matrix_discord,
 )
+from discord_analyzer.analysis.utils.account_index import AccountIndex
+from discord_analyzer.analysis.utils.window_graph import WindowGraph
 from discord_analyzer.DB_operations.mongodb_access import DB_access
 from networkx import DiGraph
+from tc_core_analyzer_lib import assess_engagement as assess_engagement_lib
 from tc_core_analyzer_lib.assess_engagement import EngagementAssessment
 from tc_core_analyzer_lib.utils.activity import DiscordActivity
-
-
-def get_joined_accounts(db_access: DB_access, date_range: tuple[datetime, datetime]):
-    """
-    get the joined accounts for a time interval to a date range
-
-    Parameters:
-    -------------
-    db_access: DB_access
-        the database access class that queries are called through it
-    date_range : tuple of datetime
-        a tuple with length 2
-        in the first index we save the starting date
-        in the second date we would save the end date
-
-    Returns:
-    ----------
-    data : list of dictionaries
-        an array of dictionaries, each dictionary has `discordId` and `joined_at` member
-    """
-    query = {"joinedAt": {"$gte": date_range[0], "$lte": date_range[1]}}
-    feature_projection = {"joinedAt": 1, "discordId": 1, "_id": 0}
-
-    # quering the db now
-    cursor = db_access.query_db_find("guildmembers", query, feature_projection)
-
-    data = list(cursor)
-
-    return data
+from tc_core_analyzer_lib.utils.compute_interaction_per_acc import thr_int
+
+# the activities to assess the engagement with
+ENGAGEMENT_ACTIVITIES = [
+    DiscordActivity.Mention,
+    DiscordActivity.Reply,
+    DiscordActivity.Reaction,
+    DiscordActivity.Lone_msg,
+    DiscordActivity.Thread_msg,
+]
+# the activities that the 0 axis of their matrix is not included in assessment
+ENGAGEMENT_IGNORE_AXIS0 = [
+    DiscordActivity.Mention,
+]
+# the activities that the 1 axis of their matrix is not included in assessment
+ENGAGEMENT_IGNORE_AXIS1 = [
+    DiscordActivity.Reply,
+    DiscordActivity.Reaction,
+]
 
 
 def store_based_date(
@@ -47,6 +46,7 @@ def store_based_date(
     analytics_day_range,
     joined_acc_dict,
     load_past,
+    account_index: AccountIndex | None = None,
     **kwargs,
 ):
     """
@@ -69,6 +69,9 @@ def store_based_date(
     load_past : bool
         whether we loaded the past data or start processing from scratch
         If True, indicates that the past data is loaded beside the analytics data
+    account_index : AccountIndex | None
+        the index of the guild accounts to intern the joined accounts with
+        default is None, meaning a new index
     **kwargs :
         empty_channel_acc : bool
             whether the channel and acc are empty
@@ -79,17 +82,24 @@ def store_based_date(
         if not kwargs["empty_channel_acc"]:
             return []
 
-    # post processing the
-    account_names = list(map(lambda record: record["discordId"], joined_acc_dict))
-    acc_join_date = list(
-        map(
-            lambda record: record["joinedAt"].date(),
-            joined_acc_dict,
-        )
+    if account_index is None:
+        account_index = AccountIndex()
+
+    # interning the joined accounts and their joining days once
+    joined_ids = account_index.get_ids(
+        record["discordId"] for record in joined_acc_dict
+    )
+    joined_days = np.fromiter(
+        (record["joinedAt"].toordinal() for record in joined_acc_dict),
+        dtype=np.int32,
+        count=len(joined_acc_dict),
+    )
+    # bucketing the joined accounts by their joining day with one sort
+    order = np.argsort(joined_days, kind="stable")
+    days, days_start = np.unique(joined_days[order], return_index=True)
+    joined_accounts_per_day = dict(
+        zip(days.tolist(), np.split(joined_ids[order], days_start[1:]))
     )
-    # converting to numpy to be easier to use
-    account_names = np.array(account_names)
-    acc_join_date = np.array(acc_join_date)
 
     # the data converted to multiple db records
     all_data_records = []
@@ -122,8 +132,8 @@ def store_based_date(
                 data_record[activity] = []
 
         # fill in the all_joined_day member
-        data_record["all_joined_day"] = list(
-            account_names[date_using.date() == acc_join_date]
+        data_record["all_joined_day"] = account_index.get_names(
+            joined_accounts_per_day.get(date_using.toordinal(), [])
         )
 
         # all_data_records[str(day_index)] = data_record
@@ -228,35 +238,6 @@ def get_users_past_window(
     return user_names
 
 
-def get_latest_joined_users(db_access: DB_access, count: int = 5) -> list[str]:
-    """
-    get latest joined users
-
-    Parameters:
-    -------------
-    db_access : DB_access
-        database access class
-    count : int
-        the count of latest users to return
-
-    Returns:
-    ---------
-    users : list[str]
-        the userIds to use
-    """
-    cursor = db_access.query_db_find(
-        table="guildmembers",
-        query={"isBot": False},
-        feature_projection={"discordId": 1, "_id": 0},
-        sorting=("joinedAt", -1),
-    ).limit(count)
-    usersId = list(cursor)
-
-    usersId = list(map(lambda x: x["discordId"], usersId))
-
-    return usersId
-
-
 def assess_engagement(
     w_i: int,
     accounts: list[str],
@@ -272,30 +253,13 @@ def assess_engagement(
     """
     assess engagement of a window index for users
 
+    kwargs can have `interaction_cache` of type `InteractionMatrixCache`,
+    to compute the interaction matrix by sliding it to the `analyze_dates`
+    instead of querying all the dates
     """
-    activities_to_analyze = kwargs.get(
-        "activities_to_analyze",
-        [
-            DiscordActivity.Mention,
-            DiscordActivity.Reply,
-            DiscordActivity.Reaction,
-            DiscordActivity.Lone_msg,
-            DiscordActivity.Thread_msg,
-        ],
-    )
-    ignore_axis0 = kwargs.get(
-        "ignore_axis0",
-        [
-            DiscordActivity.Mention,
-        ],
-    )
-    ignore_axis1 = kwargs.get(
-        "ignore_axis1",
-        [
-            DiscordActivity.Reply,
-            DiscordActivity.Reaction,
-        ],
-    )
+    activities_to_analyze = kwargs.get("activities_to_analyze", ENGAGEMENT_ACTIVITIES)
+    ignore_axis0 = kwargs.get("ignore_axis0", ENGAGEMENT_IGNORE_AXIS0)
+    ignore_axis1 = kwargs.get("ignore_axis1", ENGAGEMENT_IGNORE_AXIS1)
 
     assess_engagment = EngagementAssessment(
         activities=activities_to_analyze,
@@ -303,16 +267,23 @@ def assess_engagement(
         activities_ignore_1_axis=ignore_axis1,
     )
     # obtain interaction matrix
-    int_mat = compute_interaction_matrix_discord(
-        accounts,
-        analyze_dates,
-        channels,
-        db_access,
-        activities=activities_to_analyze,
-    )
+    interaction_cache = kwargs.get("interaction_cache")
+    if interaction_cache is not None:
+        interaction_cache.slide(list(analyze_dates))
+        int_mat = interaction_cache.compute_interaction_matrix(
+            accounts, activities=activities_to_analyze
+        )
+    else:
+        int_mat = compute_interaction_matrix_discord(
+            accounts,
+            analyze_dates,
+            channels,
+            db_access,
+            activities=activities_to_analyze,
+        )
 
     # assess engagement
-    (graph_out, *activity_dict) = assess_engagment.compute(
+    graph_out, *activity_dict = assess_engagment.compute(
         int_mat=int_mat,
         w_i=w_i,
         acc_names=np.asarray(accounts),
@@ -323,3 +294,229 @@ def assess_engagement(
 
     activity_dict = convert_to_dict(data=list(activity_dict), dict_keys=activities_name)
     return graph_out, activity_dict
+
+
+def get_memberactivities_workers() -> int:
+    """
+    get the number of worker processes to assess the member activity windows with
+    from the `MEMBERACTIVITIES_WORKERS` environment variable
+
+    Returns:
+    ---------
+    workers : int
+        the number of worker processes
+        default is 1, meaning the windows are assessed in the main process
+    """
+    workers = os.getenv("MEMBERACTIVITIES_WORKERS", "")
+    if workers == "":
+        return 1
+
+    try:
+        return max(int(workers), 1)
+    except ValueError:
+        logging.warning(
+            f"Invalid MEMBERACTIVITIES_WORKERS value: {workers}, "
+            "using 1 worker instead!"
+        )
+        return 1
+
+
+def compute_window_thresholds(
+    interactions: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]],
+    acc_names: list[str],
+    action_params: dict[str, int],
+    activities: list[str] = ENGAGEMENT_ACTIVITIES,
+    ignore_axis0: list[str] = ENGAGEMENT_IGNORE_AXIS0,
+    ignore_axis1: list[str] = ENGAGEMENT_IGNORE_AXIS1,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, WindowGraph]:
+    """
+    build the interaction matrices of a window and compute its thresholded
+    interactions and graph
+    this is the part of the engagement assessment
+    that doesn't depend on the other windows
+
+    Parameters:
+    ------------
+    interactions : dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]
+        the interactions of each activity for the window,
+        see `InteractionMatrixCache.get_window_interactions`
+    acc_names : list[str]
+        the accounts of the window, the rows of the interaction matrices
+    action_params : dict[str, int]
+        the action parameters, `INT_THR`, `UW_DEG_THR`, `EDGE_STR_THR`,
+        and `UW_THR_DEG_THR` are used here
+    activities : list[str]
+        the activities to assess the engagement with
+    ignore_axis0 : list[str]
+        the activities that the 0 axis of their matrix is not included
+    ignore_axis1 : list[str]
+        the activities that the 1 axis of their matrix is not included
+
+    Returns:
+    ---------
+    thresholds : tuple[np.ndarray, np.ndarray, np.ndarray, WindowGraph]
+        the `thr_ind`, `thr_uw_deg`, `thr_uw_thr_deg`, and the graph of the window
+        the graph is returned as edge arrays, so the results of a worker process
+        are not pickled as a networkx graph
+    """
+    int_mat = build_window_matrices(interactions, size=len(acc_names))
+    thr_ind, thr_uw_deg, thr_uw_thr_deg, graph_out = thr_int(
+        int_mat,
+        action_params["INT_THR"],
+        action_params["UW_DEG_THR"],
+        action_params["EDGE_STR_THR"],
+        action_params["UW_THR_DEG_THR"],
+        activities=activities,
+        ignore_axis_0_activities=ignore_axis0,
+        ignore_axis_1_activities=ignore_axis1,
+    )
+    window_graph = WindowGraph.from_networkx(graph_out, acc_names)
+    return thr_ind, thr_uw_deg, thr_uw_thr_deg, window_graph
+
+
+def iter_windows_thresholds(
+    windows: Iterable[tuple[int, datetime, list[str], list[str]]],
+    interaction_cache,
+    action_params: dict[str, int],
+    workers: int,
+) -> Iterator[tuple[tuple[int, datetime, list[str], list[str]], tuple]]:
+    """
+    compute the thresholds of the windows using a process pool
+    the window interactions are taken from the cache in the main process
+    and the workers build the interaction matrices from them,
+    the results are yielded in the order of the windows
+
+    Parameters:
+    ------------
+    windows : Iterable[tuple[int, datetime, list[str], list[str]]]
+        the (window index, last date, analyze dates, accounts) of the windows
+    interaction_cache : InteractionMatrixCache
+        the cache to get the interactions of the windows from
+    action_params : dict[str, int]
+        the action parameters
+    workers : int
+        the number of worker processes
+
+    Returns:
+    ---------
+    windows_thresholds : Iterator[tuple[tuple, tuple]]
+        each window with its thresholds, see `compute_window_thresholds`
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # bounding the windows in memory that are waiting to be computed
+        pending = deque()
+        for window in windows:
+            _, _, analyze_dates, accounts = window
+            interaction_cache.slide(list(analyze_dates))
+            interactions = interaction_cache.get_window_interactions(
+                accounts, activities=ENGAGEMENT_ACTIVITIES
+            )
+            pending.append(
+                (
+                    window,
+                    executor.submit(
+                        compute_window_thresholds, interactions, accounts, action_params
+                    ),
+                )
+            )
+
+            if len(pending) >= 2 * workers:
+                window, future = pending.popleft()
+                yield window, future.result()
+
+        while pending:
+            window, future = pending.popleft()
+            yield window, future.result()
+
+
+def assess_engagement_thresholds(
+    thresholds: tuple[np.ndarray, np.ndarray, np.ndarray, WindowGraph],
+    w_i: int,
+    accounts: list[str],
+    action_params: dict[str, int],
+    period_size: int,
+    activities_name: list[str],
+    activity_dict: dict[str, dict],
+) -> tuple[WindowGraph, dict[str, dict]]:
+    """
+    assess engagement of a window index for users
+    using the already computed thresholds of the window
+
+    this is `assess_engagement` (`EngagementAssessment.compute`) without
+    computing the thresholds again, and should be run for the windows in order
+    as each window depends on the previous ones
+
+    Parameters:
+    ------------
+    thresholds : tuple[np.ndarray, np.ndarray, np.ndarray, WindowGraph]
+        the thresholds of the window, see `compute_window_thresholds`
+    w_i : int
+        the window index
+    accounts : list[str]
+        the accounts of the window, the same as the interaction matrix rows
+    action_params : dict[str, int]
+        the action parameters
+    period_size : int
+        the window size in days
+    activities_name : list[str]
+        the names of the engagement types in `activity_dict`
+    activity_dict : dict[str, dict]
+        the engagement types of the previous windows
+
+    Returns:
+    ---------
+    graph_out : WindowGraph
+        the graph of the window
+    activity_dict : dict[str, dict]
+        the engagement types updated with the window
+    """
+    assess_engagment = EngagementAssessment(
+        activities=ENGAGEMENT_ACTIVITIES,
+        activities_ignore_0_axis=ENGAGEMENT_IGNORE_AXIS0,
+        activities_ignore_1_axis=ENGAGEMENT_IGNORE_AXIS1,
+    )
+    with precomputed_thresholds(thresholds):
+        graph_out, *activity_values = assess_engagment.compute(
+            int_mat=None,
+            w_i=w_i,
+            acc_names=np.asarray(accounts),
+            act_param=action_params,
+            WINDOW_D=period_size,
+            **activity_dict,
+        )
+
+    activity_dict = convert_to_dict(
+        data=list(activity_values), dict_keys=activities_name
+    )
+    return graph_out, activity_dict
+
+
+@contextmanager
+def precomputed_thresholds(
+    thresholds: tuple[np.ndarray, np.ndarray, np.ndarray, WindowGraph],
+) -> Iterator[None]:
+    """
+    make `EngagementAssessment.compute` take the given thresholds
+    instead of computing them from the interaction matrices, within the context
+
+    `EngagementAssessment.compute` of tc-core-analyzer-lib doesn't accept
+    computed thresholds, so its `thr_int` is replaced while in the context
+    and the rest of its assessment is used as is
+
+    Parameters:
+    ------------
+    thresholds : tuple[np.ndarray, np.ndarray, np.ndarray, WindowGraph]
+        the thresholds to be returned by `thr_int`,
+        see `compute_window_thresholds`
+    """
+    if not hasattr(assess_engagement_lib, "thr_int"):
+        raise NotImplementedError(
+            "EngagementAssessment.compute doesn't use `thr_int` anymore!"
+        )
+
+    lib_thr_int = assess_engagement_lib.thr_int
+    assess_engagement_lib.thr_int = lambda *args, **kwargs: thresholds
+    try:
+        yield
+    finally:
+        assess_engagement_lib.thr_int = lib_thr_int
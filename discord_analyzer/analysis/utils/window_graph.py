@@ -0,0 +1,100 @@
+from typing import Iterator
+
+import numpy as np
+from networkx import DiGraph
+
+
+class WindowGraph:
+    def __init__(
+        self,
+        src: np.ndarray,
+        dst: np.ndarray,
+        weight: np.ndarray,
+        acc_names: list[str],
+    ) -> None:
+        """
+        the interaction graph of a window kept as compact edge arrays
+        the node `i` of the graph is the account `acc_names[i]`,
+        and the networkx graph is built just when it is asked for
+
+        Parameters:
+        ------------
+        src : np.ndarray
+            the source node of each edge
+        dst : np.ndarray
+            the destination node of each edge
+        weight : np.ndarray
+            the weight (interaction count) of each edge
+        acc_names : list[str]
+            the account name of each node
+        """
+        self.src = np.asarray(src, dtype=np.int32)
+        self.dst = np.asarray(dst, dtype=np.int32)
+        self.weight = np.asarray(weight)
+        self.acc_names = list(acc_names)
+
+    def __len__(self) -> int:
+        return len(self.acc_names)
+
+    @classmethod
+    def from_networkx(
+        cls, graph: DiGraph, acc_names: list[str] | None = None
+    ) -> "WindowGraph":
+        """
+        convert a networkx graph into the edge arrays
+
+        Parameters:
+        ------------
+        graph : DiGraph
+            the graph to convert, its edges should have a `weight`
+        acc_names : list[str] | None
+            the account name of each node, in the order of the graph nodes
+            default is None, meaning the `acc_name` attribute of the nodes
+
+        Returns:
+        ---------
+        window_graph : WindowGraph
+            the graph with its nodes numbered in their order in `graph`
+        """
+        nodes = list(graph)
+        if acc_names is None:
+            acc_names = [graph.nodes[node]["acc_name"] for node in nodes]
+        node_ids = {node: idx for idx, node in enumerate(nodes)}
+
+        edges = list(graph.edges(data="weight"))
+        window_graph = cls(
+            src=np.array([node_ids[u] for u, _, _ in edges], dtype=np.int32),
+            dst=np.array([node_ids[v] for _, v, _ in edges], dtype=np.int32),
+            weight=np.array([weight for _, _, weight in edges]),
+            acc_names=acc_names,
+        )
+        return window_graph
+
+    def to_networkx(self) -> DiGraph:
+        """
+        build the networkx graph, having the account names
+        as the `acc_name` attribute of the nodes
+
+        Returns:
+        ---------
+        graph : DiGraph
+            the graph with the nodes `0` to `len(acc_names) - 1`
+            and the `weight` of the edges
+        """
+        graph = DiGraph()
+        graph.add_nodes_from(
+            (idx, {"acc_name": acc_name}) for idx, acc_name in enumerate(self.acc_names)
+        )
+        graph.add_weighted_edges_from(
+            zip(self.src.tolist(), self.dst.tolist(), self.weight.tolist())
+        )
+        return graph
+
+    def iter_edges(self) -> Iterator[tuple[str, str, int]]:
+        """
+        iterate the edges as (source account, destination account, weight)
+        """
+        for src, dst, weight in zip(
+            self.src.tolist(), self.dst.tolist(), self.weight.tolist()
+        ):
+            yield self.acc_names[src], self.acc_names[dst], int(weight)
@@ -1,24 +1,112 @@
 import logging
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from typing import Any, Iterable, Iterator
 
-from discord_analyzer.analysis.activity_hourly import activity_hourly
+import numpy as np
+from discord_analyzer.analysis.activity_hourly import (
+    DayActivity,
+    compute_day_activities,
+)
+from discord_analyzer.analysis.utils.heatmap_edges import (
+    HEATMAP_EDGES_STATE,
+    HEATMAP_EDGES_VERSION,
+    build_heatmap_edges,
+)
 from discord_analyzer.analyzer.heatmaps_utils import (
-    get_bot_id,
-    get_userids,
-    getNumberOfActions,
+    get_heatmaps_workers,
+    get_rows_number_of_actions,
     store_counts_dict,
 )
 from discord_analyzer.DB_operations.mongo_neo4j_ops import MongoNeo4jDB
+from discord_analyzer.models.AnalyzerStateModel import AnalyzerStateModel
 from discord_analyzer.models.GuildsRnDaoModel import GuildsRnDaoModel
-from discord_analyzer.models.HeatMapModel import HeatMapModel
+from discord_analyzer.models.HeatmapEdgesModel import HeatmapEdgesModel
+from discord_analyzer.models.HeatMapModel import HEATMAPS_DAYS_STATE, HeatMapModel
 from discord_analyzer.models.RawInfoModel import RawInfoModel
+from pymongo.database import Database
+from utils.guild_roster import GuildRoster
+
+# the number of days each worker process computes at once
+HEATMAPS_DAYS_PER_TASK = 7
+
+# the hourly activities of heatmap documents, in the order of the documents
+HEATMAP_ACTIVITIES = [
+    "thr_messages",
+    "lone_messages",
+    "replier",
+    "replied",
+    "mentioner",
+    "mentioned",
+    "reacter",
+    "reacted",
+]
+# the activities of heatmap documents counted per interacted account
+HEATMAP_PER_ACC_ACTIVITIES = [
+    "reacted_per_acc",
+    "mentioner_per_acc",
+    "replied_per_acc",
+]
+
+# the count of days of heatmaps converted to edge lists at once
+HEATMAP_EDGES_DAYS_PER_BATCH = 30
+
+# the rawinfos fields used in heatmaps
+# and the value to use if a field is missing in a document
+RAWINFO_FIELDS = {
+    "createdDate": None,
+    "channelId": None,
+    "author": None,
+    "replied_user": "",
+    "user_mentions": None,
+    "reactions": None,
+    "threadId": None,
+    "type": None,
+}
+# the name of the rawinfos fields in the messages of `compute_day_activities`
+MESSAGE_FIELDS = {
+    "createdDate": "datetime",
+    "channelId": "channel",
+    "author": "author",
+    "replied_user": "replied_user",
+    "user_mentions": "user_mentions",
+    "reactions": "reactions",
+    "threadId": "threadId",
+    "type": "mess_type",
+}
 
 
 class Heatmaps:
-    def __init__(self, DB_connections: MongoNeo4jDB, testing: bool) -> None:
+    def __init__(
+        self,
+        DB_connections: MongoNeo4jDB,
+        testing: bool,
+        workers: int | None = None,
+        roster: GuildRoster | None = None,
+    ) -> None:
+        """
+        Parameters:
+        -------------
+        DB_connections : MongoNeo4jDB
+            the database connections
+        testing : bool
+            if True, no heatmap document would be returned
+        workers : int | None
+            the number of worker processes to compute the days in parallel
+            default is None, meaning it would be read from the
+            `HEATMAPS_WORKERS` environment variable (1 if not set)
+        roster : GuildRoster | None
+            the guild members shared within the run
+            default is None, meaning the members are loaded for the guild
+        """
         self.DB_connections = DB_connections
         self.testing = testing
+        self.workers = workers if workers is not None else get_heatmaps_workers()
+        self.roster = roster
+        # the rawinfos mark and heatmaps last date of each guild
+        # taken before streaming its new heatmaps
+        self._changes_snapshots: dict[str, tuple[dict | None, datetime | None]] = {}
 
     def analysis_heatmap(self, guildId: str, from_start: bool = False):
         """
@@ -41,6 +129,36 @@ class Heatmaps:
             also the return could be None if no database for guild
               or no raw info data was available
         """
+        heatmaps_stream = self.analysis_heatmap_stream(guildId, from_start)
+        if heatmaps_stream is None:
+            return None
+
+        return list(heatmaps_stream)
+
+    def analysis_heatmap_stream(
+        self, guildId: str, from_start: bool = False
+    ) -> Iterator[dict] | None:
+        """
+        Same as `analysis_heatmap` but the heatmap documents are generated
+        day by day while the returned iterator is consumed,
+        so the documents of the whole period are not kept in memory
+
+        Parameters:
+        -------------
+        guildId : str
+            the guild id to analyze data for
+        from_start : bool
+            do the analytics from scrach or not
+            if True, if wouldn't pay attention to the existing data in heatmaps
+            and will do the analysis from the first date
+
+        Returns:
+        ---------
+        heatmaps_stream : Iterator[dict] | None
+            the heatmap documents, ordered by the days
+            the return could be None if no database for guild
+              or no raw info data was available
+        """
         # activity_hourly()
         guild_msg = f"GUILDID: {guildId}:"
 
@@ -76,7 +194,13 @@ class Heatmaps:
                 f"{guild_msg} Collection '{rawinfo_c.collection_name}' does not exist"
             )
 
-        last_date = heatmap_c.get_last_date()
+        last_date = self._get_last_written_date(client[guildId])
+        # the streamed days are computed with the rawinfos changed until now,
+        # so just the days before them are checked for the changes after now
+        self._changes_snapshots[guildId] = (
+            rawinfo_c.get_high_water_mark(),
+            last_date,
+        )
 
         if last_date is None or from_start:
             # If no heatmap was created, than tha last date is the first
@@ -91,97 +215,617 @@ class Heatmaps:
         else:
             last_date = last_date + timedelta(days=1)
 
-        # initialize the data array
+        roster = self._get_roster(guildId)
+        roster.refresh()
+        # getting the id of bots
+        bot_ids = roster.get_bot_ids()
+        # the guild members are loaded once for all the days
+        member_ids = roster.get_user_ids()
+
+        # the days before today are analyzed
+        end_date = datetime.now() - timedelta(days=1)
+
+        # the bot messages are filtered in the database
+        days_columns = rawinfo_c.get_columns_per_day(
+            last_date,
+            end_date,
+            fields=RAWINFO_FIELDS,
+            msg="ANALYZER HEATMAPS: ",
+            exclude_authors=bot_ids,
+        )
+        if self.workers > 1:
+            logging.info(f"{guild_msg} Computing heatmaps with {self.workers} workers")
+        heatmaps_stream = self._iter_days_heatmaps(days_columns, member_ids, bot_ids)
+
+        # the midnight messages of the day after the end are in its entries,
+        # but the day is not complete yet, so it is computed in the next run
+        end_day = end_date.strftime("%Y-%m-%d")
+        return (heatmap for heatmap in heatmaps_stream if heatmap["date"] <= end_day)
+
+    def _get_last_written_date(self, database: Database) -> datetime | None:
+        """
+        get the last date of the heatmaps written completely,
+        the heatmaps of the days after it are to be computed
+
+        it is the date saved by the stream writer (see `HEATMAPS_DAYS_STATE`),
+        and for the heatmaps written before the dates were saved
+        the day before the last stored day, as the last one could be
+        partially written
+
+        Parameters:
+        -------------
+        database : Database
+            the guild database
+
+        Returns:
+        ---------
+        last_date : datetime | None
+            the last date written completely,
+            None if no heatmap is written
+        """
+        state = AnalyzerStateModel(database).get_state(HEATMAPS_DAYS_STATE)
+        if state is not None and state.get("lastDate") is not None:
+            return datetime.strptime(state["lastDate"], "%Y-%m-%d")
+
+        last_date = HeatMapModel(database).get_last_date()
+        if last_date is not None:
+            last_date = last_date - timedelta(days=1)
+        return last_date
+
+    def update_changed_heatmaps(self, guildId: str, from_start: bool = False) -> int:
+        """
+        recompute and upsert the already computed heatmaps affected by the
+        rawinfos inserted or updated since the last call
+        (i.e. the late-arriving or backfilled messages and the updated ones)
+
+        the high-water mark of rawinfos is saved in the `analyzerstates`
+        collection, and in the first call (or if `from_start` was True)
+        it would be just saved, assuming the heatmaps are up to date
+
+        if the new heatmaps of the guild were streamed before
+        (`analysis_heatmap_stream`), the mark and the heatmaps last date
+        taken before streaming them are used, so the just computed days
+        are not computed again
+
+        Parameters:
+        -------------
+        guildId : str
+            the guild id to update its heatmaps
+        from_start : bool
+            if True, the heatmaps are assumed to be just computed from scratch
+            so no heatmap would be updated and just the mark is saved
+
+        Returns:
+        ---------
+        updated_count : int
+            the count of upserted heatmap documents
+        """
+        guild_msg = f"GUILDID: {guildId}:"
+
+        client = self.DB_connections.mongoOps.mongo_db_access.db_mongo_client
+        rawinfo_c = RawInfoModel(client[guildId])
+        heatmap_c = HeatMapModel(client[guildId])
+        state_c = AnalyzerStateModel(client[guildId])
+
+        snapshot = self._changes_snapshots.pop(guildId, None)
+        if snapshot is not None:
+            current_mark, last_date = snapshot
+        else:
+            current_mark = rawinfo_c.get_high_water_mark()
+            last_date = heatmap_c.get_last_date()
+
+        if current_mark is None:
+            logging.info(f"{guild_msg} No rawinfos to update the heatmaps for!")
+            return 0
+
+        last_mark = state_c.get_state("heatmaps")
+        first_date = GuildsRnDaoModel(client["Core"]).get_guild_period(guildId)
+
+        changed_days = {}
+        if not from_start and None not in [last_mark, last_date, first_date]:
+            changed_days = rawinfo_c.get_changed_days(
+                since=last_mark,
+                until=current_mark,
+                first_day=first_date,
+                last_day=last_date,
+            )
+
         heatmaps_results = []
+        day_channels = []
+        if changed_days:
+            roster = self._get_roster(guildId)
+            roster.refresh()
+            bot_ids = roster.get_bot_ids()
+            member_ids = roster.get_user_ids()
 
-        # getting the id of bots
-        bot_ids = get_bot_id(
-            db_mongo_client=self.DB_connections.mongoOps.mongo_db_access.db_mongo_client,
-            guildId=guildId,
+        for day in sorted(changed_days.keys()):
+            date = day.strftime("%Y-%m-%d")
+            channels = changed_days[day]
+            logging.info(
+                f"{guild_msg} Updating the heatmaps of {date} "
+                f"for {len(channels)} channels"
+            )
+
+            # the whole day is needed for the accounts of the day
+            for _, columns in rawinfo_c.get_columns_per_day(
+                day,
+                day,
+                fields=RAWINFO_FIELDS,
+                msg="ANALYZER HEATMAPS UPDATE: ",
+                exclude_authors=bot_ids,
+            ):
+                results = self._process_day_columns(columns, member_ids, bot_ids)
+                # the midnight messages of the next day are also in the day entries
+                heatmaps_results.extend(
+                    heatmap
+                    for heatmap in results
+                    if heatmap["date"] == date and heatmap["channelId"] in channels
+                )
+            day_channels.extend((date, channel) for channel in channels)
+
+        if self.testing:
+            logging.warning(f"{guild_msg} Testing mode enabled! Not updating heatmaps")
+            return len(heatmaps_results)
+
+        if day_channels:
+            heatmap_c.replace_day_channels(heatmaps_results, day_channels)
+            self._update_day_channels_edges(
+                client[guildId], heatmaps_results, day_channels
+            )
+        state_c.save_state("heatmaps", current_mark)
+
+        return len(heatmaps_results)
+
+    def update_heatmap_edges(self, guildId: str, from_start: bool = False) -> int:
+        """
+        convert the heatmaps stored since the last call into the daily
+        edge lists of the `heatmapedges` collection
+        (see `discord_analyzer.analysis.utils.heatmap_edges`)
+        which the interaction matrices are loaded from
+
+        the last date of the converted heatmaps is saved in the `analyzerstates`
+        collection, and in the first call (or if `from_start` was True)
+        all the heatmaps are converted
+
+        Parameters:
+        -------------
+        guildId : str
+            the guild id to update its edge lists
+        from_start : bool
+            if True, the heatmaps are assumed to be just computed from scratch
+            so the edge lists of all the heatmaps are created again
+
+        Returns:
+        ---------
+        edges_count : int
+            the count of inserted edge list documents
+        """
+        guild_msg = f"GUILDID: {guildId}:"
+
+        if self.testing:
+            logging.warning(f"{guild_msg} Testing mode enabled! Not updating edges")
+            return 0
+
+        client = self.DB_connections.mongoOps.mongo_db_access.db_mongo_client
+        heatmap_c = HeatMapModel(client[guildId])
+        edges_c = HeatmapEdgesModel(client[guildId])
+        state_c = AnalyzerStateModel(client[guildId])
+
+        state = state_c.get_state(HEATMAP_EDGES_STATE)
+        if from_start or state is None or state.get("version") != HEATMAP_EDGES_VERSION:
+            logging.info(f"{guild_msg} Creating the heatmaps edge lists from start!")
+            edges_c.remove_all_data()
+            last_date = None
+            # the edges are not loaded until they're created again
+            state_c.save_state(
+                HEATMAP_EDGES_STATE,
+                {"version": HEATMAP_EDGES_VERSION, "lastDate": last_date},
+            )
+        else:
+            last_date = state["lastDate"]
+
+        edges_count = 0
+        day_heatmaps: list[dict] = []
+        days_count = 0
+        for heatmap in heatmap_c.get_documents_after(last_date):
+            if day_heatmaps and heatmap["date"] != day_heatmaps[-1]["date"]:
+                days_count += 1
+                if days_count == HEATMAP_EDGES_DAYS_PER_BATCH:
+                    edges_count += self._insert_edges(edges_c, state_c, day_heatmaps)
+                    day_heatmaps = []
+                    days_count = 0
+            day_heatmaps.append(heatmap)
+            last_date = heatmap["date"]
+
+        if day_heatmaps:
+            edges_count += self._insert_edges(edges_c, state_c, day_heatmaps)
+
+        logging.info(f"{guild_msg} {edges_count} heatmaps edge lists were created!")
+
+        return edges_count
+
+    def _insert_edges(
+        self,
+        edges_c: HeatmapEdgesModel,
+        state_c: AnalyzerStateModel,
+        heatmaps: list[dict],
+    ) -> int:
+        """
+        convert the heatmaps into edge lists and replace the edge lists
+        of their days and channels, then save the last converted date
+        so a batch converted again (i.e. after a crash) is not duplicated
+        """
+        edges = build_heatmap_edges(heatmaps)
+        day_channels = [
+            (edge_list["date"], edge_list["channelId"]) for edge_list in edges
+        ]
+        edges_c.replace_day_channels(edges, day_channels=day_channels)
+        state_c.save_state(
+            HEATMAP_EDGES_STATE,
+            {"version": HEATMAP_EDGES_VERSION, "lastDate": heatmaps[-1]["date"]},
         )
+        return len(edges)
 
-        while last_date.date() < datetime.now().date():
-            entries = rawinfo_c.get_day_entries(last_date, "ANALYZER HEATMAPS: ")
-            if len(entries) == 0:
-                # analyze next day
-                last_date = last_date + timedelta(days=1)
-                continue
+    def _update_day_channels_edges(
+        self,
+        database: Database,
+        heatmaps: list[dict],
+        day_channels: list[tuple[str, str]],
+    ) -> None:
+        """
+        replace the edge lists of the recomputed heatmaps of the days and channels
+        the days not converted to edge lists yet are skipped,
+        as they are converted in the next `update_heatmap_edges`
+        """
+        state = AnalyzerStateModel(database).get_state(HEATMAP_EDGES_STATE)
+        if (
+            state is None
+            or state.get("version") != HEATMAP_EDGES_VERSION
+            or state["lastDate"] is None
+        ):
+            return
+
+        last_date = state["lastDate"]
+        HeatmapEdgesModel(database).replace_day_channels(
+            build_heatmap_edges(
+                heatmap for heatmap in heatmaps if heatmap["date"] <= last_date
+            ),
+            day_channels=[
+                (date, channel) for date, channel in day_channels if date <= last_date
+            ],
+        )
+
+    def _get_roster(self, guildId: str) -> GuildRoster:
+        """
+        get the members of the guild, shared between the calls for the guild
+        """
+        if self.roster is None or self.roster.guild_id != guildId:
+            self.roster = GuildRoster(
+                self.DB_connections.mongoOps.mongo_db_access.db_mongo_client, guildId
+            )
+        return self.roster
+
+    def _iter_days_heatmaps(
+        self,
+        days_columns: Iterable[tuple[datetime, dict[str, list]]],
+        member_ids: list[str],
+        bot_ids: list[str] | set[str],
+    ) -> Iterator[dict]:
+        """
+        generate the heatmap documents of the days, a day after another
+        in the main process or using the worker processes if `workers > 1`
 
-            prepared_list = []
-            account_list = get_userids(
-                db_mongo_client=self.DB_connections.mongoOps.mongo_db_access.db_mongo_client,
-                guildId=guildId,
+        Parameters:
+        -------------
+        days_columns : Iterable[tuple[datetime, dict[str, list]]]
+            the columns of `RAWINFO_FIELDS` of rawinfo documents per day,
+            ordered by date
+        member_ids : list[str]
+            the non-bot guild members
+        bot_ids : list[str] | set[str]
+            the bot ids, the messages of bots are not analyzed
+
+        Returns:
+        ---------
+        heatmaps_stream : Iterator[dict]
+            the heatmap documents of all the days, ordered by the days
+        """
+        if self.workers > 1:
+            yield from self._iter_days_heatmaps_parallel(
+                days_columns, member_ids, bot_ids
             )
+            return
+
+        for _, columns in days_columns:
+            results = self._process_day_columns(columns, member_ids, bot_ids)
+            # the heatmaps of the midnight messages of the next day go last
+            yield from sorted(results, key=lambda heatmap: heatmap["date"])
+
+    def _iter_days_heatmaps_parallel(
+        self,
+        days_columns: Iterable[tuple[datetime, dict[str, list]]],
+        member_ids: list[str],
+        bot_ids: list[str] | set[str],
+    ) -> Iterator[dict]:
+        """
+        generate the heatmap documents of the days using a process pool
+        the days are sent to the workers in chunks of `HEATMAPS_DAYS_PER_TASK`
+        as compact message arrays, and the results are yielded in date order
+
+        Parameters:
+        -------------
+        days_columns : Iterable[tuple[datetime, dict[str, list]]]
+            the columns of `RAWINFO_FIELDS` of rawinfo documents per day,
+            ordered by date
+        member_ids : list[str]
+            the non-bot guild members
+        bot_ids : list[str] | set[str]
+            the bot ids, the messages of bots are not analyzed
+
+        Returns:
+        ---------
+        heatmaps_stream : Iterator[dict]
+            the heatmap documents of all the days, ordered by the days
+        """
+        bot_ids = set(bot_ids)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            # bounding the chunks in memory that are waiting to be computed
+            pending = deque()
+            chunk = []
+            for _, columns in days_columns:
+                chunk.append(self._prepare_day_columns(columns, member_ids, bot_ids))
 
-            for entry in entries:
-                if "replied_user" not in entry:
-                    reply = ""
-                else:
-                    reply = entry["replied_user"]
-
-                # eliminating bots
-                if entry["author"] not in bot_ids:
-                    prepared_list.append(
-                        {
-                            # .strftime('%Y-%m-%d %H:%M'),
-                            "datetime": entry["createdDate"],
-                            "channel": entry["channelId"],
-                            "author": entry["author"],
-                            "replied_user": reply,
-                            "user_mentions": entry["user_mentions"],
-                            "reactions": entry["reactions"],
-                            "threadId": entry["threadId"],
-                            "mess_type": entry["type"],
-                        }
+                if len(chunk) == HEATMAPS_DAYS_PER_TASK:
+                    pending.append(
+                        executor.submit(_compute_days_heatmaps, chunk, self.testing)
                     )
-                    if entry["author"] not in account_list:
-                        account_list.append(entry["author"])
-
-                    if entry["user_mentions"] is not None:
-                        for account in entry["user_mentions"]:
-                            if account not in account_list and account not in bot_ids:
-                                account_list.append(account)
-
-            activity = activity_hourly(prepared_list, acc_names=account_list)
-            # # activity[0]
-            # heatmap = activity[1][0]
-            # Parsing the activity_hourly into the dictionary
-            results = self._post_process_data(activity[1], len(account_list))
-            heatmaps_results.extend(results)
-
-            # analyze next day
-            last_date = last_date + timedelta(days=1)
+                    chunk = []
+                if len(pending) >= 2 * self.workers:
+                    yield from pending.popleft().result()
+
+            if chunk:
+                pending.append(
+                    executor.submit(_compute_days_heatmaps, chunk, self.testing)
+                )
+            while pending:
+                yield from pending.popleft().result()
+
+    def _process_day_columns(
+        self,
+        columns: dict[str, list],
+        member_ids: list[str],
+        bot_ids: list[str] | set[str],
+    ) -> list[dict]:
+        """
+        create the heatmap documents of one day
+
+        Parameters:
+        -------------
+        columns : dict[str, list]
+            the columns of `RAWINFO_FIELDS` of the rawinfo documents of the day
+        member_ids : list[str]
+            the non-bot guild members
+        bot_ids : list[str] | set[str]
+            the bot ids, the messages of bots are not analyzed
+
+        Returns:
+        ---------
+        results : list[dict]
+            the heatmap documents of the day
+        """
+        compact, account_list = self._prepare_day_columns(columns, member_ids, bot_ids)
+        results = self._compute_day_heatmaps(expand_messages(compact), account_list)
+
+        return results
+
+    def _prepare_day_columns(
+        self,
+        columns: dict[str, list],
+        member_ids: list[str],
+        bot_ids: list[str] | set[str],
+    ) -> tuple[dict[str, Any], list[str]]:
+        """
+        prepare the rawinfo columns of one day for `compute_day_activities`
 
-        return heatmaps_results
+        Parameters:
+        -------------
+        columns : dict[str, list]
+            the columns of `RAWINFO_FIELDS` of the rawinfo documents of the day
+        member_ids : list[str]
+            the non-bot guild members
+        bot_ids : list[str] | set[str]
+            the bot ids, the messages of bots are not analyzed
+
+        Returns:
+        ---------
+        compact : dict[str, Any]
+            the columns of the messages excluding the bot messages,
+            named as `MESSAGE_FIELDS`, which `expand_messages` converts to the
+            messages of `compute_day_activities`
+            the datetimes and message types are kept as numpy arrays
+        account_list : list[str]
+            the guild members plus the other accounts active in the day
+        """
+        bot_ids = set(bot_ids)
+
+        # eliminating bots
+        keep = [author not in bot_ids for author in columns["author"]]
+
+        compact: dict[str, Any] = {
+            MESSAGE_FIELDS[field]: [
+                value for value, kept in zip(columns[field], keep) if kept
+            ]
+            for field in MESSAGE_FIELDS
+        }
+
+        account_list = list(member_ids)
+        # for faster lookup of accounts in account_list
+        accounts = set(account_list)
+
+        for author, mentions in zip(compact["author"], compact["user_mentions"]):
+            if author not in accounts:
+                account_list.append(author)
+                accounts.add(author)
+
+            if mentions is not None:
+                for account in mentions:
+                    if account not in accounts and account not in bot_ids:
+                        account_list.append(account)
+                        accounts.add(account)
+
+        compact["datetime"] = np.array(
+            [date.replace(tzinfo=None) for date in compact["datetime"]],
+            dtype="datetime64[us]",
+        )
+        compact["mess_type"] = np.array(compact["mess_type"], dtype=np.int16)
+
+        return compact, account_list
+
+    def _compute_day_heatmaps(
+        self, prepared_list: list[dict], account_list: list[str]
+    ) -> list[dict]:
+        """
+        compute the heatmap documents of the prepared messages of one day
+
+        Parameters:
+        -------------
+        prepared_list : list[dict]
+            the messages of the day, the columns made by `_prepare_day_columns`
+            converted into messages by `expand_messages`
+        account_list : list[str]
+            the accounts to compute the heatmaps for
+
+        Returns:
+        ---------
+        results : list[dict]
+            the heatmap documents of the day
+        """
+        _, day_activities = compute_day_activities(
+            prepared_list, acc_names=account_list
+        )
+        # Parsing the DayActivity objects into the dictionary
+        results = self._post_process_data(day_activities, len(account_list))
+
+        return results
 
     def _post_process_data(self, heatmap_data, accounts_len):
+        """
+        convert the activity_hourly outputs into heatmap documents
+
+        Parameters:
+        -------------
+        heatmap_data : list[dict] | Iterable[DayActivity]
+            the dictionaries returned by `activity_hourly` or the
+            DayActivity objects (with just the active account rows)
+        accounts_len : int
+            the number of accounts to create the documents for
+
+        Returns:
+        ---------
+        results : list[dict]
+            the heatmap documents of the accounts having any activity
+        """
         results = []
         for heatmap in heatmap_data:
-            for i in range(accounts_len):
-                heatmap_dict = {}
-                heatmap_dict["date"] = heatmap["date"][0]
-                heatmap_dict["channelId"] = heatmap["channel"][0]
-                heatmap_dict["thr_messages"] = heatmap["thr_messages"][i]
-                heatmap_dict["lone_messages"] = heatmap["lone_messages"][i]
-                heatmap_dict["replier"] = heatmap["replier"][i]
-                heatmap_dict["replied"] = heatmap["replied"][i]
-                heatmap_dict["mentioner"] = heatmap["mentioner"][i]
-                heatmap_dict["mentioned"] = heatmap["mentioned"][i]
-                heatmap_dict["reacter"] = heatmap["reacter"][i]
-                heatmap_dict["reacted"] = heatmap["reacted"][i]
-                heatmap_dict["reacted_per_acc"] = store_counts_dict(
-                    dict(Counter(heatmap["reacted_per_acc"][i]))
-                )
-                heatmap_dict["mentioner_per_acc"] = store_counts_dict(
-                    dict(Counter(heatmap["mentioner_per_acc"][i]))
+            if isinstance(heatmap, DayActivity):
+                activities = {
+                    activity: getattr(heatmap, activity)
+                    for activity in HEATMAP_ACTIVITIES + HEATMAP_PER_ACC_ACTIVITIES
+                }
+                # the index of account names per row of the activities
+                acc_rows = heatmap.acc_rows
+                acc_names = heatmap.acc_names
+                date, channel = heatmap.date[0], heatmap.channel[0]
+            else:
+                activities = heatmap
+                acc_rows = np.asarray(
+                    heatmap.get("acc_rows", range(accounts_len)), dtype=np.int64
                 )
-                heatmap_dict["replied_per_acc"] = store_counts_dict(
-                    dict(Counter(heatmap["replied_per_acc"][i]))
-                )
-                heatmap_dict["account_name"] = heatmap["acc_names"][i]
-                sum_ac = getNumberOfActions(heatmap_dict)
+                acc_names = heatmap["acc_names"]
+                date, channel = heatmap["date"][0], heatmap["channel"][0]
 
-                if not self.testing and sum_ac > 0:
-                    results.append(heatmap_dict)
+            counts = {}
+            for activity in HEATMAP_ACTIVITIES:
+                activity_counts = np.asarray(activities[activity]).reshape(-1, 24)
+                counts[activity] = activity_counts[: len(acc_rows)]
+            actions_count = get_rows_number_of_actions(counts)
+
+            # just the accounts (not the remainder) having any action
+            active_rows = np.flatnonzero(
+                (actions_count > 0) & (acc_rows < accounts_len)
+            )
+            if self.testing:
+                continue
+
+            for i in active_rows.tolist():
+                heatmap_dict = {}
+                heatmap_dict["date"] = date
+                heatmap_dict["channelId"] = channel
+                for activity in HEATMAP_ACTIVITIES:
+                    heatmap_dict[activity] = counts[activity][i].tolist()
+                for activity in HEATMAP_PER_ACC_ACTIVITIES:
+                    heatmap_dict[activity] = store_counts_dict(
+                        dict(Counter(activities[activity][i]))
+                    )
+                heatmap_dict["account_name"] = acc_names[acc_rows[i]]
+
+                results.append(heatmap_dict)
 
         return results
+
+
+def expand_messages(compact: dict[str, Any]) -> list[dict]:
+    """
+    convert the compact columns made by `Heatmaps._prepare_day_columns`
+    into the messages
+
+    Parameters:
+    -------------
+    compact : dict[str, Any]
+        the columns of the messages
+
+    Returns:
+    ---------
+    prepared_list : list[dict]
+        the messages to be given to `compute_day_activities`
+    """
+    columns = dict(compact)
+    columns["datetime"] = compact["datetime"].astype(datetime).tolist()
+    columns["mess_type"] = compact["mess_type"].tolist()
+
+    fields = list(columns.keys())
+    prepared_list = [dict(zip(fields, values)) for values in zip(*columns.values())]
+
+    return prepared_list
+
+
+def _compute_days_heatmaps(
+    days: list[tuple[dict[str, Any], list[str]]], testing: bool
+) -> list[dict]:
+    """
+    compute the heatmap documents of multiple days in a worker process
+
+    Parameters:
+    -------------
+    days : list[tuple[dict[str, Any], list[str]]]
+        the compact messages and the account list of each day
+    testing : bool
+        the `testing` of the `Heatmaps` instance
+
+    Returns:
+    ---------
+    results : list[dict]
+        the heatmap documents of the days, in the same order as `days`
+    """
+    heatmaps = Heatmaps(DB_connections=None, testing=testing, workers=1)
+
+    results = []
+    for compact, account_list in days:
+        day_results = heatmaps._compute_day_heatmaps(
+            expand_messages(compact), account_list
+        )
+        # the heatmaps of the midnight messages of the next day go last
+        results.extend(sorted(day_results, key=lambda heatmap: heatmap["date"]))
+
+    return results
@@ -3,14 +3,33 @@ from datetime import datetime, timedelta
 
 from discord_analyzer.analysis.compute_member_activity import compute_member_activity
 from discord_analyzer.analyzer.memberactivity_utils import MemberActivityUtils
+from discord_analyzer.analyzer.utils.engagement_snapshot import (
+    ENGAGEMENT_SNAPSHOT_STATE,
+    decode_engagement_snapshot,
+    encode_engagement_snapshot,
+)
 from discord_analyzer.DB_operations.mongo_neo4j_ops import MongoNeo4jDB
+from discord_analyzer.models.AnalyzerStateModel import AnalyzerStateModel
 from discord_analyzer.models.MemberActivityModel import MemberActivityModel
 from discord_analyzer.models.RawInfoModel import RawInfoModel
+from utils.guild_roster import GuildRoster
 
 
 class MemberActivities:
-    def __init__(self, DB_connections: MongoNeo4jDB) -> None:
+    def __init__(
+        self, DB_connections: MongoNeo4jDB, roster: GuildRoster | None = None
+    ) -> None:
+        """
+        Parameters:
+        -------------
+        DB_connections : MongoNeo4jDB
+            the database connections
+        roster : GuildRoster | None
+            the guild members shared within the run
+            default is None, meaning the members are loaded for the guild
+        """
         self.DB_connections = DB_connections
+        self.roster = roster
 
         self.utils = MemberActivityUtils(DB_connections)
 
@@ -33,8 +52,9 @@ class MemberActivities:
             the list of data analyzed
             also the return could be None if no database for guild
               or no raw info data was available
-        memberactivity_networkx_results : list of networkx objects
-            the list of data analyzed in networkx format
+        memberactivity_networkx_results : dict of WindowGraph
+            the graphs of the windows as edge arrays, keyed by their last date
+            (`WindowGraph.to_networkx` gives them in networkx format)
             also the return could be None if no database for guild
              or no raw info data was available
         """
@@ -51,6 +71,7 @@ class MemberActivities:
 
         member_activity_c = MemberActivityModel(client[guildId])
         rawinfo_c = RawInfoModel(client[guildId])
+        state_c = AnalyzerStateModel(client[guildId])
 
         # Testing if there are entries in the rawinfo collection
         if rawinfo_c.count() == 0:
@@ -96,29 +117,54 @@ class MemberActivities:
 
         date_range = [first_date, last_date]
 
+        # num_days_to_load = (
+        #       max([CON_T_THR, VITAL_T_THR, STILL_T_THR, PAUSED_T_THR])+1
+        # ) * WINDOW_D
+        num_days_to_load = (
+            max(
+                [
+                    action["CON_T_THR"],
+                    action["VITAL_T_THR"],
+                    action["STILL_T_THR"],
+                    action["PAUSED_T_THR"],
+                ]
+            )
+            + 1
+        ) * window["period_size"]
+
+        past_records = None
         if load_past_data:
-            # num_days_to_load = (
-            #       max([CON_T_THR, VITAL_T_THR, STILL_T_THR, PAUSED_T_THR])+1
-            # ) * WINDOW_D
-            num_days_to_load = (
-                max(
-                    [
-                        action["CON_T_THR"],
-                        action["VITAL_T_THR"],
-                        action["STILL_T_THR"],
-                        action["PAUSED_T_THR"],
-                    ]
-                )
-                + 1
-            ) * window["period_size"]
             date_range[0] = date_range[1] - timedelta(days=num_days_to_load)
 
             # if the date range goes back more than the "7 days `period` forward"
             if date_range[0] < period + timedelta(days=window["period_size"]):
                 date_range[0] = period + timedelta(days=window["period_size"])
 
+            # the past documents from the snapshot of the previous run
+            # instead of loading them from memberactivities
+            last_stored_date = member_activity_c.get_last_date()
+            past_records = decode_engagement_snapshot(
+                state_c.get_state(ENGAGEMENT_SNAPSHOT_STATE),
+                last_date=(
+                    last_stored_date.isoformat()
+                    if last_stored_date is not None
+                    else None
+                ),
+                since=date_range[0].isoformat(),
+            )
+            if past_records is None:
+                logging.info(
+                    f"{guild_msg} No valid engagement snapshot, "
+                    "loading the past memberactivities!"
+                )
+
+        if self.roster is None or self.roster.guild_id != guildId:
+            self.roster = GuildRoster(client, guildId)
+        # the members might have changed since the heatmaps analysis
+        self.roster.refresh()
+
         # get all users during date_range
-        all_users = self.utils.get_all_users(guildId)
+        all_users = self.roster.get_non_bot_ids()
         # change format like 23/03/27
         date_range = [dt.strftime("%y/%m/%d") for dt in date_range]
 
@@ -131,6 +177,8 @@ class MemberActivities:
             window,
             action,
             load_past_data=load_past_data,
+            past_records=past_records,
+            roster=self.roster,
         )
 
         if not from_start:
@@ -140,6 +188,32 @@ class MemberActivities:
                 activities, first_storing_date
             )
 
+        # the documents the next run would need from memberactivities
+        snapshot_since = last_date - timedelta(days=num_days_to_load)
+        if not load_past_data:
+            # the memberactivities would be just the new documents
+            stored_records = []
+        elif past_records is not None:
+            stored_records = [
+                record
+                for record in past_records
+                if record["date"] >= snapshot_since.isoformat()
+            ]
+        else:
+            stored_records = member_activity_c.get_records_since(snapshot_since)
+        state_c.save_state(
+            ENGAGEMENT_SNAPSHOT_STATE,
+            encode_engagement_snapshot(
+                records=stored_records
+                + [
+                    record
+                    for record in activities
+                    if record["date"] >= snapshot_since.isoformat()
+                ],
+                since=snapshot_since.isoformat(),
+            ),
+        )
+
         memberactivity_results = activities
         memberactivity_networkx_results = networkx_objects
 
@@ -1,5 +1,8 @@
+import logging
+import os
+
+import numpy as np
 from discord_analyzer.schemas.accounts import AccountCounts
-from pymongo import MongoClient
 
 
 def store_counts_dict(counts_dict):
@@ -14,95 +17,65 @@ def store_counts_dict(counts_dict):
     return obj_array
 
 
+# the activities counted as the actions of an account
+ACTION_FIELDS = [
+    "thr_messages",
+    "lone_messages",
+    "replier",
+    "replied",
+    "mentioned",
+    "mentioner",
+    "reacter",
+    "reacted",
+]
+
+
 def getNumberOfActions(heatmap):
     """get number of actions"""
-    sum_ac = 0
-    fields = [
-        "thr_messages",
-        "lone_messages",
-        "replier",
-        "replied",
-        "mentioned",
-        "mentioner",
-        "reacter",
-        "reacted",
-    ]
-    for field in fields:
-        for i in range(24):
-            sum_ac += heatmap[field][i]
-    return sum_ac
-
-
-def get_bot_id(
-    db_mongo_client: MongoClient,
-    guildId: str,
-    collection_name: str = "guildmembers",
-    id_field_name: str = "discordId",
-) -> list[str]:
+    actions = np.array([np.asarray(heatmap[field])[:24] for field in ACTION_FIELDS])
+    return int(actions.sum())
+
+
+def get_rows_number_of_actions(activities: dict[str, np.ndarray]) -> np.ndarray:
     """
-    get the bot id from guildmembers collection
+    get the number of actions of each row of the hourly activities
 
     Parameters:
     ------------
-    db_mongo_client : MongoClient
-        the access to database
-    guildId : str
-        the guildId to connect to
-    collection_name : str
-        the collection name to use
-        default is "guildmembers"
-    id_field_name : str
-        the fieldId that the account id is saved
-        default is "discordId"
+    activities : dict[str, np.ndarray]
+        the hourly activities with the shape of (rows, 24)
+        the keys should contain the `ACTION_FIELDS`
 
     Returns:
-    ---------
-    bots : list[str]
-        the list of bot ids
+    ----------
+    actions_count : np.ndarray
+        the number of actions per row, with the shape of (rows,)
     """
-    cursor = db_mongo_client[guildId][collection_name].find(
-        {"isBot": True}, {"_id": 0, id_field_name: 1}
+    actions = np.stack(
+        [np.asarray(activities[field]).reshape(-1, 24) for field in ACTION_FIELDS]
     )
-    bots = list(cursor)
-
-    bot_ids = []
-    if bots != []:
-        bot_ids = list(map(lambda x: x[id_field_name], bots))
+    return actions.sum(axis=(0, 2), dtype=np.int64)
 
-    return bot_ids
 
-
-def get_userids(
-    db_mongo_client: MongoClient,
-    guildId: str,
-    collection_name: str = "guildmembers",
-    id_field_name: str = "discordId",
-) -> list[str]:
+def get_heatmaps_workers() -> int:
     """
-    get user ids that are not bot
-
-    Parameters:
-    ------------
-    db_mongo_client : MongoClient
-        the access to database
-    guildId : str
-        the guildId to connect to
-    collection_name : str
-        the collection name to use
-        default is "guildmembers"
-    id_field_name : str
-        the fieldId that the account id is saved
-        default is "discordId"
+    get the number of worker processes to compute the heatmaps with
+    from the `HEATMAPS_WORKERS` environment variable
 
     Returns:
     ---------
-    user_ids : list[str]
-        the list of bot ids
+    workers : int
+        the number of worker processes
+        default is 1, meaning the heatmaps are computed in the main process
     """
-    cursor = db_mongo_client[guildId][collection_name].find(
-        {"isBot": False}, {"_id": 0, id_field_name: 1}
-    )
-    users = list(cursor)
-    user_ids = list(map(lambda user: user[id_field_name], users))
-
-    return user_ids
+    workers = os.getenv("HEATMAPS_WORKERS", "")
+    if workers == "":
+        return 1
+
+    try:
+        return max(int(workers), 1)
+    except ValueError:
+        logging.warning(
+            f"Invalid HEATMAPS_WORKERS value: {workers}, using 1 worker instead!"
+        )
+        return 1
@@ -1,5 +1,3 @@
-import logging
-
 from dateutil import parser
 from discord_analyzer.DB_operations.mongo_neo4j_ops import MongoNeo4jDB
 
@@ -38,33 +36,6 @@ class MemberActivityUtils:
         ].find_one({"metadata.id": guild})
         return result
 
-    # get all user accounts during date_range in guild from rawinfo data
-    def get_all_users(
-        self,
-        guildId: str,
-    ) -> list[str]:
-        # check guild is exist
-
-        client = self.DB_connection.mongoOps.mongo_db_access.db_mongo_client
-
-        if guildId not in client.list_database_names():
-            logging.error(f"Database {guildId} doesn't exist")
-            logging.error(f"Existing databases: {client.list_database_names()}")
-            logging.info("Continuing")
-            return []
-
-        cursor = client[guildId]["guildmembers"].find(
-            {
-                "isBot": {"$ne": True},
-            },
-            {"discordId": 1, "_id": 0},
-        )
-
-        users_data = list(cursor)
-        all_users = list(map(lambda x: x["discordId"], users_data))
-
-        return all_users
-
     def parse_reaction(self, s):
         result = []
         for subitem in s:
@@ -7,6 +7,10 @@ from discord_analyzer.analysis.neo4j_analysis.local_clustering_coefficient impor
     LocalClusteringCoeff,
 )
 from discord_analyzer.analysis.neo4j_analysis.louvain import Louvain
+from discord_analyzer.analysis.neo4j_utils.projection_utils import (
+    GuildProjection,
+    ProjectionUtils,
+)
 from tc_neo4j_lib.neo4j_ops import Neo4jOps
 
 
@@ -35,10 +39,15 @@ class Neo4JAnalytics:
         # if from_start:
         #     self._remove_analytics_interacted_in(guildId)
 
-        self.compute_louvain_algorithm(guildId, from_start)
+        # the louvain and node stats share the `NATURAL` guild projection
+        # which is dropped before the other metrics
+        projection_utils = ProjectionUtils(guildId=guildId)
+        with GuildProjection(projection_utils, guildId) as projection:
+            self.compute_louvain_algorithm(guildId, from_start, projection)
+            self.compute_node_stats(guildId, from_start, projection)
+
         self.compute_local_clustering_coefficient(guildId, from_start)
         self.compute_network_decentrality(guildId, from_start)
-        self.compute_node_stats(guildId, from_start)
 
     def compute_local_clustering_coefficient(
         self,
@@ -126,19 +135,26 @@ class Neo4JAnalytics:
                 f"{msg} Exception occured in computing Network decentrality, {exp}!"
             )
 
-    def compute_node_stats(self, guildId: str, from_start: bool):
+    def compute_node_stats(
+        self,
+        guildId: str,
+        from_start: bool,
+        projection: GuildProjection | None = None,
+    ):
         """
         compute node stats
         each DiscordAccount node could be either
         - "0": meaning Sender
         - "1": Receiver
         - "2": Balanced
+
+        the `NATURAL` guild `projection` could be given to be shared
         """
         msg = f"GUILDID: {guildId}:"
         try:
             logging.info(f"{msg}: computing node stats")
             node_stats = NodeStats(threshold=2)
-            node_stats.compute_stats(guildId, from_start)
+            node_stats.compute_stats(guildId, from_start, projection)
         except Exception as exp:
             logging.error(f"{msg} Exception occured in node stats computation, {exp}")
 
@@ -159,7 +175,12 @@ class Neo4JAnalytics:
             """
             session.run(query=query, guildId=guildId)
 
-    def compute_louvain_algorithm(self, guild_id: str, from_start: bool) -> None:
+    def compute_louvain_algorithm(
+        self,
+        guild_id: str,
+        from_start: bool,
+        projection: GuildProjection | None = None,
+    ) -> None:
         """
         compute the louvain algorithm and save the results within the db
 
@@ -169,7 +190,10 @@ class Neo4JAnalytics:
             the guild string that the algorithm would be computed on
         from_start : bool
             compute from the start of the data available or continue the previous
+        projection : GuildProjection | None
+            the `NATURAL` guild projection shared with other computations
+            default is None, meaning to project the guild graph for louvain
         """
         louvain = Louvain()
 
-        louvain.compute(guild_id, from_start)
+        louvain.compute(guild_id, from_start, projection)
@@ -1,4 +1,6 @@
 from discord_analyzer.DB_operations.mongo_neo4j_ops import MongoNeo4jDB
+from discord_analyzer.DB_operations.mongodb_interaction import get_mongo_write_options
+from discord_analyzer.DB_operations.neo4j_schema import ensure_neo4j_schema
 
 
 class AnalyzerDBManager:
@@ -37,4 +39,6 @@ class AnalyzerDBManager:
             mongo_pass=self.mongo_pass,
             mongo_host=self.mongo_host,
             mongo_port=self.mongo_port,
+            **get_mongo_write_options(),
         )
+        ensure_neo4j_schema(self.DB_connections.neo4j_ops)
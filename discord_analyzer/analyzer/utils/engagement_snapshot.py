@@ -0,0 +1,127 @@
+import zlib
+from typing import Any
+
+import numpy as np
+from discord_analyzer.analysis.utils.account_index import AccountIndex
+
+# the name of the snapshot in the analyzer states
+ENGAGEMENT_SNAPSHOT_STATE = "memberactivities"
+# the version of the snapshot schema
+# the snapshots of other versions are not loaded
+ENGAGEMENT_SNAPSHOT_VERSION = 1
+# the length saved for an activity that a record doesn't have
+MISSING_ACTIVITY = -1
+
+
+def encode_engagement_snapshot(
+    records: list[dict[str, Any]], since: str
+) -> dict[str, Any]:
+    """
+    encode the latest memberactivities documents into a compact snapshot
+    the account names are interned once and the accounts of each
+    activity are saved as compressed int32 ids
+
+    Parameters:
+    ------------
+    records : list[dict[str, Any]]
+        the memberactivities documents from the `since` date, sorted by date
+        each has a `date` and the account lists of the activities
+    since : str
+        the date (in isoformat) that the snapshot has the documents from
+        the snapshot can't be used for the runs needing the documents before it
+
+    Returns:
+    ---------
+    snapshot : dict[str, Any]
+        the snapshot to save in the analyzer states
+    """
+    # the activities of all records, as a record may not have all of them
+    activities = list(
+        dict.fromkeys(key for record in records for key in record if key != "date")
+    )
+
+    account_index = AccountIndex()
+    lengths = []
+    account_ids = []
+    for record in records:
+        for activity in activities:
+            if activity not in record:
+                lengths.append(MISSING_ACTIVITY)
+                continue
+            ids = account_index.get_ids(record[activity])
+            lengths.append(len(ids))
+            account_ids.append(ids)
+
+    snapshot = {
+        "version": ENGAGEMENT_SNAPSHOT_VERSION,
+        "since": since,
+        "lastDate": records[-1]["date"] if records else None,
+        "dates": [record["date"] for record in records],
+        "activities": activities,
+        "accounts": account_index.names,
+        "lengths": zlib.compress(np.array(lengths, dtype=np.int32).tobytes()),
+        "ids": zlib.compress(
+            np.concatenate(account_ids).astype(np.int32).tobytes()
+            if account_ids
+            else b""
+        ),
+    }
+    return snapshot
+
+
+def decode_engagement_snapshot(
+    snapshot: dict[str, Any] | None, last_date: str | None, since: str
+) -> list[dict[str, Any]] | None:
+    """
+    decode the snapshot back into the memberactivities documents
+    if it was valid for the current memberactivities
+
+    Parameters:
+    ------------
+    snapshot : dict[str, Any] | None
+        the saved snapshot, see `encode_engagement_snapshot`
+    last_date : str | None
+        the date (in isoformat) of the latest memberactivities document
+        the snapshot is valid just if it was saved with the same latest document
+    since : str
+        the date (in isoformat) that the documents are needed from
+
+    Returns:
+    ---------
+    records : list[dict[str, Any]] | None
+        the memberactivities documents of the snapshot
+        None if the snapshot wasn't available or valid
+    """
+    if (
+        snapshot is None
+        or snapshot.get("version") != ENGAGEMENT_SNAPSHOT_VERSION
+        or snapshot["lastDate"] is None
+        or snapshot["lastDate"] != last_date
+        or snapshot["since"] > since
+    ):
+        return None
+
+    activities = snapshot["activities"]
+    accounts = snapshot["accounts"]
+    lengths = np.frombuffer(zlib.decompress(snapshot["lengths"]), dtype=np.int32)
+    account_ids = np.frombuffer(zlib.decompress(snapshot["ids"]), dtype=np.int32)
+    offsets = np.concatenate(([0], np.cumsum(np.maximum(lengths, 0)))).tolist()
+    missing = (lengths == MISSING_ACTIVITY).tolist()
+    account_ids = account_ids.tolist()
+
+    records = []
+    idx = 0
+    for date in snapshot["dates"]:
+        record = {"date": date}
+        for activity in activities:
+            if missing[idx]:
+                idx += 1
+                continue
+            record[activity] = [
+                accounts[account_id]
+                for account_id in account_ids[offsets[idx] : offsets[idx + 1]]
+            ]
+            idx += 1
+        records.append(record)
+
+    return records
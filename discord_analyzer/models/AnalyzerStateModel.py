@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+from datetime import datetime
+from typing import Any
+
+from discord_analyzer.models.BaseModel import BaseModel
+from pymongo.database import Database
+
+
+class AnalyzerStateModel(BaseModel):
+    """
+    the states the analyzer keeps between its runs for a guild
+    each state is a document identified with its `name`
+    """
+
+    def __init__(self, database: Database):
+        super().__init__(collection_name="analyzerstates", database=database)
+
+    def get_state(self, name: str) -> dict[str, Any] | None:
+        """
+        get the saved state with the given name
+
+        Parameters:
+        ------------
+        name : str
+            the name of the state
+
+        Returns:
+        ---------
+        state : dict[str, Any] | None
+            the saved state, None if it was never saved
+        """
+        document = self.database[self.collection_name].find_one(
+            {"name": name}, projection={"_id": 0, "name": 0, "updatedAt": 0}
+        )
+        return document
+
+    def save_state(self, name: str, state: dict[str, Any]) -> None:
+        """
+        save (replace) the state with the given name
+
+        Parameters:
+        ------------
+        name : str
+            the name of the state
+        state : dict[str, Any]
+            the state values to save
+        """
+        document = {**state, "name": name, "updatedAt": datetime.now()}
+        self.database[self.collection_name].replace_one(
+            {"name": name}, document, upsert=True
+        )
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 import logging
+from typing import Any
 
+from pymongo import DeleteMany, InsertOne
 from pymongo.database import Database
 
+# the indexes created within this process, by their database, collection and keys
+_CREATED_INDEXES: set[tuple[str, str, tuple]] = set()
+
 
 class BaseModel:
     """
@@ -78,6 +83,66 @@ class BaseModel:
         self.collection = self.database[self.collection_name]
         self.exists = True
 
+    def create_index_once(self, keys: list[tuple[str, int]]) -> None:
+        """
+        create an index on the collection if it wasn't created within this process
+        so the index isn't requested again for every write
+        """
+        index = (self.database.name, self.collection_name, tuple(keys))
+        if index not in _CREATED_INDEXES:
+            self.database[self.collection_name].create_index(keys)
+            _CREATED_INDEXES.add(index)
+
+    def replace_groups(
+        self,
+        documents: list[dict[str, Any]],
+        groups: list[tuple],
+        fields: list[str],
+        batch_size: int = 1000,
+    ) -> None:
+        """
+        replace the documents of the given groups, a group being the documents
+        with the same values for the `fields`
+        the removal of a group and the insertion of its documents
+        are always sent in the same batch
+
+        Parameters:
+        ------------
+        documents : list[dict[str, Any]]
+            the new documents of the groups
+        groups : list[tuple]
+            the values of the `fields` for each group to remove
+            before inserting its new documents
+        fields : list[str]
+            the fields that the documents are grouped by
+        batch_size : int
+            the count of the operations sent to database at once
+            a group is not split, so a batch can be bigger with a large group
+            default is 1000
+        """
+        collection = self.database[self.collection_name]
+
+        group_documents: dict[tuple, list[dict[str, Any]]] = {
+            tuple(group): [] for group in groups
+        }
+        for document in documents:
+            key = tuple(document[field] for field in fields)
+            group_documents.setdefault(key, []).append(document)
+
+        removed_groups = set(map(tuple, groups))
+        operations: list[DeleteMany | InsertOne] = []
+        for group, new_documents in group_documents.items():
+            if group in removed_groups:
+                operations.append(DeleteMany(dict(zip(fields, group))))
+            operations.extend(InsertOne(document) for document in new_documents)
+
+            if len(operations) >= batch_size:
+                collection.bulk_write(operations, ordered=True)
+                operations = []
+
+        if operations:
+            collection.bulk_write(operations, ordered=True)
+
     def get_one(self):
         """
         Gets one documents from the database,
@@ -2,9 +2,14 @@
 from datetime import datetime
 
 from discord_analyzer.models.BaseModel import BaseModel
-from pymongo import DESCENDING
+from pymongo import ASCENDING, DESCENDING
+from pymongo.cursor import Cursor
 from pymongo.database import Database
 
+# the name of the analyzer state keeping the last date of the heatmaps
+# written completely, the next heatmaps are computed from the day after it
+HEATMAPS_DAYS_STATE = "heatmapsdays"
+
 
 class HeatMapModel(BaseModel):
     def __init__(self, database: Database):
@@ -52,6 +57,30 @@ class HeatMapModel(BaseModel):
 
         return data
 
+    def get_documents_after(self, date: str | None = None) -> Cursor:
+        """
+        get the documents after a date, sorted by their date
+
+        Parameters:
+        ------------
+        date : str | None
+            the date to get the documents after (exclusive),
+            in format of `%Y-%m-%d`
+            default is None, meaning all documents
+
+        Returns:
+        ---------
+        cursor : Cursor
+            the cursor of the documents without their `_id`
+        """
+        query = {} if date is None else {"date": {"$gt": date}}
+        cursor = (
+            self.database[self.collection_name]
+            .find(query, {"_id": 0})
+            .sort([("date", ASCENDING)])
+        )
+        return cursor
+
     def remove_all_data(self):
         """
         Removes all data whithing the collection
@@ -71,3 +100,35 @@ class HeatMapModel(BaseModel):
         except Exception as e:
             print(e)
             return False
+
+    def replace_day_channels(
+        self,
+        heatmaps: list[dict],
+        day_channels: list[tuple[str, str]],
+        batch_size: int = 1000,
+    ) -> None:
+        """
+        replace the heatmaps of the given days and channels
+        all the documents of a day and channel are removed before inserting
+        its new documents, so no duplicate of an account is left
+
+        Parameters:
+        ------------
+        heatmaps : list[dict]
+            the recomputed heatmap documents of the days and channels
+        day_channels : list[tuple[str, str]]
+            the `date` and `channelId` of the recomputed heatmaps
+        batch_size : int
+            the count of the operations sent to database at once
+            the removal and insertion of a day and channel are in the same batch
+            default is 1000
+        """
+        self.create_index_once(
+            [("date", ASCENDING), ("channelId", ASCENDING), ("account_name", ASCENDING)]
+        )
+        self.replace_groups(
+            heatmaps,
+            groups=day_channels,
+            fields=["date", "channelId"],
+            batch_size=batch_size,
+        )
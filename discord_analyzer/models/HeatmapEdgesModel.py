@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+from typing import Any
+
+from discord_analyzer.models.BaseModel import BaseModel
+from pymongo import ASCENDING
+from pymongo.database import Database
+
+
+class HeatmapEdgesModel(BaseModel):
+    """
+    the daily edge lists of the heatmaps, one document per date and channel
+    see `discord_analyzer.analysis.utils.heatmap_edges.build_heatmap_edges`
+    """
+
+    def __init__(self, database: Database):
+        super().__init__(collection_name="heatmapedges", database=database)
+
+    def replace_day_channels(
+        self,
+        edges: list[dict[str, Any]],
+        day_channels: list[tuple[str, str]],
+        batch_size: int = 1000,
+    ) -> None:
+        """
+        replace the edge lists of the given days and channels
+
+        Parameters:
+        ------------
+        edges : list[dict[str, Any]]
+            the new edge list documents
+        day_channels : list[tuple[str, str]]
+            the `date` and `channelId` of the edge lists to remove
+            before inserting the new ones
+        batch_size : int
+            the count of the operations sent to database at once
+            the removal and insertion of a day and channel are in the same batch
+            default is 1000
+        """
+        self.create_index_once([("date", ASCENDING), ("channelId", ASCENDING)])
+        self.replace_groups(
+            edges,
+            groups=day_channels,
+            fields=["date", "channelId"],
+            batch_size=batch_size,
+        )
+
+    def remove_all_data(self):
+        """
+        Removes all data whithing the collection
+
+        Returns:
+        -----------
+        state : bool
+            if True, the data whithin collection is successfully deleted
+            if False, an exception is happened
+        """
+        try:
+            self.database[self.collection_name].delete_many({})
+            return True
+        except Exception as e:
+            print(e)
+            return False
@@ -31,6 +31,27 @@ class MemberActivityModel(BaseModel):
             print(e)
             return None
 
+    def get_records_since(self, date: datetime) -> list[dict]:
+        """
+        get the documents from the given date, sorted by date
+
+        Parameters:
+        ------------
+        date : datetime
+            the date to get the documents from (inclusive)
+
+        Returns:
+        ---------
+        records : list[dict]
+            the documents without their `_id`
+        """
+        cursor = (
+            self.database[self.collection_name]
+            .find({"date": {"$gte": date.isoformat()}}, {"_id": 0})
+            .sort([("date", pymongo.ASCENDING)])
+        )
+        return list(cursor)
+
     def remove_all_data(self):
         """
         Removes all data whithing the collection
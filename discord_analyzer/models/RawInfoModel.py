@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 import logging
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Iterator
 
 from discord_analyzer.models.BaseModel import BaseModel
-from pymongo import ASCENDING
+from pymongo import ASCENDING, DESCENDING
 from pymongo.database import Database
 
 
@@ -56,3 +56,224 @@ class RawInfoModel(BaseModel):
             }
         )
         return list(entries)
+
+    def get_entries_per_day(
+        self,
+        start_day: datetime,
+        end_day: datetime,
+        msg: str = "",
+        fields: list[str] | None = None,
+        exclude_authors: list[str] | set[str] | None = None,
+        channels: list[str] | None = None,
+    ) -> Iterator[tuple[datetime, list[dict[str, Any]]]]:
+        """
+        Gets the entries of all days from `start_day` to `end_day` (inclusive)
+        using one sorted query, and yields them grouped per day.
+        The days without any entry are skipped.
+        This is RawInfo specific method
+
+        `msg` parameter is for additional info to be logged
+        `fields` are the only fields to fetch (all fields if None)
+        `exclude_authors` are the authors whose entries are not fetched
+        `channels` are the only channelIds to fetch (all channels if None)
+
+        Note: the entries of each day are the same as `get_day_entries`,
+        so an entry created exactly at midnight is included in both days
+        """
+        guild_msg = f"GUILDID: {self.database.name}:{msg}"
+
+        first_day = start_day.replace(hour=0, minute=0, second=0, microsecond=0)
+        last_day = end_day.replace(hour=0, minute=0, second=0, microsecond=0)
+        if last_day < first_day:
+            return
+
+        logg_msg = f"{guild_msg} Fetching documents |"
+        logg_msg += f" {self.collection_name}: {first_day} -> "
+        logg_msg += f"{last_day + timedelta(days=1)}"
+        logging.info(logg_msg)
+
+        query: list[dict[str, Any]] = [
+            {
+                "createdDate": {
+                    "$gte": first_day,
+                    "$lte": last_day + timedelta(days=1),
+                }
+            },
+            {"isGeneratedByWebhook": False},
+        ]
+        if exclude_authors:
+            query.append({"author": {"$nin": list(exclude_authors)}})
+        if channels is not None:
+            query.append({"channelId": {"$in": list(channels)}})
+
+        projection = None
+        if fields is not None:
+            projection = {field: 1 for field in fields}
+            projection["_id"] = 0
+            # needed for grouping the entries per day
+            projection["createdDate"] = 1
+
+        cursor = (
+            self.database[self.collection_name]
+            .find({"$and": query}, projection=projection)
+            .sort("createdDate", ASCENDING)
+        )
+
+        # the days that can still get entries, in order
+        day_entries: dict[datetime, list[dict[str, Any]]] = {}
+        for entry in cursor:
+            created_date = entry["createdDate"]
+            entry_day = created_date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+            entry_days = []
+            # the day ranges include both ends
+            if created_date == entry_day and entry_day > first_day:
+                entry_days.append(entry_day - timedelta(days=1))
+            if entry_day <= last_day:
+                entry_days.append(entry_day)
+
+            # the entries are sorted, so the days before are complete
+            for day in list(day_entries.keys()):
+                if day < entry_days[0]:
+                    yield day, day_entries.pop(day)
+
+            for day in entry_days:
+                day_entries.setdefault(day, []).append(entry)
+
+        for day, entries in day_entries.items():
+            yield day, entries
+
+    def get_columns_per_day(
+        self,
+        start_day: datetime,
+        end_day: datetime,
+        fields: dict[str, Any],
+        msg: str = "",
+        exclude_authors: list[str] | set[str] | None = None,
+        channels: list[str] | None = None,
+    ) -> Iterator[tuple[datetime, dict[str, list]]]:
+        """
+        Same as `get_entries_per_day` but just the given fields are fetched
+        and the entries of each day are yielded as columns
+        This is RawInfo specific method
+
+        `fields` keys are the fields to fetch and the values are
+        the value to use if a field is missing in an entry
+        """
+        days_entries = self.get_entries_per_day(
+            start_day,
+            end_day,
+            msg,
+            fields=list(fields.keys()),
+            exclude_authors=exclude_authors,
+            channels=channels,
+        )
+        for day, entries in days_entries:
+            yield day, self.entries_to_columns(entries, fields)
+
+    @staticmethod
+    def entries_to_columns(
+        entries: list[dict[str, Any]], fields: dict[str, Any]
+    ) -> dict[str, list]:
+        """
+        convert the entries into columns of the given fields
+
+        `fields` keys are the fields to convert and the values are
+        the value to use if a field is missing in an entry
+        """
+        columns = {
+            field: [entry.get(field, missing) for entry in entries]
+            for field, missing in fields.items()
+        }
+        return columns
+
+    def get_high_water_mark(self) -> dict[str, Any] | None:
+        """
+        Gets the marks of the last inserted entry (`_id`)
+        and the last updated entry (`updatedAt`, None if no entry has it)
+        This is RawInfo specific method
+
+        returns None if there was no entry
+        """
+        collection = self.database[self.collection_name]
+
+        last_inserted = collection.find_one(
+            {}, projection={"_id": 1}, sort=[("_id", DESCENDING)]
+        )
+        if last_inserted is None:
+            return None
+
+        last_updated = collection.find_one(
+            {"updatedAt": {"$exists": True}},
+            projection={"updatedAt": 1},
+            sort=[("updatedAt", DESCENDING)],
+        )
+
+        return {
+            "last_id": last_inserted["_id"],
+            "last_updated_at": (
+                last_updated["updatedAt"] if last_updated is not None else None
+            ),
+        }
+
+    def get_changed_days(
+        self,
+        since: dict[str, Any],
+        until: dict[str, Any],
+        first_day: datetime,
+        last_day: datetime,
+    ) -> dict[datetime, set[str]]:
+        """
+        Gets the days and channels of the entries inserted or updated
+        after the `since` mark and up to the `until` mark
+        (the marks are the ones returned by `get_high_water_mark`)
+        This is RawInfo specific method
+
+        Just the days from `first_day` to `last_day` (inclusive)
+        are considered, and the returned keys are the days at midnight
+        an entry created exactly at midnight changes the day before it too,
+        as the entries of a day are fetched up to the next midnight
+        (see `get_entries_per_day`)
+        """
+        first_day = first_day.replace(hour=0, minute=0, second=0, microsecond=0)
+        last_day = last_day.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        changed_query: list[dict[str, Any]] = [
+            {"_id": {"$gt": since["last_id"], "$lte": until["last_id"]}}
+        ]
+        if until["last_updated_at"] is not None:
+            updated_range = {"$lte": until["last_updated_at"]}
+            if since["last_updated_at"] is not None:
+                updated_range["$gt"] = since["last_updated_at"]
+            changed_query.append({"updatedAt": updated_range})
+
+        cursor = self.database[self.collection_name].find(
+            {
+                "$and": [
+                    {"$or": changed_query},
+                    {
+                        "createdDate": {
+                            "$gte": first_day,
+                            "$lte": last_day + timedelta(days=1),
+                        }
+                    },
+                    {"isGeneratedByWebhook": False},
+                ]
+            },
+            projection={"_id": 0, "createdDate": 1, "channelId": 1},
+        )
+
+        changed_days: dict[datetime, set[str]] = {}
+        for entry in cursor:
+            day = entry["createdDate"].replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+            days = [day]
+            if entry["createdDate"] == day:
+                days.append(day - timedelta(days=1))
+
+            for changed_day in days:
+                if first_day <= changed_day <= last_day:
+                    changed_days.setdefault(changed_day, set()).add(entry["channelId"])
+
+        return changed_days
@@ -5,6 +5,7 @@ from discord_analyzer.analyzer.analyzer_memberactivities import MemberActivities
 from discord_analyzer.analyzer.neo4j_analytics import Neo4JAnalytics
 from discord_analyzer.analyzer.utils.analyzer_db_manager import AnalyzerDBManager
 from discord_analyzer.analyzer.utils.guild import Guild
+from utils.guild_roster import GuildRoster
 
 
 class RnDaoAnalyzer(AnalyzerDBManager):
@@ -35,8 +36,11 @@ class RnDaoAnalyzer(AnalyzerDBManager):
 
         logging.info(f"Creating heatmaps for guild: {self.guild_id}")
 
-        heatmaps_analysis = Heatmaps(self.DB_connections, self.testing)
-        heatmaps_data = heatmaps_analysis.analysis_heatmap(self.guild_id)
+        # the guild members are loaded once for the whole run
+        roster = self._get_roster()
+        heatmaps_analysis = Heatmaps(self.DB_connections, self.testing, roster=roster)
+        # the heatmaps are streamed into the database while being computed
+        heatmaps_data = heatmaps_analysis.analysis_heatmap_stream(self.guild_id)
 
         # storing heatmaps since memberactivities use them
         analytics_data = {}
@@ -50,8 +54,12 @@ class RnDaoAnalyzer(AnalyzerDBManager):
             remove_memberactivities=False,
             remove_heatmaps=False,
         )
+        # the edge lists of the new heatmaps
+        heatmaps_analysis.update_heatmap_edges(self.guild_id)
+        # the past heatmaps affected by the late-arriving messages
+        heatmaps_analysis.update_changed_heatmaps(self.guild_id)
 
-        memberactivities_analysis = MemberActivities(self.DB_connections)
+        memberactivities_analysis = MemberActivities(self.DB_connections, roster=roster)
         (
             member_activities_data,
             member_acitivities_networkx_data,
@@ -102,10 +110,12 @@ class RnDaoAnalyzer(AnalyzerDBManager):
         # if not, will raise an error
         self.check_guild()
 
-        heatmaps_analysis = Heatmaps(self.DB_connections, self.testing)
+        # the guild members are loaded once for the whole run
+        roster = self._get_roster()
+        heatmaps_analysis = Heatmaps(self.DB_connections, self.testing, roster=roster)
 
         logging.info(f"Analyzing the Heatmaps data for guild: {self.guild_id}!")
-        heatmaps_data = heatmaps_analysis.analysis_heatmap(
+        heatmaps_data = heatmaps_analysis.analysis_heatmap_stream(
             guildId=self.guild_id, from_start=True
         )
 
@@ -121,10 +131,13 @@ class RnDaoAnalyzer(AnalyzerDBManager):
             remove_memberactivities=False,
             remove_heatmaps=True,
         )
+        heatmaps_analysis.update_heatmap_edges(self.guild_id, from_start=True)
+        # the heatmaps are up to date, just saving the rawinfos mark
+        heatmaps_analysis.update_changed_heatmaps(self.guild_id, from_start=True)
 
         # run the member_activity analyze
         logging.info(f"Analyzing the MemberActivities data for guild: {self.guild_id}!")
-        memberactivity_analysis = MemberActivities(self.DB_connections)
+        memberactivity_analysis = MemberActivities(self.DB_connections, roster=roster)
         (
             member_activities_data,
             member_acitivities_networkx_data,
@@ -153,6 +166,15 @@ class RnDaoAnalyzer(AnalyzerDBManager):
         self.neo4j_analytics.compute_metrics(guildId=self.guild_id, from_start=True)
         self.guild_object.update_isin_progress()
 
+    def _get_roster(self) -> GuildRoster:
+        """
+        get the members of the guild to share between the analytics of a run
+        """
+        return GuildRoster(
+            self.DB_connections.mongoOps.mongo_db_access.db_mongo_client,
+            self.guild_id,
+        )
+
     def check_guild(self):
         """
         check if the guild is available
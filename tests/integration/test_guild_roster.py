@@ -0,0 +1,92 @@
+from datetime import datetime
+
+from utils import guild_roster
+from utils.guild_roster import GuildRoster
+
+from .utils.analyzer_setup import launch_db_access
+
+
+def test_guild_roster_lookups_and_refresh():
+    guildId = "1234"
+    db_access = launch_db_access(guildId)
+    db_access.db_mongo_client[guildId].drop_collection("guildmembers")
+    # the index of the dropped collection is created again
+    guild_roster._INDEXED_GUILDS.discard(guildId)
+    collection = db_access.db_mongo_client[guildId]["guildmembers"]
+
+    collection.insert_many(
+        [
+            {
+                "discordId": "user1",
+                "isBot": False,
+                "joinedAt": datetime(2023, 1, 2),
+                "username": "user_1",
+                "nickname": None,
+                "globalName": "User 1",
+                "updatedAt": datetime(2023, 2, 1),
+            },
+            {
+                "discordId": "bot1",
+                "isBot": True,
+                "joinedAt": datetime(2023, 1, 1),
+                "username": "bot_1",
+                "updatedAt": datetime(2023, 2, 1),
+            },
+            {
+                "discordId": "user2",
+                "isBot": False,
+                "joinedAt": datetime(2023, 1, 5),
+                "username": "user_2",
+                "updatedAt": datetime(2023, 2, 1),
+            },
+            {
+                "discordId": "user3",
+                "joinedAt": datetime(2023, 1, 1),
+                "username": "user_3",
+                "updatedAt": datetime(2023, 2, 1),
+            },
+        ]
+    )
+
+    roster = GuildRoster(db_access.db_mongo_client, guildId)
+
+    assert roster.get_bot_ids() == ["bot1"]
+    assert roster.get_user_ids() == ["user1", "user2"]
+    assert roster.get_non_bot_ids() == ["user1", "user2", "user3"]
+    assert roster.get_latest_joined_users(count=1) == ["user2"]
+    assert roster.get_joined_accounts((datetime(2023, 1, 1), datetime(2023, 1, 2))) == [
+        {"joinedAt": datetime(2023, 1, 2), "discordId": "user1"},
+        {"joinedAt": datetime(2023, 1, 1), "discordId": "bot1"},
+        {"joinedAt": datetime(2023, 1, 1), "discordId": "user3"},
+    ]
+    # the latest `updatedAt` is read from its index
+    assert any(
+        index["key"] == [("updatedAt", -1)]
+        for index in collection.index_information().values()
+    )
+
+    # an updated and a new member
+    collection.update_one(
+        {"discordId": "user2"},
+        {"$set": {"isBot": True, "updatedAt": datetime(2023, 3, 1)}},
+    )
+    collection.insert_one(
+        {
+            "discordId": "user4",
+            "isBot": False,
+            "joinedAt": datetime(2023, 1, 10),
+            "username": "user_4",
+            "updatedAt": datetime(2023, 3, 1),
+        }
+    )
+    roster.refresh()
+
+    assert roster.get_bot_ids() == ["bot1", "user2"]
+    assert roster.get_user_ids() == ["user1", "user4"]
+    assert roster.get_latest_joined_users(count=1) == ["user4"]
+
+    # a removed member can't be seen by `updatedAt`
+    collection.delete_one({"discordId": "user1"})
+    roster.refresh()
+
+    assert roster.get_user_ids() == ["user4"]
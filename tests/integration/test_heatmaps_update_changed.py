@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from discord_analyzer.analyzer.analyzer_heatmaps import Heatmaps
+from discord_analyzer.analyzer.utils.analyzer_db_manager import AnalyzerDBManager
+from discord_analyzer.models.RawInfoModel import RawInfoModel
+from utils.credentials import get_mongo_credentials
+
+from .utils.analyzer_setup import launch_db_access
+from .utils.remove_and_setup_guild import setup_db_guild
+
+
+class TestHeatmapsUpdateChanged(TestCase):
+    def setUp(self) -> None:
+        self.guildId = "1234"
+        self.db_access = launch_db_access(self.guildId)
+        self.create_db_connections()
+
+        platform_id = "515151515151515151515151"
+        setup_db_guild(
+            self.db_access,
+            platform_id,
+            self.guildId,
+            discordId_list=["user0", "user1", "user2"],
+            days_ago_period=5,
+        )
+        self.db_access.db_mongo_client[self.guildId].create_collection("heatmaps")
+        self.db_access.db_mongo_client[self.guildId].create_collection(
+            "memberactivities"
+        )
+        self.day = (datetime.now() - timedelta(days=3)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+    def create_db_connections(self):
+        base_analyzer = AnalyzerDBManager()
+        mongo_creds = get_mongo_credentials()
+        base_analyzer.set_mongo_database_info(
+            mongo_db_user=mongo_creds["user"],
+            mongo_db_password=mongo_creds["password"],
+            mongo_db_host=mongo_creds["host"],
+            mongo_db_port=mongo_creds["port"],
+        )
+        base_analyzer.database_connect()
+        self.db_connections = base_analyzer.DB_connections
+
+    def create_rawinfo(self, author: str, message_id: str, hours: int) -> dict:
+        return {
+            "type": 0,
+            "author": author,
+            "content": "test_message",
+            "user_mentions": [],
+            "role_mentions": [],
+            "reactions": [],
+            "replied_user": None,
+            "createdDate": self.day + timedelta(hours=hours),
+            "messageId": message_id,
+            "channelId": "1020707129214111827",
+            "channelName": "general",
+            "threadId": None,
+            "threadName": None,
+            "isGeneratedByWebhook": False,
+        }
+
+    def heatmaps_analytics(self, heatmaps: Heatmaps):
+        heatmaps_data = heatmaps.analysis_heatmap(guildId=self.guildId)
+        analytics_data = {}
+        analytics_data["heatmaps"] = heatmaps_data
+        analytics_data["memberactivities"] = (None, None)
+        self.db_connections.store_analytics_data(
+            guild_id=self.guildId,
+            analytics_data=analytics_data,
+            community_id="123",
+            remove_memberactivities=False,
+            remove_heatmaps=False,
+        )
+
+    def test_late_message_and_updated_reaction(self):
+        rawinfo_c = self.db_access.db_mongo_client[self.guildId]["rawinfos"]
+        heatmaps_c = self.db_access.db_mongo_client[self.guildId]["heatmaps"]
+        rawinfo_c.insert_one(self.create_rawinfo("user0", "1", hours=2))
+
+        heatmaps = Heatmaps(DB_connections=self.db_connections, testing=False)
+        self.heatmaps_analytics(heatmaps)
+
+        # the first call just saves the mark
+        self.assertEqual(heatmaps.update_changed_heatmaps(self.guildId), 0)
+        self.assertEqual(heatmaps_c.count_documents({}), 1)
+
+        # a late-arriving message and a reaction added later
+        rawinfo_c.insert_one(self.create_rawinfo("user1", "2", hours=5))
+        rawinfo_c.update_one(
+            {"messageId": "1"},
+            {"$set": {"reactions": ["user2,👍"], "updatedAt": datetime.now()}},
+        )
+
+        updated_count = heatmaps.update_changed_heatmaps(self.guildId)
+        # user0 message, user1 message and user2 reaction
+        self.assertEqual(updated_count, 3)
+
+        date = self.day.strftime("%Y-%m-%d")
+        self.assertEqual(heatmaps_c.count_documents({}), 3)
+
+        user0_heatmap = heatmaps_c.find_one({"date": date, "account_name": "user0"})
+        self.assertEqual(sum(user0_heatmap["lone_messages"]), 1)
+        self.assertEqual(sum(user0_heatmap["reacted"]), 1)
+
+        user1_heatmap = heatmaps_c.find_one({"date": date, "account_name": "user1"})
+        self.assertEqual(sum(user1_heatmap["lone_messages"]), 1)
+
+        user2_heatmap = heatmaps_c.find_one({"date": date, "account_name": "user2"})
+        self.assertEqual(sum(user2_heatmap["reacter"]), 1)
+
+        # nothing changed since the last call
+        self.assertEqual(heatmaps.update_changed_heatmaps(self.guildId), 0)
+
+    def test_midnight_message_changes_day_before(self):
+        database = self.db_access.db_mongo_client[self.guildId]
+        database["rawinfos"].insert_one(self.create_rawinfo("user0", "1", hours=2))
+
+        rawinfo_c = RawInfoModel(database)
+        since = rawinfo_c.get_high_water_mark()
+
+        # a late message at the midnight after the day
+        # which is in the entries of the day too
+        database["rawinfos"].insert_one(self.create_rawinfo("user1", "2", hours=24))
+        until = rawinfo_c.get_high_water_mark()
+
+        next_day = self.day + timedelta(days=1)
+        changed_days = rawinfo_c.get_changed_days(
+            since, until, first_day=self.day, last_day=next_day
+        )
+        self.assertEqual(
+            changed_days,
+            {
+                self.day: {"1020707129214111827"},
+                next_day: {"1020707129214111827"},
+            },
+        )
+
+        # the next day is not computed yet
+        changed_days = rawinfo_c.get_changed_days(
+            since, until, first_day=self.day, last_day=self.day
+        )
+        self.assertEqual(changed_days, {self.day: {"1020707129214111827"}})
+
+    def test_streamed_days_not_updated(self):
+        rawinfo_c = self.db_access.db_mongo_client[self.guildId]["rawinfos"]
+        rawinfo_c.insert_one(self.create_rawinfo("user0", "1", hours=2))
+
+        heatmaps = Heatmaps(DB_connections=self.db_connections, testing=False)
+        # the mark is saved while there is no heatmap yet
+        self.assertEqual(heatmaps.update_changed_heatmaps(self.guildId), 0)
+
+        # a message after the mark, for the day computed in this run
+        rawinfo_c.insert_one(self.create_rawinfo("user1", "2", hours=5))
+        self.heatmaps_analytics(heatmaps)
+
+        # so it isn't computed again as a changed day
+        self.assertEqual(heatmaps.update_changed_heatmaps(self.guildId), 0)
@@ -1,8 +1,8 @@
 from datetime import datetime, timedelta
 
-from discord_analyzer.analyzer.memberactivity_utils import MemberActivityUtils
+from utils.guild_roster import GuildRoster
 
-from .utils.analyzer_setup import launch_db_access, setup_analyzer
+from .utils.analyzer_setup import launch_db_access
 from .utils.remove_and_setup_guild import setup_db_guild
 
 
@@ -14,7 +14,6 @@ def test_utils_get_members():
     setup_db_guild(
         db_access, platform_id, guildId, discordId_list=users, days_ago_period=7
     )
-    analyzer = setup_analyzer(guildId)
 
     setup_db_guild(db_access, platform_id, guildId, discordId_list=users)
 
@@ -43,9 +42,9 @@ def test_utils_get_members():
     db_access.db_mongo_client[guildId].create_collection("heatmaps")
     db_access.db_mongo_client[guildId].create_collection("memberactivities")
 
-    memberactivities_utils = MemberActivityUtils(analyzer.DB_connections)
+    roster = GuildRoster(db_access.db_mongo_client, guildId)
 
-    database_users = memberactivities_utils.get_all_users(guildId=guildId)
+    database_users = roster.get_non_bot_ids()
 
     print(f"database_users: {database_users}")
     assert database_users == users
@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+from discord_analyzer.DB_operations.mongodb_interaction import MongoDBOps
+from utils.credentials import get_mongo_credentials
+
+
+class TestMongoDBStagingRecompute(TestCase):
+    def setUp(self) -> None:
+        self.guildId = "1234"
+        mongo_creds = get_mongo_credentials()
+        self.mongo_ops = MongoDBOps(
+            user=mongo_creds["user"],
+            password=mongo_creds["password"],
+            host=mongo_creds["host"],
+            port=mongo_creds["port"],
+            batch_size=3,
+            staging_recompute=True,
+        )
+        self.mongo_ops.set_mongo_db_access()
+        self.client = self.mongo_ops.mongo_db_access.db_mongo_client
+        self.client.drop_database(self.guildId)
+
+    def test_replace_heatmaps(self):
+        self.client[self.guildId]["heatmaps"].insert_many(
+            [{"account_name": "old", "date": "2023-01-01"} for _ in range(5)]
+        )
+        heatmaps = [
+            {"account_name": f"user{i}", "date": "2023-01-02"} for i in range(7)
+        ]
+
+        self.mongo_ops._do_analytics_write_transaction(
+            guildId=self.guildId,
+            delete_heatmaps=True,
+            delete_member_acitivities=False,
+            acitivties_list=None,
+            heatmaps_list=heatmaps,
+        )
+
+        collections = self.client[self.guildId].list_collection_names()
+        self.assertNotIn("heatmaps_staging", collections)
+
+        documents = list(self.client[self.guildId]["heatmaps"].find({}, {"_id": 0}))
+        self.assertEqual(len(documents), 7)
+        self.assertEqual(
+            sorted(doc["account_name"] for doc in documents),
+            [f"user{i}" for i in range(7)],
+        )
+
+    def test_replace_heatmaps_empty(self):
+        self.client[self.guildId]["heatmaps"].insert_one({"account_name": "old"})
+
+        self.mongo_ops._do_analytics_write_transaction(
+            guildId=self.guildId,
+            delete_heatmaps=True,
+            delete_member_acitivities=False,
+            acitivties_list=None,
+            heatmaps_list=[],
+        )
+
+        collections = self.client[self.guildId].list_collection_names()
+        self.assertIn("heatmaps", collections)
+        self.assertEqual(self.client[self.guildId]["heatmaps"].count_documents({}), 0)
@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+
+from discord_analyzer.models.RawInfoModel import RawInfoModel
+from utils.mongo import MongoSingleton
+
+
+def _create_rawinfo(message_id: str, created_date: datetime, webhook: bool = False):
+    return {
+        "type": 0,
+        "author": "user1",
+        "content": "test_message",
+        "user_mentions": [],
+        "role_mentions": [],
+        "reactions": [],
+        "replied_user": None,
+        "createdDate": created_date,
+        "messageId": message_id,
+        "channelId": "1115555666777889",
+        "channelName": "general",
+        "threadId": None,
+        "threadName": None,
+        "isGeneratedByWebhook": webhook,
+    }
+
+
+def test_rawinfo_get_entries_per_day_empty_data():
+    """
+    test rawinfo multi-day data fetching with no data available
+    """
+    guildId = "1234"
+
+    mongo_singleton = MongoSingleton.get_instance()
+    client = mongo_singleton.get_client()
+
+    client[guildId].drop_collection("rawinfos")
+
+    rawinfo_model = RawInfoModel(client[guildId])
+
+    today = datetime.now()
+    data = list(rawinfo_model.get_entries_per_day(today - timedelta(days=5), today))
+
+    assert data == []
+
+
+def test_rawinfo_get_entries_per_day_same_as_day_entries():
+    """
+    the multi-day fetching should give the same entries as `get_day_entries`
+    for each day with data available
+    """
+    guildId = "1234"
+
+    mongo_singleton = MongoSingleton.get_instance()
+    client = mongo_singleton.get_client()
+
+    client[guildId].drop_collection("rawinfos")
+
+    start_day = datetime(2023, 3, 1)
+
+    rawinfo_samples = [
+        _create_rawinfo("1", start_day + timedelta(hours=5)),
+        _create_rawinfo("2", start_day + timedelta(hours=6), webhook=True),
+        # exactly at midnight, would be in both first and second day
+        _create_rawinfo("3", start_day + timedelta(days=1)),
+        _create_rawinfo("4", start_day + timedelta(days=1, hours=10)),
+        # no data for the third day
+        _create_rawinfo("5", start_day + timedelta(days=3, hours=23)),
+        # after the end day
+        _create_rawinfo("6", start_day + timedelta(days=5, hours=1)),
+    ]
+    client[guildId]["rawinfos"].insert_many(rawinfo_samples)
+
+    rawinfo_model = RawInfoModel(client[guildId])
+
+    data = list(
+        rawinfo_model.get_entries_per_day(start_day, start_day + timedelta(days=4))
+    )
+
+    days = [day for day, _ in data]
+    assert days == [
+        start_day,
+        start_day + timedelta(days=1),
+        start_day + timedelta(days=3),
+    ]
+
+    for day, entries in data:
+        day_entries = rawinfo_model.get_day_entries(day)
+        assert [entry["messageId"] for entry in entries] == [
+            entry["messageId"] for entry in day_entries
+        ]
+
+    assert [entry["messageId"] for entry in data[0][1]] == ["1", "3"]
+    assert [entry["messageId"] for entry in data[1][1]] == ["3", "4"]
+    assert [entry["messageId"] for entry in data[2][1]] == ["5"]
+
+
+def test_rawinfo_get_columns_per_day_filtered():
+    """
+    the authors and channels should be filtered in the query
+    and just the given fields be returned as columns
+    """
+    guildId = "1234"
+
+    mongo_singleton = MongoSingleton.get_instance()
+    client = mongo_singleton.get_client()
+
+    client[guildId].drop_collection("rawinfos")
+
+    start_day = datetime(2023, 3, 1)
+
+    rawinfo_samples = [
+        _create_rawinfo("1", start_day + timedelta(hours=5)),
+        _create_rawinfo("2", start_day + timedelta(hours=6)),
+        _create_rawinfo("3", start_day + timedelta(days=1, hours=10)),
+        _create_rawinfo("4", start_day + timedelta(days=1, hours=11)),
+    ]
+    rawinfo_samples[1]["author"] = "bot1"
+    rawinfo_samples[2]["channelId"] = "1115555666777000"
+    del rawinfo_samples[3]["replied_user"]
+    client[guildId]["rawinfos"].insert_many(rawinfo_samples)
+
+    rawinfo_model = RawInfoModel(client[guildId])
+
+    data = list(
+        rawinfo_model.get_columns_per_day(
+            start_day,
+            start_day + timedelta(days=1),
+            fields={"messageId": None, "author": None, "replied_user": ""},
+            exclude_authors=["bot1"],
+            channels=["1115555666777889"],
+        )
+    )
+
+    assert data == [
+        (
+            start_day,
+            {"messageId": ["1"], "author": ["user1"], "replied_user": [None]},
+        ),
+        (
+            start_day + timedelta(days=1),
+            {"messageId": ["4"], "author": ["user1"], "replied_user": [""]},
+        ),
+    ]
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from discord_analyzer.analysis.utils.account_index import AccountIndex
+from discord_analyzer.analysis.utils.member_activity_utils import store_based_date
+
+
+def test_account_index_interning():
+    account_index = AccountIndex(["user1", "user2"])
+    account_ids = account_index.get_ids(["user2", "user3", "user1", "user3"])
+
+    assert account_ids.dtype.name == "int32"
+    assert account_ids.tolist() == [1, 2, 0, 2]
+    assert len(account_index) == 3
+    assert "user3" in account_index
+    assert account_index.get_names(account_ids) == ["user2", "user3", "user1", "user3"]
+    assert account_index.get_id_set(["user3", "user1", "user3"]).tolist() == [0, 2]
+
+
+def test_account_index_lookup():
+    account_index = AccountIndex(["user1", "user2", "user3"])
+    lookup = account_index.get_lookup(["user3", "user4", "user1", "user3"])
+
+    assert lookup.tolist() == [2, -1, 0]
+
+
+def test_store_based_date_joined_day():
+    joined_acc_dict = [
+        {"discordId": "user1", "joinedAt": datetime(2023, 1, 1, 10)},
+        {"discordId": "user2", "joinedAt": datetime(2023, 1, 2, 23, 59)},
+        {"discordId": "user3", "joinedAt": datetime(2023, 1, 2)},
+    ]
+    all_activities = {
+        "all_joined": {"0": set(), "1": set()},
+        "all_joined_day": {"0": set(), "1": set()},
+        "all_active": {"0": {"user1"}, "1": {"user1", "user2"}},
+    }
+    account_index = AccountIndex()
+
+    records = store_based_date(
+        start_date=datetime(2023, 1, 1),
+        all_activities=all_activities,
+        analytics_day_range=1,
+        joined_acc_dict=joined_acc_dict,
+        load_past=True,
+        account_index=account_index,
+    )
+
+    assert [record["date"] for record in records] == [
+        "2023-01-01T00:00:00",
+        "2023-01-02T00:00:00",
+    ]
+    assert records[0]["all_joined_day"] == ["user1"]
+    assert records[1]["all_joined_day"] == ["user2", "user3"]
+    assert sorted(records[1]["all_active"]) == ["user1", "user2"]
+    assert len(account_index) == 3
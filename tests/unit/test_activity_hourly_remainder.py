@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from discord_analyzer.analysis.activity_hourly import activity_hourly
+
+
+def test_unknown_accounts_counted_as_remainder():
+    acc_names = ["user1", "user2"]
+    prepared_list = [
+        {
+            "mess_type": 19,
+            "author": "user1",
+            "user_mentions": ["user3", "user2", "user1"],
+            "reactions": ["user2,user4,user1,👍"],
+            "replied_user": "user2",
+            "datetime": datetime(2023, 1, 1, 5),
+            "channel": "1020707129214111827",
+            "threadId": None,
+        },
+        {
+            "mess_type": 0,
+            "author": "user5",
+            "user_mentions": [],
+            "reactions": [],
+            "replied_user": None,
+            "datetime": datetime(2023, 1, 1, 6),
+            "channel": "1020707129214111827",
+            "threadId": "1020707129214111828",
+        },
+    ]
+
+    warning_count, heatmap_data = activity_hourly(prepared_list, acc_names=acc_names)
+
+    assert acc_names == ["user1", "user2", "remainder"]
+    # unknown author, self mention, self reaction,
+    # unknown reacter and unknown mentioned account
+    assert warning_count == [1, 0, 1, 1, 1, 1, 0]
+
+    assert len(heatmap_data) == 1
+    activity = heatmap_data[0]
+    assert activity["date"] == ["2023-01-01"]
+    assert activity["channel"] == ["1020707129214111827"]
+
+    assert activity["replier"][0][5] == 1
+    assert activity["replied"][1][5] == 1
+    assert activity["mentioner"][0][5] == 1
+    assert activity["mentioned"][2][5] == 1
+    assert activity["rep_mentioner"][0][5] == 1
+    assert activity["rep_mentioned"][1][5] == 1
+    assert activity["reacted"][0][5] == 2
+    assert activity["reacter"][1][5] == 1
+    assert activity["reacter"][2][5] == 1
+    assert activity["thr_messages"][2][6] == 1
+    assert sum(map(sum, activity["lone_messages"])) == 0
+
+    assert activity["reacted_per_acc"] == [["user2", "user4"], [], []]
+    assert activity["mentioner_per_acc"] == [["user3"], [], []]
+    assert activity["replied_per_acc"] == [[], ["user1"], []]
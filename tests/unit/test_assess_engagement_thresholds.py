@@ -0,0 +1,218 @@
+import os
+from unittest import TestCase
+
+import numpy as np
+from discord_analyzer.analysis.compute_interaction_matrix_discord import (
+    NO_SELF_INTERACTION_ACTIVITIES,
+)
+from discord_analyzer.analysis.utils.member_activity_utils import (
+    assess_engagement_thresholds,
+    compute_window_thresholds,
+    get_memberactivities_workers,
+    iter_windows_thresholds,
+    precomputed_thresholds,
+)
+from discord_analyzer.analysis.utils.window_graph import WindowGraph
+from tc_core_analyzer_lib import assess_engagement as assess_engagement_lib
+from tc_core_analyzer_lib.assess_engagement import EngagementAssessment
+from tc_core_analyzer_lib.utils.activity import DiscordActivity
+
+
+def get_interactions(int_mat: dict[str, np.ndarray]) -> dict[str, tuple]:
+    """
+    convert the interaction matrices into the compact interactions
+    """
+    interactions = {}
+    for activity, matrix in int_mat.items():
+        rows, columns = np.nonzero(matrix)
+        interactions[activity] = (rows, columns, matrix[rows, columns])
+    return interactions
+
+
+class FakeInteractionCache:
+    """
+    returns the interactions of the given interaction matrix of each window
+    """
+
+    def __init__(self, windows_int_mat: dict[str, dict[str, np.ndarray]]):
+        self.windows_int_mat = windows_int_mat
+        self.last_date = None
+
+    def slide(self, dates: list[str]) -> None:
+        self.last_date = dates[0]
+
+    def get_window_interactions(self, acc_names, activities):
+        return get_interactions(self.windows_int_mat[self.last_date])
+
+
+class TestAssessEngagementThresholds(TestCase):
+    def setUp(self) -> None:
+        self.activities_name = [
+            "all_joined",
+            "all_joined_day",
+            "all_consistent",
+            "all_vital",
+            "all_active",
+            "all_connected",
+            "all_paused",
+            "all_new_disengaged",
+            "all_disengaged",
+            "all_unpaused",
+            "all_returned",
+            "all_new_active",
+            "all_still_active",
+            "all_dropped",
+            "all_disengaged_were_newly_active",
+            "all_disengaged_were_consistently_active",
+            "all_disengaged_were_vital",
+            "all_lurker",
+            "all_about_to_disengage",
+            "all_disengaged_in_past",
+        ]
+        self.act_param = {
+            "INT_THR": 1,
+            "UW_DEG_THR": 1,
+            "PAUSED_T_THR": 1,
+            "CON_T_THR": 4,
+            "CON_O_THR": 3,
+            "EDGE_STR_THR": 5,
+            "UW_THR_DEG_THR": 5,
+            "VITAL_T_THR": 4,
+            "VITAL_O_THR": 3,
+            "STILL_T_THR": 2,
+            "STILL_O_THR": 2,
+            "DROP_H_THR": 2,
+            "DROP_I_THR": 1,
+        }
+        self.accounts = [f"user{i}" for i in range(6)]
+        self.period_size = 7
+
+    def _create_int_mat(self, rng: np.random.Generator) -> dict[str, np.ndarray]:
+        int_mat = {}
+        for activity in [
+            DiscordActivity.Mention,
+            DiscordActivity.Reply,
+            DiscordActivity.Reaction,
+            DiscordActivity.Lone_msg,
+            DiscordActivity.Thread_msg,
+        ]:
+            # making some accounts inactive in some windows
+            int_mat[activity] = rng.integers(0, 4, size=(6, 6)) * rng.integers(
+                0, 2, size=(6, 1)
+            )
+            # a person interacting to themselves is not counted as interaction
+            if activity in NO_SELF_INTERACTION_ACTIVITIES:
+                np.fill_diagonal(int_mat[activity], 0)
+        return int_mat
+
+    def test_same_as_engagement_assessment(self):
+        rng = np.random.default_rng(1)
+        assessment = EngagementAssessment(
+            activities=[
+                DiscordActivity.Mention,
+                DiscordActivity.Reply,
+                DiscordActivity.Reaction,
+                DiscordActivity.Lone_msg,
+                DiscordActivity.Thread_msg,
+            ],
+            activities_ignore_0_axis=[DiscordActivity.Mention],
+            activities_ignore_1_axis=[DiscordActivity.Reply, DiscordActivity.Reaction],
+        )
+        expected_dict = {name: {} for name in self.activities_name}
+        activity_dict = {name: {} for name in self.activities_name}
+
+        for w_i in range(10):
+            int_mat = self._create_int_mat(rng)
+            joined_day = {self.accounts[w_i % len(self.accounts)]}
+            expected_dict["all_joined_day"][str(w_i)] = set(joined_day)
+            activity_dict["all_joined_day"][str(w_i)] = set(joined_day)
+
+            expected_graph, *expected_values = assessment.compute(
+                int_mat=int_mat,
+                w_i=w_i,
+                acc_names=np.asarray(self.accounts),
+                act_param=self.act_param,
+                WINDOW_D=self.period_size,
+                **expected_dict,
+            )
+            expected_dict = dict(zip(self.activities_name, expected_values))
+
+            graph, activity_dict = assess_engagement_thresholds(
+                compute_window_thresholds(
+                    get_interactions(int_mat), self.accounts, self.act_param
+                ),
+                w_i=w_i,
+                accounts=self.accounts,
+                action_params=self.act_param,
+                period_size=self.period_size,
+                activities_name=self.activities_name,
+                activity_dict=activity_dict,
+            )
+
+            self.assertEqual(activity_dict, expected_dict)
+            self.assert_same_graph(
+                graph, WindowGraph.from_networkx(expected_graph, self.accounts)
+            )
+
+    def assert_same_graph(self, graph, expected_graph):
+        self.assertIsInstance(graph, WindowGraph)
+        self.assertEqual(graph.acc_names, expected_graph.acc_names)
+        self.assertEqual(graph.src.tolist(), expected_graph.src.tolist())
+        self.assertEqual(graph.dst.tolist(), expected_graph.dst.tolist())
+        self.assertEqual(graph.weight.tolist(), expected_graph.weight.tolist())
+
+    def test_iter_windows_thresholds_order(self):
+        rng = np.random.default_rng(2)
+        windows = []
+        windows_int_mat = {}
+        for w_i in range(7):
+            last_date = f"2023-01-{w_i + 10}"
+            windows.append((w_i, last_date, [last_date], self.accounts))
+            windows_int_mat[last_date] = self._create_int_mat(rng)
+
+        expected_windows = list(windows)
+        windows_thresholds = iter_windows_thresholds(
+            windows,
+            interaction_cache=FakeInteractionCache(windows_int_mat),
+            action_params=self.act_param,
+            workers=2,
+        )
+        for window, window_thresholds in windows_thresholds:
+            self.assertEqual(window, expected_windows.pop(0))
+            expected = compute_window_thresholds(
+                get_interactions(windows_int_mat[window[1]]),
+                self.accounts,
+                self.act_param,
+            )
+            for value, expected_value in zip(window_thresholds[:3], expected[:3]):
+                self.assertEqual(value.tolist(), expected_value.tolist())
+            self.assert_same_graph(window_thresholds[3], expected[3])
+        self.assertEqual(expected_windows, [])
+
+    def test_precomputed_thresholds_restored(self):
+        lib_thr_int = assess_engagement_lib.thr_int
+        thresholds = (np.array([0]), np.array([0]), np.array([]), None)
+
+        with self.assertRaises(ValueError):
+            with precomputed_thresholds(thresholds):
+                self.assertEqual(assess_engagement_lib.thr_int({}, 1, 1), thresholds)
+                raise ValueError("the assessment failed")
+
+        self.assertIs(assess_engagement_lib.thr_int, lib_thr_int)
+
+    def test_get_memberactivities_workers(self):
+        previous = os.environ.get("MEMBERACTIVITIES_WORKERS")
+        try:
+            os.environ["MEMBERACTIVITIES_WORKERS"] = "3"
+            self.assertEqual(get_memberactivities_workers(), 3)
+
+            os.environ["MEMBERACTIVITIES_WORKERS"] = "-1"
+            self.assertEqual(get_memberactivities_workers(), 1)
+
+            os.environ["MEMBERACTIVITIES_WORKERS"] = "some"
+            self.assertEqual(get_memberactivities_workers(), 1)
+        finally:
+            if previous is None:
+                os.environ.pop("MEMBERACTIVITIES_WORKERS", None)
+            else:
+                os.environ["MEMBERACTIVITIES_WORKERS"] = previous
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from discord_analyzer.analysis.activity_hourly import compute_day_activities
+from discord_analyzer.analyzer.analyzer_heatmaps import Heatmaps
+
+
+def test_rows_of_active_accounts_only():
+    acc_names = [f"user{i}" for i in range(1000)]
+    prepared_list = [
+        {
+            "mess_type": 19,
+            "author": "user10",
+            "user_mentions": ["user20"],
+            "reactions": ["user30,👍"],
+            "replied_user": "user40",
+            "datetime": datetime(2023, 1, 1, 5),
+            "channel": "1020707129214111827",
+            "threadId": None,
+        },
+    ]
+
+    _, day_activities = compute_day_activities(prepared_list, acc_names=acc_names)
+
+    assert len(day_activities) == 1
+    day_activity = day_activities[0]
+    assert day_activity.acc_rows.tolist() == [10, 20, 30, 40]
+    assert day_activity.replier.shape == (4, 24)
+    assert day_activity.replied_per_acc == [[], [], [], ["user10"]]
+
+    dense = day_activity.asdict()
+    assert len(dense["replier"]) == 1001
+    assert dense["replier"][10][5] == 1
+    assert dense["replied"][40][5] == 1
+    assert dense["mentioned"][20][5] == 1
+    assert dense["reacter"][30][5] == 1
+    assert dense["replied_per_acc"][40] == ["user10"]
+
+    heatmaps = Heatmaps("DB_connection", testing=False)
+    results = heatmaps._post_process_data(day_activities, len(acc_names))
+    assert [doc["account_name"] for doc in results] == [
+        "user10",
+        "user20",
+        "user30",
+        "user40",
+    ]
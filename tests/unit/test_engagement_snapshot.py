@@ -0,0 +1,99 @@
+from unittest import TestCase
+
+from discord_analyzer.analyzer.utils.engagement_snapshot import (
+    ENGAGEMENT_SNAPSHOT_VERSION,
+    decode_engagement_snapshot,
+    encode_engagement_snapshot,
+)
+
+
+class TestEngagementSnapshot(TestCase):
+    def setUp(self) -> None:
+        self.records = [
+            {
+                "date": "2023-01-01T00:00:00",
+                "all_active": ["user1", "user2"],
+                "all_joined_day": [],
+                "all_paused": ["user3"],
+            },
+            {
+                "date": "2023-01-02T00:00:00",
+                "all_active": ["user2"],
+                "all_joined_day": ["user4"],
+                "all_paused": ["user1", "user3"],
+            },
+        ]
+
+    def test_roundtrip(self):
+        snapshot = encode_engagement_snapshot(self.records, since="2023-01-01T00:00:00")
+
+        self.assertEqual(snapshot["version"], ENGAGEMENT_SNAPSHOT_VERSION)
+        self.assertEqual(snapshot["lastDate"], "2023-01-02T00:00:00")
+        self.assertEqual(len(snapshot["accounts"]), 4)
+
+        records = decode_engagement_snapshot(
+            snapshot, last_date="2023-01-02T00:00:00", since="2023-01-01T00:00:00"
+        )
+        self.assertEqual(records, self.records)
+
+    def test_heterogeneous_records(self):
+        # the activities added or removed between the records
+        self.records[0]["all_still_active"] = ["user1"]
+        del self.records[1]["all_paused"]
+        self.records.append(
+            {"date": "2023-01-03T00:00:00", "all_new_active": ["user5"]}
+        )
+        snapshot = encode_engagement_snapshot(self.records, since="2023-01-01T00:00:00")
+
+        self.assertEqual(
+            snapshot["activities"],
+            [
+                "all_active",
+                "all_joined_day",
+                "all_paused",
+                "all_still_active",
+                "all_new_active",
+            ],
+        )
+        records = decode_engagement_snapshot(
+            snapshot, last_date="2023-01-03T00:00:00", since="2023-01-01T00:00:00"
+        )
+        self.assertEqual(records, self.records)
+
+    def test_invalid_snapshot(self):
+        snapshot = encode_engagement_snapshot(self.records, since="2023-01-01T00:00:00")
+
+        # memberactivities has changed after the snapshot
+        self.assertIsNone(
+            decode_engagement_snapshot(
+                snapshot, last_date="2023-01-03T00:00:00", since="2023-01-01T00:00:00"
+            )
+        )
+        # the documents before the snapshot are needed
+        self.assertIsNone(
+            decode_engagement_snapshot(
+                snapshot, last_date="2023-01-02T00:00:00", since="2022-12-31T00:00:00"
+            )
+        )
+        # another schema version
+        snapshot["version"] = ENGAGEMENT_SNAPSHOT_VERSION + 1
+        self.assertIsNone(
+            decode_engagement_snapshot(
+                snapshot, last_date="2023-01-02T00:00:00", since="2023-01-01T00:00:00"
+            )
+        )
+        self.assertIsNone(
+            decode_engagement_snapshot(
+                None, last_date="2023-01-02T00:00:00", since="2023-01-01T00:00:00"
+            )
+        )
+
+    def test_empty_snapshot(self):
+        snapshot = encode_engagement_snapshot([], since="2023-01-01T00:00:00")
+
+        self.assertIsNone(snapshot["lastDate"])
+        self.assertIsNone(
+            decode_engagement_snapshot(
+                snapshot, last_date=None, since="2023-01-01T00:00:00"
+            )
+        )
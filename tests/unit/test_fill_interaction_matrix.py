@@ -0,0 +1,46 @@
+from discord_analyzer.analysis.utils.compute_interaction_mtx_utils import (
+    fill_interaction_matrix,
+    get_account_index,
+)
+
+
+def test_get_account_index_duplicates():
+    acc_index = get_account_index(["user1", "user2", "user1", "user3"])
+    assert acc_index == {"user1": 0, "user2": 1, "user3": 3}
+
+
+def test_fill_empty_interactions():
+    int_mtx = fill_interaction_matrix(
+        interactions=[], acc_index=get_account_index(["user1", "user2"])
+    )
+    assert int_mtx.shape == (2, 2)
+    assert int_mtx.sum() == 0
+
+
+def test_fill_repeated_interactions():
+    acc_names = ["user1", "user2", "user3"]
+    interactions = [
+        ("user1", "user2", 2),
+        ("user1", "user2", 3),
+        ("user3", "user3", 1),
+        ("user2", "user1", 4),
+        # accounts not in acc_names are skipped
+        ("user4", "user1", 7),
+        ("user1", "user4", 7),
+    ]
+    int_mtx = fill_interaction_matrix(
+        interactions=interactions,
+        acc_index=get_account_index(acc_names),
+        size=len(acc_names),
+    )
+
+    assert int_mtx.dtype.name == "uint16"
+    is_match = (
+        int_mtx
+        == [
+            [0, 5, 0],
+            [4, 0, 0],
+            [0, 0, 1],
+        ]
+    ).all()
+    assert bool(is_match) is True
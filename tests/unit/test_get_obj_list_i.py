@@ -0,0 +1,46 @@
+from discord_analyzer.analysis.activity_hourly import DayActivityStore, get_obj_list_i
+
+
+def test_new_objects_per_date_channel():
+    acc_names = ["user1", "user2", "remainder"]
+    store = DayActivityStore()
+    warning_count = [0] * 7
+
+    store, idx_1, warning_count = get_obj_list_i(
+        store, "2023-01-01", "channel1", acc_names, warning_count
+    )
+    store, idx_2, warning_count = get_obj_list_i(
+        store, "2023-01-01", "channel2", acc_names, warning_count
+    )
+    store, idx_3, warning_count = get_obj_list_i(
+        store, "2023-01-01", "channel1", acc_names, warning_count
+    )
+
+    assert (idx_1, idx_2, idx_3) == (0, 1, 0)
+    assert len(store) == 2
+    assert warning_count == [0] * 7
+    assert [obj.channel for obj in store] == [["channel1"], ["channel2"]]
+    # no account rows until activities are counted
+    assert store[1].lone_messages.shape == (0, 24)
+    assert len(store[1].asdict()["lone_messages"]) == 3
+
+
+def test_duplicate_objects_warning():
+    acc_names = ["user1", "remainder"]
+    store = DayActivityStore()
+    warning_count = [0] * 7
+
+    store, _, warning_count = get_obj_list_i(
+        store, "2023-01-01", "channel1", acc_names, warning_count
+    )
+    # the same date and channel added once more
+    store = DayActivityStore(list(store) + list(store))
+
+    store, idx, warning_count = get_obj_list_i(
+        store, "2023-01-01", "channel1", acc_names, warning_count
+    )
+
+    # the first entry is used
+    assert idx == 0
+    assert len(store) == 2
+    assert warning_count == [0, 1, 0, 0, 0, 0, 0]
@@ -0,0 +1,106 @@
+import unittest
+
+from discord_analyzer.analysis.neo4j_utils.projection_utils import GuildProjection
+
+
+class FakeGDS:
+    def __init__(self):
+        self.queries = []
+
+    def run_cypher(self, query, params=None):
+        self.queries.append((" ".join(query.split()), params))
+
+
+class FakeProjectionUtils:
+    def __init__(self):
+        self.gds = FakeGDS()
+        self.projections = []
+
+    def project_temp_graph(self, guildId, graph_name, **kwargs):
+        self.projections.append((guildId, graph_name, kwargs))
+
+
+class TestGuildProjection(unittest.TestCase):
+    def setUp(self) -> None:
+        self.projection_utils = FakeProjectionUtils()
+        self.gds = self.projection_utils.gds
+
+    def test_single_projection(self):
+        with GuildProjection(self.projection_utils, "1234") as projection:
+            projection.include_dates({1.0, 2.0, 3.0})
+            for date in [1.0, 2.0, 3.0]:
+                with projection.date_graph(date) as graph_name:
+                    self.assertTrue(graph_name.startswith("GraphDate_"))
+
+        # the guild graph is projected once
+        self.assertEqual(len(self.projection_utils.projections), 1)
+        guildId, guild_graph, kwargs = self.projection_utils.projections[0]
+        self.assertEqual(guildId, "1234")
+        self.assertEqual(kwargs["relation_direction"], "NATURAL")
+        self.assertTrue(kwargs["weighted"])
+        self.assertNotIn("date", kwargs)
+        # just the relations of the dates to compute are projected
+        self.assertEqual(kwargs["dates"], [1.0, 2.0, 3.0])
+
+        filters = [
+            params for query, params in self.gds.queries if "gds.graph.filter" in query
+        ]
+        self.assertEqual([params["date"] for params in filters], [1.0, 2.0, 3.0])
+        for params in filters:
+            self.assertEqual(params["guild_graph"], guild_graph)
+
+        # the three date graphs and the guild graph are dropped
+        dropped = [
+            params["graph_name"]
+            for query, params in self.gds.queries
+            if "gds.graph.drop" in query
+        ]
+        self.assertEqual(dropped[:3], [params["graph_name"] for params in filters])
+        self.assertEqual(dropped[3], guild_graph)
+        self.assertIsNone(projection.graph_name)
+
+    def test_no_dates(self):
+        with GuildProjection(self.projection_utils, "1234"):
+            pass
+
+        self.assertEqual(self.projection_utils.projections, [])
+        self.assertEqual(self.gds.queries, [])
+
+    def test_drop_on_failure(self):
+        with self.assertRaises(ValueError):
+            with GuildProjection(self.projection_utils, "1234") as projection:
+                with projection.date_graph(1.0):
+                    raise ValueError("computation failed")
+
+        dropped = [query for query, _ in self.gds.queries if "gds.graph.drop" in query]
+        self.assertEqual(len(dropped), 2)
+
+    def test_dates_included_after_projection(self):
+        with GuildProjection(self.projection_utils, "1234") as projection:
+            projection.include_dates({1.0})
+            with projection.date_graph(1.0):
+                pass
+            first_graph = projection.graph_name
+
+            # the dates already projected are not projected again
+            projection.include_dates({1.0})
+            with projection.date_graph(1.0):
+                pass
+            self.assertEqual(projection.graph_name, first_graph)
+
+            projection.include_dates({2.0})
+            with projection.date_graph(2.0):
+                pass
+
+        projected_dates = [
+            kwargs["dates"] for _, _, kwargs in self.projection_utils.projections
+        ]
+        self.assertEqual(projected_dates, [[1.0], [1.0, 2.0]])
+
+        # the first guild graph is dropped before projecting again
+        dropped = [
+            params["graph_name"]
+            for query, params in self.gds.queries
+            if "gds.graph.drop" in query
+        ]
+        self.assertIn(first_graph, dropped)
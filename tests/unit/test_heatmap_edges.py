@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from discord_analyzer.analysis.utils.heatmap_edges import (
+    HEATMAP_EDGE_FIELDS,
+    build_heatmap_edges,
+)
+
+
+class TestBuildHeatmapEdges(TestCase):
+    def create_heatmap(self, account, channel="ch1", **kwargs):
+        heatmap = {
+            "date": "2023-01-01",
+            "channelId": channel,
+            "account_name": account,
+            "thr_messages": [0] * 24,
+            "lone_messages": [0] * 24,
+            "replied_per_acc": [],
+            "mentioner_per_acc": [],
+            "reacted_per_acc": [],
+        }
+        heatmap.update(kwargs)
+        return heatmap
+
+    def test_empty_heatmaps(self):
+        self.assertEqual(build_heatmap_edges([]), [])
+
+    def test_edges_per_channel(self):
+        lone_messages = [0] * 24
+        lone_messages[3] = 2
+        lone_messages[5] = 1
+        heatmaps = [
+            self.create_heatmap(
+                "user1",
+                lone_messages=lone_messages,
+                reacted_per_acc=[[{"account": "user3", "count": 4}]],
+            ),
+            self.create_heatmap(
+                "user2",
+                mentioner_per_acc=[({"account": "user1", "count": 1},)],
+            ),
+            self.create_heatmap(
+                "user1",
+                channel="ch2",
+                replied_per_acc=[[{"account": "user2", "count": 5}]],
+            ),
+        ]
+
+        edges = build_heatmap_edges(heatmaps)
+
+        self.assertEqual(len(edges), 2)
+        self.assertEqual(
+            edges[0],
+            {
+                "date": "2023-01-01",
+                "channelId": "ch1",
+                "accounts": ["user1", "user2", "user3"],
+                "active": 2,
+                "activity": [
+                    HEATMAP_EDGE_FIELDS.index("lone_messages"),
+                    HEATMAP_EDGE_FIELDS.index("reacted_per_acc"),
+                    HEATMAP_EDGE_FIELDS.index("mentioner_per_acc"),
+                ],
+                "from_idx": [0, 0, 1],
+                "to_idx": [0, 2, 0],
+                "count": [3, 4, 1],
+            },
+        )
+        self.assertEqual(
+            edges[1],
+            {
+                "date": "2023-01-01",
+                "channelId": "ch2",
+                "accounts": ["user1", "user2"],
+                "active": 1,
+                "activity": [HEATMAP_EDGE_FIELDS.index("replied_per_acc")],
+                "from_idx": [0],
+                "to_idx": [1],
+                "count": [5],
+            },
+        )
@@ -0,0 +1,35 @@
+import numpy as np
+from discord_analyzer.analyzer.heatmaps_utils import (
+    ACTION_FIELDS,
+    get_rows_number_of_actions,
+    getNumberOfActions,
+)
+
+
+def test_number_of_actions_single_heatmap():
+    heatmap = {field: [0] * 24 for field in ACTION_FIELDS}
+    heatmap["lone_messages"][3] = 2
+    heatmap["reacted"][23] = 1
+    # not counted as actions
+    heatmap["rep_mentioner"] = [5] * 24
+
+    assert getNumberOfActions(heatmap) == 3
+
+
+def test_number_of_actions_rows():
+    activities = {field: np.zeros((3, 24), dtype=np.int16) for field in ACTION_FIELDS}
+    activities["replier"][0, 1] = 1
+    activities["mentioned"][0, 5] = 4
+    activities["thr_messages"][2, 10] = 7
+
+    actions_count = get_rows_number_of_actions(activities)
+
+    np.testing.assert_array_equal(actions_count, [5, 0, 7])
+
+
+def test_number_of_actions_no_rows():
+    activities = {field: np.zeros((0, 24), dtype=np.int16) for field in ACTION_FIELDS}
+
+    actions_count = get_rows_number_of_actions(activities)
+
+    assert actions_count.shape == (0,)
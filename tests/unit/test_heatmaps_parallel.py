@@ -0,0 +1,177 @@
+import os
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from discord_analyzer.analyzer.analyzer_heatmaps import (
+    RAWINFO_FIELDS,
+    Heatmaps,
+    expand_messages,
+)
+from discord_analyzer.analyzer.heatmaps_utils import get_heatmaps_workers
+from discord_analyzer.models.RawInfoModel import RawInfoModel
+
+
+def _create_days_columns(days: int) -> list[tuple[datetime, dict[str, list]]]:
+    start_day = datetime(2023, 1, 1)
+    accounts = ["user1", "user2", "user3", "user4"]
+
+    days_columns = []
+    for day in range(days):
+        date = start_day + timedelta(days=day)
+        entries = []
+        for i in range(12):
+            author = accounts[(day + i) % 4]
+            entries.append(
+                {
+                    "type": 19 if i % 3 == 0 else 0,
+                    "author": author,
+                    "user_mentions": [accounts[(day + i + 1) % 4]],
+                    "reactions": [f"{accounts[(i + 2) % 4]},{accounts[i % 4]},👍"],
+                    "replied_user": accounts[(i + 3) % 4] if i % 3 == 0 else None,
+                    "createdDate": date + timedelta(hours=i * 2, minutes=day),
+                    "channelId": f"channel{i % 2}",
+                    "threadId": "thread1" if i % 4 == 0 else None,
+                }
+            )
+        # a bot message
+        entries.append(
+            {
+                "type": 0,
+                "author": "bot1",
+                "user_mentions": ["user1", "user5"],
+                "reactions": [],
+                "createdDate": date + timedelta(hours=3),
+                "channelId": "channel0",
+                "threadId": None,
+            }
+        )
+        days_columns.append(
+            (date, RawInfoModel.entries_to_columns(entries, RAWINFO_FIELDS))
+        )
+
+    return days_columns
+
+
+class TestHeatmapsParallel(TestCase):
+    def test_prepare_day_columns(self):
+        heatmaps = Heatmaps(DB_connections=None, testing=False, workers=1)
+        _, columns = _create_days_columns(1)[0]
+        compact, account_list = heatmaps._prepare_day_columns(
+            columns, member_ids=["user1"], bot_ids=["bot1"]
+        )
+        messages = expand_messages(compact)
+
+        # the bot message and its mentions are removed
+        self.assertEqual(len(messages), 12)
+        self.assertEqual(account_list, ["user1", "user2", "user3", "user4"])
+        self.assertEqual(
+            messages[0],
+            {
+                "datetime": datetime(2023, 1, 1),
+                "channel": "channel0",
+                "author": "user1",
+                "replied_user": "user4",
+                "user_mentions": ["user2"],
+                "reactions": ["user3,user1,👍"],
+                "threadId": "thread1",
+                "mess_type": 19,
+            },
+        )
+        self.assertEqual(messages[1]["replied_user"], None)
+
+    def test_prepare_day_columns_missing_replied_user(self):
+        heatmaps = Heatmaps(DB_connections=None, testing=False, workers=1)
+        entries = [
+            {
+                "type": 0,
+                "author": "user1",
+                "user_mentions": [],
+                "reactions": [],
+                "createdDate": datetime(2023, 1, 1, 10),
+                "channelId": "channel0",
+                "threadId": None,
+            }
+        ]
+        columns = RawInfoModel.entries_to_columns(entries, RAWINFO_FIELDS)
+        compact, _ = heatmaps._prepare_day_columns(
+            columns, member_ids=["user1"], bot_ids=[]
+        )
+
+        self.assertEqual(expand_messages(compact)[0]["replied_user"], "")
+
+    def test_prepare_day_columns_empty(self):
+        heatmaps = Heatmaps(DB_connections=None, testing=False, workers=1)
+        columns = RawInfoModel.entries_to_columns([], RAWINFO_FIELDS)
+        compact, account_list = heatmaps._prepare_day_columns(
+            columns, member_ids=["user1"], bot_ids=[]
+        )
+
+        self.assertEqual(expand_messages(compact), [])
+        self.assertEqual(account_list, ["user1"])
+
+    def test_parallel_same_as_serial(self):
+        days_columns = _create_days_columns(20)
+        member_ids = ["user1", "user2", "user3"]
+
+        serial = Heatmaps(DB_connections=None, testing=False, workers=1)
+        parallel = Heatmaps(DB_connections=None, testing=False, workers=2)
+
+        serial_results = list(
+            serial._iter_days_heatmaps(days_columns, member_ids, ["bot1"])
+        )
+        parallel_results = list(
+            parallel._iter_days_heatmaps(days_columns, member_ids, ["bot1"])
+        )
+
+        self.assertGreater(len(serial_results), 0)
+        self.assertEqual(parallel_results, serial_results)
+
+    def test_get_heatmaps_workers(self):
+        previous = os.environ.get("HEATMAPS_WORKERS")
+        try:
+            os.environ["HEATMAPS_WORKERS"] = "4"
+            self.assertEqual(get_heatmaps_workers(), 4)
+
+            os.environ["HEATMAPS_WORKERS"] = "0"
+            self.assertEqual(get_heatmaps_workers(), 1)
+
+            os.environ["HEATMAPS_WORKERS"] = "many"
+            self.assertEqual(get_heatmaps_workers(), 1)
+
+            os.environ["HEATMAPS_WORKERS"] = ""
+            self.assertEqual(get_heatmaps_workers(), 1)
+        finally:
+            if previous is None:
+                os.environ.pop("HEATMAPS_WORKERS", None)
+            else:
+                os.environ["HEATMAPS_WORKERS"] = previous
+
+    def test_heatmaps_stream_consumes_days_lazily(self):
+        days_columns = _create_days_columns(5)
+        consumed_days = []
+
+        def days_stream():
+            for day, columns in days_columns:
+                consumed_days.append(day)
+                yield day, columns
+
+        heatmaps = Heatmaps(DB_connections=None, testing=False, workers=1)
+        heatmaps_stream = heatmaps._iter_days_heatmaps(
+            days_stream(), ["user1", "user2", "user3"], ["bot1"]
+        )
+        self.assertEqual(consumed_days, [])
+
+        first_heatmap = next(heatmaps_stream)
+        self.assertEqual(first_heatmap["date"], "2023-01-01")
+        self.assertEqual(consumed_days, [datetime(2023, 1, 1)])
+
+        remaining = list(heatmaps_stream)
+        self.assertEqual(len(consumed_days), 5)
+        self.assertEqual(
+            [first_heatmap] + remaining,
+            list(
+                heatmaps._iter_days_heatmaps(
+                    days_columns, ["user1", "user2", "user3"], ["bot1"]
+                )
+            ),
+        )
@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+from discord_analyzer.models import BaseModel
+from discord_analyzer.models.HeatMapModel import HeatMapModel
+from pymongo import DeleteMany, InsertOne
+
+
+class FakeCollection:
+    def __init__(self) -> None:
+        self.documents = []
+        self.indexes = []
+
+    def create_index(self, keys):
+        self.indexes.append(keys)
+
+    def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            if isinstance(operation, DeleteMany):
+                self.documents = [
+                    document
+                    for document in self.documents
+                    if any(
+                        document[key] != value
+                        for key, value in operation._filter.items()
+                    )
+                ]
+            elif isinstance(operation, InsertOne):
+                self.documents.append(dict(operation._doc))
+
+
+class FakeDatabase(dict):
+    name = "1234"
+
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+class TestHeatmapsReplaceDayChannels(TestCase):
+    def setUp(self) -> None:
+        BaseModel._CREATED_INDEXES.clear()
+        self.database = FakeDatabase()
+        self.heatmap_c = HeatMapModel(self.database)
+
+    def create_heatmap(self, date: str, channel: str, account: str, count: int):
+        return {
+            "date": date,
+            "channelId": channel,
+            "account_name": account,
+            "lone_messages": [count] + [0] * 23,
+        }
+
+    def test_duplicates_removed(self):
+        collection = self.database["heatmaps"]
+        # the duplicates left by the previous upserts
+        collection.documents = [
+            self.create_heatmap("2023-01-01", "ch1", "user1", 1),
+            self.create_heatmap("2023-01-01", "ch1", "user1", 1),
+            self.create_heatmap("2023-01-01", "ch1", "user2", 1),
+            self.create_heatmap("2023-01-01", "ch2", "user1", 1),
+            self.create_heatmap("2023-01-02", "ch1", "user1", 1),
+        ]
+
+        self.heatmap_c.replace_day_channels(
+            [self.create_heatmap("2023-01-01", "ch1", "user1", 2)],
+            day_channels=[("2023-01-01", "ch1")],
+        )
+
+        self.assertEqual(
+            sorted(
+                (document["date"], document["channelId"], document["account_name"])
+                for document in collection.documents
+            ),
+            [
+                ("2023-01-01", "ch1", "user1"),
+                ("2023-01-01", "ch2", "user1"),
+                ("2023-01-02", "ch1", "user1"),
+            ],
+        )
+        heatmap = collection.documents[-1]
+        self.assertEqual(heatmap["lone_messages"][0], 2)
+
+    def test_index_created_once(self):
+        for _ in range(3):
+            self.heatmap_c.replace_day_channels(
+                [self.create_heatmap("2023-01-01", "ch1", "user1", 1)],
+                day_channels=[("2023-01-01", "ch1")],
+            )
+
+        collection = self.database["heatmaps"]
+        self.assertEqual(len(collection.indexes), 1)
+        self.assertEqual(len(collection.documents), 1)
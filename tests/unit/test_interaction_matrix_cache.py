@@ -0,0 +1,261 @@
+from unittest import TestCase
+
+from discord_analyzer.analysis.compute_interaction_matrix_discord import (
+    InteractionMatrixCache,
+)
+from discord_analyzer.analysis.utils.heatmaps_store import HeatmapsStore
+from tc_core_analyzer_lib.utils.activity import DiscordActivity
+
+
+class FakeDBAccess:
+    """
+    returns the already summed interactions of the queried dates
+    """
+
+    def __init__(
+        self,
+        dates_results: dict[str, list[tuple]],
+        edges: list[dict] | None = None,
+        edges_last_date: str | None = None,
+    ):
+        self.db_name = "1234"
+        self.dates_results = dates_results
+        self.queried_dates = []
+        self.edges = edges if edges is not None else []
+        self.edges_last_date = edges_last_date
+
+    def query_db_find(self, table, query, feature_projection=None, sorting=None):
+        if table == "analyzerstates":
+            if self.edges_last_date is None:
+                return []
+            return [{"version": 1, "lastDate": self.edges_last_date}]
+
+        date_range = query["date"]
+        self.queried_dates.append((date_range["$gte"], date_range["$lte"]))
+        return [
+            edge_list
+            for edge_list in self.edges
+            if date_range["$gte"] <= edge_list["date"] <= date_range["$lte"]
+        ]
+
+    def query_db_aggregation(self, table, query, feature_projection=None, sorting=None):
+        match = query[0]["$match"]
+        if "$and" not in match:
+            # the accounts of the dates
+            date_range = match["date"]
+            return [
+                {"_id": {"date": date, "account": account}}
+                for date, results in sorted(self.dates_results.items())
+                if date_range["$gte"] <= date <= date_range["$lte"]
+                for account in sorted(set(result[1] for result in results))
+            ]
+
+        date_range = match["$and"][1]["date"]
+        self.queried_dates.append((date_range["$gte"], date_range["$lte"]))
+
+        results = []
+        for date, date_results in self.dates_results.items():
+            if not date_range["$gte"] <= date <= date_range["$lte"]:
+                continue
+            for field, account, interacted, count in date_results:
+                results.append(
+                    {
+                        "_id": {
+                            "field": field,
+                            "account": account,
+                            "interacted": interacted,
+                            "date": date,
+                        },
+                        "count": count,
+                    }
+                )
+        return results
+
+
+class TestInteractionMatrixCache(TestCase):
+    def setUp(self) -> None:
+        self.db_access = FakeDBAccess(
+            {
+                "2023-01-01": [
+                    ("replied_per_acc", "user1", "user2", 2),
+                    ("lone_messages", "user1", "user1", 3),
+                    ("lone_messages", "remainder", "remainder", 1),
+                ],
+                "2023-01-02": [
+                    ("replied_per_acc", "user1", "user2", 1),
+                    ("mentioner_per_acc", "user2", "user3", 4),
+                ],
+                "2023-01-03": [
+                    ("replied_per_acc", "user2", "user1", 5),
+                    ("replied_per_acc", "user1", "user1", 5),
+                ],
+            }
+        )
+        self.cache = InteractionMatrixCache(
+            channels=["channel1"], db_access=self.db_access
+        )
+        self.acc_names = ["user1", "user2", "user3"]
+
+    def test_first_window(self):
+        self.cache.slide(["2023-01-02", "2023-01-01"])
+        int_mat = self.cache.compute_interaction_matrix(self.acc_names)
+
+        self.assertEqual(self.db_access.queried_dates, [("2023-01-01", "2023-01-02")])
+        self.assertEqual(
+            int_mat[DiscordActivity.Reply].tolist(),
+            [[0, 3, 0], [0, 0, 0], [0, 0, 0]],
+        )
+        self.assertEqual(
+            int_mat[DiscordActivity.Mention].tolist(),
+            [[0, 0, 0], [0, 0, 4], [0, 0, 0]],
+        )
+        self.assertEqual(
+            int_mat[DiscordActivity.Lone_msg].tolist(),
+            [[3, 0, 0], [0, 0, 0], [0, 0, 0]],
+        )
+
+    def test_sliding_queries_new_dates(self):
+        self.cache.slide(["2023-01-01", "2023-01-02"])
+        self.cache.slide(["2023-01-02", "2023-01-03"])
+        int_mat = self.cache.compute_interaction_matrix(
+            self.acc_names, activities=[DiscordActivity.Reply]
+        )
+
+        self.assertEqual(
+            self.db_access.queried_dates,
+            [("2023-01-01", "2023-01-02"), ("2023-01-03", "2023-01-03")],
+        )
+        self.assertEqual(list(int_mat.keys()), [DiscordActivity.Reply])
+        # self replies are not counted
+        self.assertEqual(
+            int_mat[DiscordActivity.Reply].tolist(),
+            [[0, 1, 0], [5, 0, 0], [0, 0, 0]],
+        )
+        # the interactions of the date left the window are removed
+        self.assertEqual(len(self.cache.keys), 4)
+
+    def test_same_window(self):
+        self.cache.slide(["2023-01-01", "2023-01-02"])
+        self.cache.slide(["2023-01-01", "2023-01-02"])
+
+        self.assertEqual(len(self.db_access.queried_dates), 1)
+
+    def test_prefetched_store(self):
+        store = HeatmapsStore(
+            channels=["channel1"],
+            db_access=self.db_access,
+            field_names=["replied_per_acc", "mentioner_per_acc", "lone_messages"],
+        )
+        store.load("2023-01-01", "2023-01-03")
+        cache = InteractionMatrixCache(
+            channels=["channel1"], db_access=self.db_access, store=store
+        )
+
+        cache.slide(["2023-01-01", "2023-01-02"])
+        first_window = cache.compute_interaction_matrix(
+            self.acc_names, activities=[DiscordActivity.Reply]
+        )
+        cache.slide(["2023-01-02", "2023-01-03"])
+        second_window = cache.compute_interaction_matrix(
+            self.acc_names, activities=[DiscordActivity.Reply]
+        )
+
+        # all dates were loaded with one query
+        self.assertEqual(self.db_access.queried_dates, [("2023-01-01", "2023-01-03")])
+        self.assertEqual(
+            first_window[DiscordActivity.Reply].tolist(),
+            [[0, 3, 0], [0, 0, 0], [0, 0, 0]],
+        )
+        self.assertEqual(
+            second_window[DiscordActivity.Reply].tolist(),
+            [[0, 1, 0], [5, 0, 0], [0, 0, 0]],
+        )
+
+    def test_store_get_accounts(self):
+        store = HeatmapsStore(
+            channels=["channel1"],
+            db_access=self.db_access,
+            field_names=["replied_per_acc", "mentioner_per_acc", "lone_messages"],
+        )
+        store.load("2023-01-01", "2023-01-03")
+
+        # the remainder category is not an account
+        self.assertEqual(store.get_accounts("2023-01-01", "2023-01-01"), ["user1"])
+        self.assertEqual(
+            store.get_accounts("2023-01-01", "2023-01-03"), ["user1", "user2"]
+        )
+        # a date without any heatmaps document
+        self.assertEqual(store.get_accounts("2023-01-05", "2023-01-05"), [])
+
+    def test_store_edges(self):
+        edges = [
+            {
+                "date": "2023-01-01",
+                "channelId": "channel1",
+                "accounts": ["user1", "user2"],
+                "active": 1,
+                # lone_messages, replied_per_acc
+                "activity": [1, 2],
+                "from_idx": [0, 0],
+                "to_idx": [0, 1],
+                "count": [3, 2],
+            },
+            {
+                "date": "2023-01-01",
+                "channelId": "channel2",
+                "accounts": ["user2", "user1"],
+                "active": 1,
+                "activity": [2],
+                "from_idx": [0],
+                "to_idx": [1],
+                "count": [7],
+            },
+            {
+                "date": "2023-01-02",
+                "channelId": "channel1",
+                "accounts": ["user2", "user1", "user3"],
+                "active": 2,
+                # replied_per_acc, mentioner_per_acc
+                "activity": [2, 3],
+                "from_idx": [1, 0],
+                "to_idx": [0, 2],
+                "count": [1, 4],
+            },
+        ]
+        db_access = FakeDBAccess({}, edges=edges, edges_last_date="2023-01-03")
+        store = HeatmapsStore(
+            channels=["channel1"],
+            db_access=db_access,
+            field_names=["replied_per_acc", "mentioner_per_acc", "lone_messages"],
+        )
+        cache = InteractionMatrixCache(
+            channels=["channel1"], db_access=db_access, store=store
+        )
+        cache.slide(["2023-01-01", "2023-01-02"])
+        int_mat = cache.compute_interaction_matrix(
+            self.acc_names,
+            activities=[
+                DiscordActivity.Reply,
+                DiscordActivity.Mention,
+                DiscordActivity.Lone_msg,
+            ],
+        )
+
+        # the edge lists were loaded with one range scan
+        self.assertEqual(db_access.queried_dates, [("2023-01-01", "2023-01-02")])
+        # the accounts are from all channels
+        self.assertEqual(
+            store.get_accounts("2023-01-01", "2023-01-02"), ["user1", "user2"]
+        )
+        self.assertEqual(
+            int_mat[DiscordActivity.Reply].tolist(),
+            [[0, 3, 0], [0, 0, 0], [0, 0, 0]],
+        )
+        self.assertEqual(
+            int_mat[DiscordActivity.Mention].tolist(),
+            [[0, 0, 0], [0, 0, 4], [0, 0, 0]],
+        )
+        self.assertEqual(
+            int_mat[DiscordActivity.Lone_msg].tolist(),
+            [[3, 0, 0], [0, 0, 0], [0, 0, 0]],
+        )
@@ -125,3 +125,29 @@ def test_multiple_joined():
 
     # len would show 1 more
     assert len(all_joined_day.keys()) - 1 == (end_dt - start_dt).days + starting_key
+
+
+def test_users_past_days_rolling_union():
+    all_joined_day = {
+        "0": set(["000000000"]),
+        "1": set(["000000001", "000000002"]),
+        "2": set([]),
+        "3": set(["000000000", "000000003"]),
+        "4": set(["000000004"]),
+        "5": set([]),
+        "6": set([]),
+        "7": set(["000000005"]),
+    }
+    window_d = 2
+
+    member_activitiy_utils = MemberActivityPastUtils(db_access=None)
+    all_joined = member_activitiy_utils.get_users_past_days(all_joined_day, window_d)
+
+    assert all_joined == {
+        "1": set(["000000000", "000000001", "000000002"]),
+        "2": set(["000000000", "000000001", "000000002", "000000003"]),
+        "3": set(["000000000", "000000003", "000000004"]),
+        "4": set(["000000000", "000000003", "000000004"]),
+        "5": set(["000000004"]),
+        "6": set(["000000005"]),
+    }
@@ -0,0 +1,266 @@
+from unittest import TestCase
+
+from discord_analyzer.analyzer.analyzer_heatmaps import Heatmaps
+from discord_analyzer.DB_operations.mongodb_interaction import MongoDBOps
+from discord_analyzer.models.HeatMapModel import HEATMAPS_DAYS_STATE
+
+
+def matches(document, query):
+    for key, value in query.items():
+        if isinstance(value, dict):
+            if "$in" in value and document.get(key) not in value["$in"]:
+                return False
+            if "$gt" in value and not document.get(key) > value["$gt"]:
+                return False
+        elif document.get(key) != value:
+            return False
+    return True
+
+
+class FakeCursor(list):
+    def sort(self, keys):
+        key, direction = keys[0]
+        return FakeCursor(
+            sorted(self, key=lambda document: document[key], reverse=direction < 0)
+        )
+
+    def limit(self, count):
+        return FakeCursor(self[:count])
+
+
+class FakeCollection:
+    def __init__(self, database, name) -> None:
+        self.database = database
+        self.name = name
+        self.documents = []
+        self.indexes = {"_id_": {"key": [("_id", 1)]}}
+        # the count of `insert_many` calls to succeed before failing
+        self.fail_insert = None
+
+    def insert_many(self, documents, ordered=True):
+        if self.fail_insert is not None:
+            self.fail_insert -= 1
+            if self.fail_insert < 0:
+                raise RuntimeError("the batch couldn't be written")
+        self.documents.extend(dict(document) for document in documents)
+
+    def delete_many(self, filter):
+        self.documents = [
+            document for document in self.documents if not matches(document, filter)
+        ]
+
+    def find(self, query=None, projection=None):
+        return FakeCursor(
+            document for document in self.documents if matches(document, query or {})
+        )
+
+    def find_one(self, query, projection=None):
+        for document in self.find(query):
+            return {
+                key: value
+                for key, value in document.items()
+                if (projection or {}).get(key, 1)
+            }
+        return None
+
+    def replace_one(self, query, document, upsert=False):
+        self.delete_many(query)
+        self.documents.append(dict(document))
+
+    def index_information(self):
+        return dict(self.indexes)
+
+    def create_index(self, keys, name=None, **kwargs):
+        self.indexes[name] = {"key": keys, **kwargs}
+
+    def rename(self, new_name, dropTarget=False):
+        self.database.collections[new_name] = self.database.collections.pop(self.name)
+        self.name = new_name
+
+
+class FakeDatabase:
+    def __init__(self) -> None:
+        self.collections = {}
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(self, name)
+        return self.collections[name]
+
+    def __getattr__(self, name):
+        return self[name]
+
+    def drop_collection(self, name):
+        self.collections.pop(name, None)
+
+    def create_collection(self, name):
+        return self[name]
+
+
+class FakeSession:
+    def __init__(self, client, attempts) -> None:
+        self.client = client
+        self.attempts = attempts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def with_transaction(self, callback, **kwargs):
+        # the callback is run again as after a TransientTransactionError
+        for _ in range(self.attempts):
+            callback(self)
+
+
+class FakeClient:
+    def __init__(self, attempts) -> None:
+        self.databases = {}
+        self.attempts = attempts
+
+    def __getitem__(self, name):
+        if name not in self.databases:
+            self.databases[name] = FakeDatabase()
+        return self.databases[name]
+
+    def start_session(self):
+        return FakeSession(self, self.attempts)
+
+
+class TestMongoDBAnalyticsTransaction(TestCase):
+    def setUp(self) -> None:
+        self.guildId = "1234"
+        self.heatmaps = [{"date": f"2023-01-{day:02}"} for day in range(1, 11)]
+        self.client = FakeClient(attempts=2)
+        self.mongo_ops = MongoDBOps("user", "pass", "host", "port", batch_size=3)
+        self.mongo_ops.mongo_db_access = type(
+            "FakeAccess", (), {"db_mongo_client": self.client}
+        )()
+
+    def test_stream_recompute_transient_retry(self):
+        database = self.client[self.guildId]
+        database.heatmaps.insert_many([{"date": "old"}])
+        database.heatmaps.create_index([("date", 1)], name="date_1", unique=False)
+
+        self.mongo_ops._do_analytics_write_transaction(
+            guildId=self.guildId,
+            delete_heatmaps=True,
+            delete_member_acitivities=False,
+            acitivties_list=None,
+            heatmaps_list=iter(self.heatmaps),
+        )
+
+        self.assertEqual(database.heatmaps.documents, self.heatmaps)
+        self.assertNotIn("heatmaps_staging", database.collections)
+        self.assertEqual(self.get_last_date(), "2023-01-10")
+        # the indexes of the replaced collection are kept
+        self.assertEqual(
+            database.heatmaps.index_information()["date_1"],
+            {"key": [("date", 1)], "unique": False},
+        )
+
+    def test_stream_insert_transient_retry(self):
+        database = self.client[self.guildId]
+        database.heatmaps.insert_many([{"date": "old"}])
+
+        self.mongo_ops._do_analytics_write_transaction(
+            guildId=self.guildId,
+            delete_heatmaps=False,
+            delete_member_acitivities=False,
+            acitivties_list=None,
+            heatmaps_list=iter(self.heatmaps),
+        )
+
+        self.assertEqual(database.heatmaps.documents, [{"date": "old"}] + self.heatmaps)
+        self.assertEqual(self.get_last_date(), "2023-01-10")
+
+    def test_list_recompute_transient_retry(self):
+        database = self.client[self.guildId]
+        database.heatmaps.insert_many([{"date": "old"}])
+
+        self.mongo_ops._do_analytics_write_transaction(
+            guildId=self.guildId,
+            delete_heatmaps=True,
+            delete_member_acitivities=False,
+            acitivties_list=None,
+            heatmaps_list=list(self.heatmaps),
+        )
+
+        self.assertEqual(database.heatmaps.documents, self.heatmaps)
+
+    def get_last_date(self):
+        state = self.client[self.guildId].analyzerstates.find_one(
+            {"name": HEATMAPS_DAYS_STATE}
+        )
+        return state["lastDate"]
+
+    def test_stream_failed_batch_resumed(self):
+        database = self.client[self.guildId]
+        heatmaps = [
+            {"date": f"2023-01-{day:02}", "account_name": account}
+            for day in range(1, 8)
+            for account in ["user1", "user2"]
+        ]
+        # the batches are the days 1-2, 3-4, 5-6 and 7
+        # and the third batch fails after its first documents are written
+        database.heatmaps.fail_insert = 2
+        original_insert_many = database.heatmaps.insert_many
+
+        def insert_many(documents, ordered=True):
+            if database.heatmaps.fail_insert == 0:
+                database.heatmaps.documents.extend(documents[:1])
+            original_insert_many(documents, ordered)
+
+        database.heatmaps.insert_many = insert_many
+
+        with self.assertRaises(RuntimeError):
+            self.mongo_ops.write_heatmaps_days(
+                self.guildId, iter(heatmaps), batch_size=4
+            )
+
+        self.assertEqual(self.get_last_date(), "2023-01-04")
+        self.assertIn(
+            {"date": "2023-01-05", "account_name": "user1"}, database.heatmaps.documents
+        )
+
+        # the next run computes the days after the last written one
+        database.heatmaps.fail_insert = None
+        last_date = Heatmaps(
+            DB_connections=None, testing=False, workers=1
+        )._get_last_written_date(database)
+        self.assertEqual(last_date.strftime("%Y-%m-%d"), "2023-01-04")
+        self.mongo_ops.write_heatmaps_days(
+            self.guildId,
+            (
+                heatmap
+                for heatmap in heatmaps
+                if heatmap["date"] > last_date.strftime("%Y-%m-%d")
+            ),
+            batch_size=4,
+        )
+
+        self.assertEqual(
+            sorted(database.heatmaps.documents, key=lambda doc: list(doc.values())),
+            heatmaps,
+        )
+        self.assertEqual(self.get_last_date(), "2023-01-07")
+
+    def test_last_written_date_without_state(self):
+        database = self.client[self.guildId]
+        database.heatmaps.insert_many([{"date": "2023-01-01"}, {"date": "2023-01-02"}])
+
+        # the last stored day could be partially written
+        last_date = Heatmaps(
+            DB_connections=None, testing=False, workers=1
+        )._get_last_written_date(database)
+        self.assertEqual(last_date.strftime("%Y-%m-%d"), "2023-01-01")
+
+        # its heatmaps are replaced when written again
+        self.mongo_ops.write_heatmaps_days(
+            self.guildId, iter([{"date": "2023-01-02", "account_name": "user1"}])
+        )
+        self.assertEqual(
+            database.heatmaps.documents,
+            [{"date": "2023-01-01"}, {"date": "2023-01-02", "account_name": "user1"}],
+        )
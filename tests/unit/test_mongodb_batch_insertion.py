@@ -0,0 +1,123 @@
+import os
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from discord_analyzer.DB_operations.mongodb_interaction import (
+    MongoDBOps,
+    get_mongo_write_options,
+)
+
+
+class FakeCollection:
+    def __init__(self) -> None:
+        self.batches = []
+        self.ordered = []
+        self.threads = set()
+
+    def insert_many(self, documents, ordered=True):
+        self.batches.append(list(documents))
+        self.ordered.append(ordered)
+        self.threads.add(threading.get_ident())
+
+
+class TestMongoDBBatchInsertion(TestCase):
+    def setUp(self) -> None:
+        self.data = [{"value": i} for i in range(25)]
+
+    def test_batch_insertion_single_writer(self):
+        mongo_ops = MongoDBOps("user", "pass", "host", "port", batch_size=10)
+        collection = FakeCollection()
+
+        with self.assertLogs(level="INFO") as logs:
+            mongo_ops._batch_insertion(collection, self.data, message="test")
+
+        self.assertEqual([len(batch) for batch in collection.batches], [10, 10, 5])
+        self.assertEqual(sum(collection.batches, []), self.data)
+        self.assertEqual(collection.ordered, [False, False, False])
+        # the last batch is counted too
+        self.assertIn("test: Batch 3/3", logs.output[-1])
+
+    def test_batch_insertion_given_batch_size(self):
+        mongo_ops = MongoDBOps("user", "pass", "host", "port", batch_size=10)
+        collection = FakeCollection()
+
+        mongo_ops._batch_insertion(collection, self.data, "test", batch_size=5)
+
+        self.assertEqual(len(collection.batches), 5)
+
+    def test_batch_insertion_multiple_writers(self):
+        mongo_ops = MongoDBOps("user", "pass", "host", "port", batch_size=2, writers=4)
+        collection = FakeCollection()
+
+        mongo_ops._batch_insertion(collection, self.data, message="test")
+
+        self.assertEqual(len(collection.batches), 13)
+        inserted = sorted(sum(collection.batches, []), key=lambda doc: doc["value"])
+        self.assertEqual(inserted, self.data)
+        self.assertNotIn(threading.get_ident(), collection.threads)
+
+    def test_batch_insertion_empty_data(self):
+        mongo_ops = MongoDBOps("user", "pass", "host", "port")
+        collection = FakeCollection()
+
+        mongo_ops._batch_insertion(collection, [], message="test")
+
+        self.assertEqual(collection.batches, [])
+
+    def test_batch_insertion_stream(self):
+        mongo_ops = MongoDBOps("user", "pass", "host", "port", batch_size=10)
+        collection = FakeCollection()
+        consumed = []
+
+        def data_stream():
+            for document in self.data:
+                consumed.append(document)
+                # no more than a batch is taken before inserting it
+                self.assertLessEqual(
+                    len(consumed), sum(map(len, collection.batches)) + 10
+                )
+                yield document
+
+        with self.assertLogs(level="INFO") as logs:
+            mongo_ops._batch_insertion(collection, data_stream(), message="test")
+
+        self.assertEqual([len(batch) for batch in collection.batches], [10, 10, 5])
+        self.assertEqual(sum(collection.batches, []), self.data)
+        self.assertIn("test: Batch 3", logs.output[-1])
+
+    def test_batch_insertion_stream_multiple_writers(self):
+        mongo_ops = MongoDBOps("user", "pass", "host", "port", batch_size=3, writers=2)
+        collection = FakeCollection()
+
+        mongo_ops._batch_insertion(collection, iter(self.data), message="test")
+
+        self.assertEqual(len(collection.batches), 9)
+        inserted = sorted(sum(collection.batches, []), key=lambda doc: doc["value"])
+        self.assertEqual(inserted, self.data)
+
+    def test_write_options_from_env(self):
+        env = {
+            "MONGODB_WRITE_BATCH_SIZE": "500",
+            "MONGODB_WRITERS": "4",
+            "MONGODB_STAGING_RECOMPUTE": "true",
+        }
+        with patch.dict(os.environ, env):
+            options = get_mongo_write_options()
+
+        self.assertEqual(
+            options, {"batch_size": 500, "writers": 4, "staging_recompute": True}
+        )
+        mongo_ops = MongoDBOps("user", "pass", "host", "port", **options)
+        self.assertEqual(mongo_ops.writers, 4)
+
+    def test_write_options_invalid_env(self):
+        env = {
+            "MONGODB_WRITE_BATCH_SIZE": "many",
+            "MONGODB_WRITERS": "",
+            "MONGODB_STAGING_RECOMPUTE": "false",
+        }
+        with patch.dict(os.environ, env):
+            options = get_mongo_write_options()
+
+        self.assertEqual(options, {})
@@ -0,0 +1,118 @@
+import unittest
+from types import SimpleNamespace
+
+from discord_analyzer.DB_operations import neo4j_schema
+from discord_analyzer.DB_operations.neo4j_schema import (
+    NEO4J_HOT_QUERIES,
+    NEO4J_SCHEMA_QUERIES,
+    ensure_neo4j_schema,
+    find_label_scans,
+)
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def run(self, query, parameters=None):
+        self.driver.queries.append(query)
+        if query in self.driver.failing:
+            raise RuntimeError("existing data violates the constraint")
+        plan = self.driver.plan if query.startswith("EXPLAIN") else None
+        return SimpleNamespace(consume=lambda: SimpleNamespace(plan=plan))
+
+
+class FakeDriver:
+    def __init__(self, plan=None, failing=None):
+        self.queries = []
+        self.plan = plan
+        self.failing = failing or []
+
+    def session(self, database=None):
+        return FakeSession(self)
+
+
+class TestNeo4jSchema(unittest.TestCase):
+    def setUp(self) -> None:
+        neo4j_schema._schema_ensured = False
+
+    def tearDown(self) -> None:
+        neo4j_schema._schema_ensured = False
+
+    def test_ensure_schema_once(self):
+        driver = FakeDriver()
+        neo4j_ops = SimpleNamespace(neo4j_driver=driver, db_name="neo4j")
+
+        self.assertTrue(ensure_neo4j_schema(neo4j_ops))
+        self.assertEqual(
+            driver.queries[: len(NEO4J_SCHEMA_QUERIES)], NEO4J_SCHEMA_QUERIES
+        )
+        self.assertEqual(
+            len(driver.queries), len(NEO4J_SCHEMA_QUERIES) + len(NEO4J_HOT_QUERIES)
+        )
+        for query in NEO4J_SCHEMA_QUERIES:
+            self.assertIn("IF NOT EXISTS", query)
+
+        # the second call of the process doesn't query the database
+        self.assertTrue(ensure_neo4j_schema(neo4j_ops))
+        self.assertEqual(
+            len(driver.queries), len(NEO4J_SCHEMA_QUERIES) + len(NEO4J_HOT_QUERIES)
+        )
+
+    def test_ensure_schema_failed_query(self):
+        # the first constraint fails, i.e. duplicate userIds in the database
+        driver = FakeDriver(failing=[NEO4J_SCHEMA_QUERIES[0]])
+        neo4j_ops = SimpleNamespace(neo4j_driver=driver, db_name="neo4j")
+
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertTrue(ensure_neo4j_schema(neo4j_ops))
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("discord_account_user_id", logs.output[0])
+
+        # the later constraints and indexes are still created
+        self.assertEqual(
+            driver.queries[: len(NEO4J_SCHEMA_QUERIES)], NEO4J_SCHEMA_QUERIES
+        )
+        self.assertTrue(neo4j_schema._schema_ensured)
+
+    def test_ensure_schema_no_connection(self):
+        self.assertFalse(ensure_neo4j_schema(None))
+        self.assertFalse(neo4j_schema._schema_ensured)
+
+    def test_find_label_scans(self):
+        plan = {
+            "operatorType": "ProduceResults@neo4j",
+            "children": [
+                {
+                    "operatorType": "Filter@neo4j",
+                    "children": [
+                        {"operatorType": "NodeByLabelScan@neo4j", "children": []}
+                    ],
+                }
+            ],
+        }
+        neo4j_ops = SimpleNamespace(neo4j_driver=FakeDriver(plan), db_name="neo4j")
+
+        with self.assertLogs(level="WARNING"):
+            scans = find_label_scans(
+                neo4j_ops, "MATCH (a:DiscordAccount {userId: $id}) RETURN a"
+            )
+        self.assertEqual(scans, ["NodeByLabelScan"])
+
+    def test_find_label_scans_index_seek(self):
+        plan = {
+            "operatorType": "ProduceResults@neo4j",
+            "children": [{"operatorType": "NodeUniqueIndexSeek@neo4j"}],
+        }
+        neo4j_ops = SimpleNamespace(neo4j_driver=FakeDriver(plan), db_name="neo4j")
+
+        scans = find_label_scans(
+            neo4j_ops, "MATCH (a:DiscordAccount {userId: $id}) RETURN a"
+        )
+        self.assertEqual(scans, [])
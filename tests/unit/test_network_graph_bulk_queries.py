@@ -0,0 +1,88 @@
+import unittest
+from datetime import datetime, timezone
+
+import numpy as np
+from discord_analyzer.analysis.utils.window_graph import WindowGraph
+from discord_analyzer.DB_operations.network_graph import make_neo4j_networkx_query_dict
+from networkx import DiGraph
+
+
+class TestNetworkGraphBulkQueries(unittest.TestCase):
+    def setUp(self) -> None:
+        self.first_date = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        self.second_date = datetime(2023, 1, 2, tzinfo=timezone.utc)
+        self.graphs = {
+            self.first_date: WindowGraph(
+                src=np.array([0, 1, 2]),
+                dst=np.array([1, 2, 0]),
+                weight=np.array([1, 2, 3]),
+                acc_names=["user1", "user2", "user3"],
+            ),
+            self.second_date: WindowGraph(
+                src=np.array([1]),
+                dst=np.array([0]),
+                weight=np.array([5]),
+                acc_names=["user3", "user4"],
+            ),
+        }
+
+    def test_chunked_queries(self):
+        queries = make_neo4j_networkx_query_dict(
+            self.graphs, guildId="1234", community_id="4321", chunk_size=2
+        )
+
+        # community, 2 node chunks, 2 + 1 edge chunks
+        self.assertEqual(len(queries), 6)
+        self.assertEqual(queries[0].parameters["community_id"], "4321")
+
+        # each account is written once
+        self.assertEqual(queries[1].parameters["acc_names"], ["user1", "user2"])
+        self.assertEqual(queries[2].parameters["acc_names"], ["user3", "user4"])
+        self.assertEqual(queries[1].parameters["guild_id"], "1234")
+
+        first_timestamp = int(self.first_date.timestamp() * 1000)
+        self.assertEqual(queries[3].parameters["date"], first_timestamp)
+        self.assertEqual(
+            queries[3].parameters["edges"],
+            [
+                {"source": "user1", "target": "user2", "weight": 1},
+                {"source": "user2", "target": "user3", "weight": 2},
+            ],
+        )
+        self.assertEqual(
+            queries[4].parameters["edges"],
+            [{"source": "user3", "target": "user1", "weight": 3}],
+        )
+        self.assertEqual(
+            queries[5].parameters["date"],
+            int(self.second_date.timestamp() * 1000),
+        )
+        self.assertEqual(
+            queries[5].parameters["edges"],
+            [{"source": "user4", "target": "user3", "weight": 5}],
+        )
+        for query in queries[3:]:
+            self.assertIn("UNWIND $edges AS edge", query.query)
+
+    def test_networkx_graphs(self):
+        graph = DiGraph()
+        graph.add_node(0, acc_name="user1")
+        graph.add_node(1, acc_name="user2")
+        graph.add_edge(1, 0, weight=4)
+
+        queries = make_neo4j_networkx_query_dict(
+            {self.first_date: graph}, guildId="1234", community_id="4321"
+        )
+
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(queries[1].parameters["acc_names"], ["user1", "user2"])
+        self.assertEqual(
+            queries[2].parameters["edges"],
+            [{"source": "user2", "target": "user1", "weight": 4}],
+        )
+
+    def test_empty_graphs(self):
+        queries = make_neo4j_networkx_query_dict(
+            {}, guildId="1234", community_id="4321"
+        )
+        self.assertEqual(queries, [])
@@ -0,0 +1,190 @@
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from discord_analyzer.analysis.utils.heatmap_edges import HEATMAP_EDGES_STATE
+from discord_analyzer.analyzer import analyzer_heatmaps
+from discord_analyzer.analyzer.analyzer_heatmaps import Heatmaps
+from discord_analyzer.models import BaseModel
+from discord_analyzer.models.HeatmapEdgesModel import HeatmapEdgesModel
+from pymongo import DeleteMany, InsertOne
+
+
+def matches(document, query):
+    for key, value in query.items():
+        if isinstance(value, dict):
+            if "$gt" in value and not document.get(key) > value["$gt"]:
+                return False
+        elif document.get(key) != value:
+            return False
+    return True
+
+
+class FakeCursor(list):
+    def sort(self, keys):
+        key, _ = keys[0]
+        return FakeCursor(sorted(self, key=lambda document: document[key]))
+
+
+class FakeCollection:
+    def __init__(self) -> None:
+        self.documents = []
+        self.fail_bulk_write = None
+        self.batches = []
+        self.indexes = []
+
+    def find(self, query, projection=None):
+        return FakeCursor(
+            dict(document) for document in self.documents if matches(document, query)
+        )
+
+    def find_one(self, query, projection=None):
+        for document in self.documents:
+            if matches(document, query):
+                return {
+                    key: value
+                    for key, value in document.items()
+                    if key not in (projection or {})
+                }
+        return None
+
+    def replace_one(self, query, document, upsert=False):
+        self.delete_many(query)
+        self.documents.append(document)
+
+    def delete_many(self, query):
+        self.documents = [
+            document for document in self.documents if not matches(document, query)
+        ]
+
+    def create_index(self, keys):
+        self.indexes.append(keys)
+
+    def bulk_write(self, operations, ordered=True):
+        if self.fail_bulk_write is not None:
+            self.fail_bulk_write -= 1
+            if self.fail_bulk_write < 0:
+                raise RuntimeError("the process was killed")
+
+        self.batches.append(operations)
+        for operation in operations:
+            if isinstance(operation, DeleteMany):
+                self.delete_many(operation._filter)
+            elif isinstance(operation, InsertOne):
+                self.documents.append(dict(operation._doc))
+
+
+class FakeDatabase(dict):
+    name = "1234"
+
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+class TestUpdateHeatmapEdges(TestCase):
+    def setUp(self) -> None:
+        self.guildId = "1234"
+        self.database = FakeDatabase()
+        client = {self.guildId: self.database}
+        DB_connections = SimpleNamespace(
+            mongoOps=SimpleNamespace(
+                mongo_db_access=SimpleNamespace(db_mongo_client=client)
+            )
+        )
+        self.heatmaps = Heatmaps(DB_connections, testing=False, workers=1)
+
+        lone_messages = [0] * 24
+        lone_messages[2] = 1
+        for day in range(1, 6):
+            for channel in ["ch1", "ch2"]:
+                self.database["heatmaps"].documents.append(
+                    {
+                        "date": f"2023-01-{day:02}",
+                        "channelId": channel,
+                        "account_name": "user1",
+                        "thr_messages": [0] * 24,
+                        "lone_messages": lone_messages,
+                        "replied_per_acc": [],
+                        "mentioner_per_acc": [],
+                        "reacted_per_acc": [],
+                    }
+                )
+
+    def get_day_channels(self):
+        return sorted(
+            (edge_list["date"], edge_list["channelId"])
+            for edge_list in self.database["heatmapedges"].documents
+        )
+
+    def expected_day_channels(self):
+        return sorted(
+            (f"2023-01-{day:02}", channel)
+            for day in range(1, 6)
+            for channel in ["ch1", "ch2"]
+        )
+
+    @patch.object(analyzer_heatmaps, "HEATMAP_EDGES_DAYS_PER_BATCH", 2)
+    def test_convert_same_days_twice(self):
+        self.heatmaps.update_heatmap_edges(self.guildId)
+
+        # the state was not saved for the last days, i.e. the run was killed
+        state = self.database["analyzerstates"].documents[0]
+        self.assertEqual(state["name"], HEATMAP_EDGES_STATE)
+        self.assertEqual(state["lastDate"], "2023-01-05")
+        state["lastDate"] = "2023-01-02"
+
+        self.heatmaps.update_heatmap_edges(self.guildId)
+
+        self.assertEqual(self.get_day_channels(), self.expected_day_channels())
+
+    @patch.object(analyzer_heatmaps, "HEATMAP_EDGES_DAYS_PER_BATCH", 2)
+    def test_resume_after_failed_batch(self):
+        # the second batch of edges fails to be written
+        self.database["heatmapedges"].fail_bulk_write = 1
+        with self.assertRaises(RuntimeError):
+            self.heatmaps.update_heatmap_edges(self.guildId)
+
+        state = self.database["analyzerstates"].documents[0]
+        self.assertEqual(state["lastDate"], "2023-01-02")
+
+        self.database["heatmapedges"].fail_bulk_write = None
+        self.heatmaps.update_heatmap_edges(self.guildId)
+
+        self.assertEqual(self.get_day_channels(), self.expected_day_channels())
+        state = self.database["analyzerstates"].documents[0]
+        self.assertEqual(state["lastDate"], "2023-01-05")
+
+    def test_day_channel_replaced_in_one_batch(self):
+        BaseModel._CREATED_INDEXES.clear()
+        edges_c = HeatmapEdgesModel(self.database)
+        day_channels = [
+            ("2023-01-01", "ch1"),
+            ("2023-01-01", "ch2"),
+            ("2023-01-02", "ch1"),
+        ]
+        edges = [
+            {"date": date, "channelId": channel, "edges": []}
+            for date, channel in day_channels
+        ]
+        edges_c.replace_day_channels(edges, day_channels, batch_size=3)
+        edges_c.replace_day_channels(edges, day_channels, batch_size=3)
+
+        collection = self.database["heatmapedges"]
+        self.assertEqual(
+            sorted(map(tuple, self.get_day_channels())), sorted(day_channels)
+        )
+        # the index is created once
+        self.assertEqual(len(collection.indexes), 1)
+        for batch in collection.batches:
+            deleted = [
+                (operation._filter["date"], operation._filter["channelId"])
+                for operation in batch
+                if isinstance(operation, DeleteMany)
+            ]
+            inserted = [
+                (operation._doc["date"], operation._doc["channelId"])
+                for operation in batch
+                if isinstance(operation, InsertOne)
+            ]
+            self.assertEqual(deleted, inserted)
@@ -0,0 +1,50 @@
+import numpy as np
+from discord_analyzer.analysis.utils.window_graph import WindowGraph
+from networkx import DiGraph, from_numpy_array
+
+
+def test_window_graph_from_networkx():
+    matrix = np.array(
+        [
+            [0, 2, 0],
+            [0, 0, 0],
+            [1, 3, 0],
+        ]
+    )
+    graph = from_numpy_array(matrix, create_using=DiGraph)
+
+    window_graph = WindowGraph.from_networkx(graph, ["user1", "user2", "user3"])
+
+    assert len(window_graph) == 3
+    assert window_graph.src.tolist() == [0, 2, 2]
+    assert window_graph.dst.tolist() == [1, 0, 1]
+    assert window_graph.weight.tolist() == [2, 1, 3]
+    assert list(window_graph.iter_edges()) == [
+        ("user1", "user2", 2),
+        ("user3", "user1", 1),
+        ("user3", "user2", 3),
+    ]
+
+
+def test_window_graph_to_networkx():
+    window_graph = WindowGraph(
+        src=np.array([0, 2]),
+        dst=np.array([2, 1]),
+        weight=np.array([4, 1]),
+        acc_names=["user1", "user2", "user3"],
+    )
+
+    graph = window_graph.to_networkx()
+
+    # the nodes without any edge are kept
+    assert list(graph.nodes(data="acc_name")) == [
+        (0, "user1"),
+        (1, "user2"),
+        (2, "user3"),
+    ]
+    assert list(graph.edges(data="weight")) == [(0, 2, 4), (2, 1, 1)]
+
+    # the account names are read from the graph nodes
+    converted = WindowGraph.from_networkx(graph)
+    assert converted.acc_names == ["user1", "user2", "user3"]
+    assert list(converted.iter_edges()) == list(window_graph.iter_edges())
@@ -0,0 +1,206 @@
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any
+
+from pymongo import DESCENDING, MongoClient
+
+# the guildmembers fields kept in the roster
+ROSTER_FIELDS = [
+    "discordId",
+    "isBot",
+    "joinedAt",
+    "updatedAt",
+]
+# the guilds that the `updatedAt` index of their guildmembers is ensured
+# within this process, so the index is created once per guild
+_INDEXED_GUILDS: set[str] = set()
+
+
+class GuildRoster:
+    def __init__(self, db_mongo_client: MongoClient, guild_id: str) -> None:
+        """
+        the guildmembers of a guild, loaded once and kept in memory
+        so the members are not scanned again for every lookup
+        should be created per run, so it is not kept after the run
+
+        the members are loaded at the first lookup, and `refresh` reloads
+        the changed members if the count of members or their latest
+        `updatedAt` has changed since the last load
+
+        Parameters
+        ------------
+        db_mongo_client : MongoClient
+            the access to database
+        guild_id : str
+            the guild to load its members
+        """
+        self.collection = db_mongo_client[guild_id]["guildmembers"]
+        self.guild_id = guild_id
+
+        # the members by their discordId, in the order of the collection
+        self.members: dict[str, dict[str, Any]] = {}
+        self.loaded = False
+        # the count of members and their latest `updatedAt` in the last load
+        self.version: tuple[int, datetime | None] | None = None
+
+        self._joined_index: list[tuple[datetime, int, str]] | None = None
+
+    def refresh(self) -> None:
+        """
+        load the members if they weren't, or reload them if they have changed
+        the members updated after the last load are loaded just if possible,
+        otherwise all members are loaded again
+        """
+        version = self._get_version()
+        if self.loaded and version == self.version:
+            return
+
+        _, last_updated = self.version if self.version is not None else (0, None)
+        _, updated = version
+        if self.loaded and last_updated is not None and updated is not None:
+            cursor = self.collection.find(
+                {"updatedAt": {"$gt": last_updated}}, self._get_projection()
+            )
+            for member in cursor:
+                if "discordId" in member:
+                    self.members[member["discordId"]] = member
+
+        # the incremental load can't see the members without `updatedAt`
+        # or the removed ones
+        if not self.loaded or len(self.members) != version[0]:
+            logging.info(f"GUILDID: {self.guild_id}: Loading the guild members!")
+            cursor = self.collection.find({}, self._get_projection())
+            self.members = {
+                member["discordId"]: member
+                for member in cursor
+                if "discordId" in member
+            }
+
+        self.loaded = True
+        self.version = version
+        self._joined_index = None
+
+    def get_bot_ids(self) -> list[str]:
+        """
+        get the ids of the bots
+        """
+        self._ensure_loaded()
+        return [
+            member_id
+            for member_id, member in self.members.items()
+            if member.get("isBot") is True
+        ]
+
+    def get_user_ids(self) -> list[str]:
+        """
+        get the ids of the members that are not bot (`isBot` is False)
+        """
+        self._ensure_loaded()
+        return [
+            member_id
+            for member_id, member in self.members.items()
+            if member.get("isBot") is False
+        ]
+
+    def get_non_bot_ids(self) -> list[str]:
+        """
+        get the ids of the members not marked as bot
+        (including the ones without the `isBot` field)
+        """
+        self._ensure_loaded()
+        return [
+            member_id
+            for member_id, member in self.members.items()
+            if member.get("isBot") is not True
+        ]
+
+    def get_joined_accounts(
+        self, date_range: tuple[datetime, datetime]
+    ) -> list[dict[str, Any]]:
+        """
+        get the members joined within a date range (inclusive)
+
+        Parameters
+        ------------
+        date_range : tuple[datetime, datetime]
+            the start and end date of the range
+
+        Returns
+        ---------
+        data : list[dict[str, Any]]
+            the joined members, each has `discordId` and `joinedAt`
+            in the order of the collection
+        """
+        self._ensure_loaded()
+        if self._joined_index is None:
+            self._joined_index = sorted(
+                (member["joinedAt"], order, member_id)
+                for order, (member_id, member) in enumerate(self.members.items())
+                if isinstance(member.get("joinedAt"), datetime)
+            )
+
+        joined_dates = [joined_at for joined_at, _, _ in self._joined_index]
+        start = bisect_left(joined_dates, date_range[0])
+        end = bisect_right(joined_dates, date_range[1])
+
+        joined = sorted(self._joined_index[start:end], key=lambda item: item[1])
+        data = [
+            {"joinedAt": joined_at, "discordId": member_id}
+            for joined_at, _, member_id in joined
+        ]
+        return data
+
+    def get_latest_joined_users(self, count: int = 5) -> list[str]:
+        """
+        get the latest joined members that are not bot
+
+        Parameters
+        ------------
+        count : int
+            the count of latest users to return
+
+        Returns
+        ---------
+        users : list[str]
+            the ids of the latest joined users
+        """
+        self._ensure_loaded()
+        users = [
+            (member.get("joinedAt"), member_id)
+            for member_id, member in self.members.items()
+            if member.get("isBot") is False
+        ]
+        # the members without the joining date are the last ones
+        users.sort(
+            key=lambda user: (user[0] is not None, user[0] or datetime.min),
+            reverse=True,
+        )
+        return [member_id for _, member_id in users[:count]]
+
+    def _ensure_loaded(self) -> None:
+        if not self.loaded:
+            self.refresh()
+
+    def _get_version(self) -> tuple[int, datetime | None]:
+        """
+        get the count of members and their latest `updatedAt`
+        the count is taken from the collection metadata, not by counting
+        and the latest `updatedAt` from its index
+        """
+        if self.guild_id not in _INDEXED_GUILDS:
+            self.collection.create_index([("updatedAt", DESCENDING)])
+            _INDEXED_GUILDS.add(self.guild_id)
+
+        count = self.collection.estimated_document_count()
+        latest = self.collection.find_one(
+            {"updatedAt": {"$ne": None}},
+            {"_id": 0, "updatedAt": 1},
+            sort=[("updatedAt", -1)],
+        )
+        return count, latest["updatedAt"] if latest is not None else None
+
+    def _get_projection(self) -> dict[str, int]:
+        projection = {field: 1 for field in ROSTER_FIELDS}
+        projection["_id"] = 0
+        return projection